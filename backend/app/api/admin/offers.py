@@ -1,6 +1,8 @@
 from flask import Blueprint, jsonify, request
 from ...core.db import get_supabase
 from ...core.security import admin_required
+from ...core.http_cache import purge_surrogate_keys
+from ...services.offers import invalidate_offers
 import uuid
 
 bp = Blueprint('admin_offers', __name__, url_prefix='/api/v1/admin/offers')
@@ -21,6 +23,8 @@ def create_offer():
     try:
         supabase = get_supabase()
         response = supabase.table('offers').insert(data).execute()
+        invalidate_offers()
+        purge_surrogate_keys('offers')
         return jsonify(response.data), 201
     except Exception as e:
         return jsonify({"message": "Failed to create offer", "error": str(e)}), 500
@@ -74,6 +78,8 @@ def update_offer(offer_id):
         # The new trigger will automatically update the 'updated_at' field.
         if not response.data:
             return jsonify({"message": "Offer not found or no changes made"}), 404
+        invalidate_offers()
+        purge_surrogate_keys('offers')
         return jsonify(response.data[0])
     except Exception as e:
         return jsonify({"message": "Failed to update offer", "error": str(e)}), 500
@@ -92,6 +98,157 @@ def delete_offer(offer_id):
         response = supabase.table('offers').delete().eq('id', offer_id).execute()
         if not response.data:
             return jsonify({"message": "Offer not found"}), 404
+        invalidate_offers()
+        purge_surrogate_keys('offers')
         return '', 204
     except Exception as e:
         return jsonify({"message": "Failed to delete offer", "error": str(e)}), 500
+
+# Batch operations: max items per request and rows per PostgREST call.
+MAX_BATCH_ITEMS = 1000
+BATCH_CHUNK_SIZE = 200
+REQUIRED_OFFER_FIELDS = ['title', 'promo_type', 'start_date', 'end_date']
+
+
+def _chunks(items, size=BATCH_CHUNK_SIZE):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _canonical_uuid(value):
+    """Returns `value` as a lowercase hyphenated UUID, as PostgREST returns ids, or None if invalid."""
+    try:
+        return str(uuid.UUID(str(value)))
+    except ValueError:
+        return None
+
+
+def _batch_create(supabase, items):
+    """Inserts offers chunk by chunk; a failed chunk is retried row by row to isolate the bad rows."""
+    results, pending = [None] * len(items), []
+    for index, item in enumerate(items):
+        if not isinstance(item, dict) or not all(field in item for field in REQUIRED_OFFER_FIELDS):
+            results[index] = {"index": index, "status": "invalid",
+                              "error": f"Missing required fields: {REQUIRED_OFFER_FIELDS}"}
+        else:
+            pending.append(index)
+
+    for chunk in _chunks(pending):
+        try:
+            # Columns missing from some rows take their database defaults, not NULL.
+            rows = supabase.table('offers').insert([items[i] for i in chunk], default_to_null=False).execute().data
+            for index, row in zip(chunk, rows):
+                results[index] = {"index": index, "status": "created", "offer": row}
+        except Exception:
+            for index in chunk:
+                try:
+                    row = supabase.table('offers').insert(items[index]).execute().data[0]
+                    results[index] = {"index": index, "status": "created", "offer": row}
+                except Exception as e:
+                    results[index] = {"index": index, "status": "error", "error": str(e)}
+    return results
+
+
+def _batch_update(supabase, items):
+    """
+    Applies patches by id. PostgREST updates one set of values per request, so
+    patches with identical values (e.g. expiring a whole campaign) are grouped
+    into a single `id=in.(...)` update.
+    """
+    results, groups, ids_by_index = [None] * len(items), {}, {}
+    for index, item in enumerate(items):
+        offer_id = _canonical_uuid(item.get('id')) if isinstance(item, dict) else None
+        if offer_id is None:
+            results[index] = {"index": index, "status": "invalid", "error": "Each patch needs a valid 'id'"}
+            continue
+        patch = {key: value for key, value in item.items() if key != 'id'}
+        if not patch:
+            results[index] = {"index": index, "id": offer_id, "status": "invalid", "error": "No data provided"}
+            continue
+        ids_by_index[index] = offer_id
+        key = repr(sorted(patch.items()))
+        groups.setdefault(key, (patch, []))[1].append(index)
+
+    for patch, indexes in groups.values():
+        for chunk in _chunks(indexes):
+            ids = [ids_by_index[i] for i in chunk]
+            try:
+                rows = supabase.table('offers').update(patch).in_('id', ids).execute().data
+                updated = {row['id']: row for row in rows}
+                for index, offer_id in zip(chunk, ids):
+                    if offer_id in updated:
+                        results[index] = {"index": index, "id": offer_id, "status": "updated",
+                                          "offer": updated[offer_id]}
+                    else:
+                        results[index] = {"index": index, "id": offer_id, "status": "not_found"}
+            except Exception as e:
+                for index, offer_id in zip(chunk, ids):
+                    results[index] = {"index": index, "id": offer_id, "status": "error", "error": str(e)}
+    return results
+
+
+def _batch_delete(supabase, ids):
+    """Deletes offers by id with one `id=in.(...)` request per chunk."""
+    results, valid = [None] * len(ids), {}
+    for index, offer_id in enumerate(ids):
+        canonical = _canonical_uuid(offer_id)
+        if canonical is not None:
+            valid[index] = canonical
+        else:
+            results[index] = {"index": index, "id": offer_id, "status": "invalid",
+                              "error": "Invalid offer ID format"}
+
+    for chunk in _chunks(list(valid)):
+        chunk_ids = [valid[i] for i in chunk]
+        try:
+            rows = supabase.table('offers').delete().in_('id', chunk_ids).execute().data
+            deleted = {row['id'] for row in rows}
+            for index, offer_id in zip(chunk, chunk_ids):
+                status = "deleted" if offer_id in deleted else "not_found"
+                results[index] = {"index": index, "id": offer_id, "status": status}
+        except Exception as e:
+            for index, offer_id in zip(chunk, chunk_ids):
+                results[index] = {"index": index, "id": offer_id, "status": "error", "error": str(e)}
+    return results
+
+
+@bp.route('/batch', methods=['POST'])
+@admin_required(remote=True)
+def batch_offers():
+    """
+    Creates, updates and deletes many offers in one request, e.g. to roll out
+    or expire a seasonal campaign. Admin, Manager, or Staff access required.
+
+    Body: {"create": [offer, ...], "update": [{"id": ..., <fields>}, ...],
+    "delete": [id, ...]}, each optional. Every item gets its own status, so one
+    bad item does not fail the rest.
+    """
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({"message": "Invalid input: No data provided"}), 400
+
+    creates, updates, deletes = data.get('create', []), data.get('update', []), data.get('delete', [])
+    if not all(isinstance(items, list) for items in (creates, updates, deletes)):
+        return jsonify({"message": "'create', 'update' and 'delete' must be arrays"}), 400
+    if not (creates or updates or deletes):
+        return jsonify({"message": "Invalid input: No data provided"}), 400
+    if len(creates) + len(updates) + len(deletes) > MAX_BATCH_ITEMS:
+        return jsonify({"message": f"A batch may contain at most {MAX_BATCH_ITEMS} items"}), 413
+
+    try:
+        supabase = get_supabase()
+        results = {
+            "created": _batch_create(supabase, creates),
+            "updated": _batch_update(supabase, updates),
+            "deleted": _batch_delete(supabase, deletes),
+        }
+        summary = {}
+        for items in results.values():
+            for item in items:
+                summary[item['status']] = summary.get(item['status'], 0) + 1
+        if summary.get('created') or summary.get('updated') or summary.get('deleted'):
+            invalidate_offers()
+            purge_surrogate_keys('offers')
+        return jsonify({**results, "summary": summary}), 200
+    except Exception as e:
+        return jsonify({"message": "Failed to process offer batch", "error": str(e)}), 500
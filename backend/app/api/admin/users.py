@@ -0,0 +1,45 @@
+from flask import Blueprint, jsonify, request, g
+from postgrest.exceptions import APIError
+from ...core.db import get_supabase
+from ...core.security import admin_required, invalidate_role
+from ...services.profiles import invalidate_profile
+import uuid
+
+bp = Blueprint('admin_users', __name__, url_prefix='/api/v1/admin/users')
+
+ROLES = ['customer', 'staff', 'manager', 'admin']
+
+@bp.route('/<user_id>/role', methods=['PATCH'])
+@admin_required(remote=True)
+def set_user_role(user_id):
+    """
+    Change a user's role. Admin access required. The role and profile caches
+    are invalidated so the change (including a demotion) applies to this
+    worker immediately; other workers pick it up within their cache TTLs.
+    """
+    if g.profile.get('role') != 'admin':
+        return jsonify({"message": "Administrator access required"}), 403
+
+    try:
+        user_id = str(uuid.UUID(user_id))
+    except ValueError:
+        return jsonify({"message": "Invalid user ID format"}), 400
+
+    data = request.get_json(silent=True)
+    if not data or data.get('role') not in ROLES:
+        return jsonify({"message": f"Invalid input: 'role' must be one of {ROLES}"}), 400
+
+    try:
+        supabase = get_supabase()
+        response = supabase.rpc('set_user_role', {'p_user_id': user_id, 'p_role': data['role']}).execute()
+        invalidate_role(user_id)
+        invalidate_profile(user_id)
+        return jsonify(response.data), 200
+    except APIError as e:
+        if e.code == 'P0002':
+            return jsonify({"message": "User profile not found"}), 404
+        if e.code == '42501':
+            return jsonify({"message": "Administrator access required"}), 403
+        return jsonify({"message": "Failed to update role", "error": str(e)}), 500
+    except Exception as e:
+        return jsonify({"message": "Failed to update role", "error": str(e)}), 500
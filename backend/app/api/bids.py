@@ -1,8 +1,139 @@
-from flask import Blueprint
+import math
+import uuid
+from decimal import Decimal
+
+from flask import Blueprint, jsonify, request
+from pydantic import ValidationError
+from ..core.db import get_supabase
+from ..core.http_cache import purge_surrogate_keys
+from ..core.security import auth_required
+from ..models.schemas import Bid, BidCreate
+from ..services.bidding import BidRejected, VehicleNotBiddable, get_bid_engine, recent_bids, NO_BIDS
+from ..services.serialization import dump_bids
 
 # The blueprint variable is named 'bids'
-bids = Blueprint('bids', __name__)
+bids = Blueprint('bids', __name__, url_prefix='/api/v1/vehicles')
+
+DEFAULT_BID_LIMIT = 50
+MAX_BID_LIMIT = 200
+# bids.amount is DECIMAL(10, 2).
+MAX_BID_AMOUNT = Decimal('99999999.99')
+
+
+def _valid_vehicle_id(vehicle_id):
+    try:
+        uuid.UUID(vehicle_id)
+        return True
+    except ValueError:
+        return False
+
+
+def _amount_error(amount):
+    """Returns why a bid amount cannot be stored, or None if it is valid."""
+    if not math.isfinite(amount):
+        return "Bid amount must be a finite number"
+    if amount <= 0:
+        return "Bid amount must be positive"
+    value = Decimal(str(amount))
+    if value > MAX_BID_AMOUNT:
+        return f"Bid amount must not exceed {MAX_BID_AMOUNT}"
+    if value.as_tuple().exponent < -2:
+        return "Bid amount must have at most 2 decimal places"
+    return None
+
+
+@bids.route('/<vehicle_id>/bids', methods=['GET'])
+def get_vehicle_bids(vehicle_id):
+    """
+    Lists the bids on a vehicle, highest first, together with the current
+    high bid and the minimum amount the next bid must reach.
+    """
+    if not _valid_vehicle_id(vehicle_id):
+        return jsonify({"message": "Invalid vehicle ID format"}), 400
+
+    limit = min(max(request.args.get('limit', DEFAULT_BID_LIMIT, type=int), 1), MAX_BID_LIMIT)
+
+    try:
+        supabase = get_supabase()
+        engine = get_bid_engine()
+
+        rows = recent_bids(supabase, vehicle_id, limit)
+
+        # The first row is the live high bid, so use it to refresh the cache.
+        high = float(rows[0]['amount']) if rows else NO_BIDS
+        engine.remember_high_bid(vehicle_id, high)
+
+        return jsonify({
+            "vehicle_id": vehicle_id,
+            **engine.summary(high),
+            "bids": dump_bids(rows),
+        }), 200
+
+    except Exception as e:
+        print(f"Error fetching bids: {e}")
+        return jsonify({"message": "An error occurred while fetching bids.", "error": str(e)}), 500
+
+
+@bids.route('/<vehicle_id>/bids/high', methods=['GET'])
+def get_high_bid(vehicle_id):
+    """
+    Returns the current high bid for a vehicle from this worker's high-bid
+    cache, falling back to a single indexed lookup on a miss.
+    """
+    if not _valid_vehicle_id(vehicle_id):
+        return jsonify({"message": "Invalid vehicle ID format"}), 400
+
+    try:
+        engine = get_bid_engine()
+        high = engine.high_bid(get_supabase(), vehicle_id)
+        return jsonify({"vehicle_id": vehicle_id, **engine.summary(high)}), 200
+
+    except Exception as e:
+        print(f"Error fetching high bid: {e}")
+        return jsonify({"message": "An error occurred while fetching the high bid.", "error": str(e)}), 500
+
+
+@bids.route('/<vehicle_id>/bids', methods=['POST'])
+@auth_required
+def place_bid(vehicle_id):
+    """
+    Places a bid on a vehicle for the authenticated user. The bid is accepted
+    only if it beats the current high bid by at least `BID_MIN_INCREMENT`;
+    concurrent bids on the same vehicle are serialized so only one can win.
+    """
+    if not _valid_vehicle_id(vehicle_id):
+        return jsonify({"message": "Invalid vehicle ID format"}), 400
+
+    json_data = request.get_json(silent=True)
+    if not json_data:
+        return jsonify({"message": "Invalid JSON payload"}), 400
+
+    try:
+        bid_data = BidCreate.model_validate(json_data)
+    except ValidationError as e:
+        return jsonify({"message": "Validation error", "errors": e.errors()}), 422
+
+    amount_error = _amount_error(bid_data.amount)
+    if amount_error:
+        return jsonify({"message": amount_error}), 422
+
+    try:
+        engine = get_bid_engine()
+        bid = engine.place(get_supabase(), vehicle_id, bid_data.amount)
+        # Vehicle pages embed the current bids.
+        purge_surrogate_keys(f"vehicle-{vehicle_id}")
+        return jsonify(Bid.model_validate(bid).model_dump(mode='json')), 201
+
+    except BidRejected as e:
+        return jsonify({
+            "message": str(e),
+            "high_bid": e.high_bid,
+            "minimum_bid": e.minimum,
+        }), 409
+
+    except VehicleNotBiddable as e:
+        return jsonify({"message": str(e)}), 409
 
-@bids.route('/bids', methods=['GET'])
-def get_all_bids():
-    return "List of bids"
+    except Exception as e:
+        print(f"Error placing bid: {e}")
+        return jsonify({"message": "An error occurred while placing the bid.", "error": str(e)}), 500
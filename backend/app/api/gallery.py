@@ -1,9 +1,14 @@
 from flask import Blueprint, jsonify, request
 from ..core.db import get_supabase
+from ..core.http_cache import add_surrogate_keys, http_cache
+from ..services.filters import normalize_query
+from ..services.projection import MEDIA_COLUMNS, InvalidFields, gallery_select
+from ..services.text_search import rank_gallery_media
 
 bp = Blueprint('gallery', __name__, url_prefix='/api/v1/gallery')
 
 @bp.route('/preview', methods=['GET'])
+@http_cache(max_age=300, s_maxage=900, keys=('gallery',))
 def get_gallery_preview():
     """
     Returns a curated list of images for the homepage gallery preview.
@@ -13,8 +18,9 @@ def get_gallery_preview():
         supabase = get_supabase()
         # Select the 12 most recent images, prioritizing primary ones.
         # Note: RLS on the 'vehicles' table ensures that media from non-visible vehicles is not returned.
-        query = supabase.table('vehicle_media').select('*, vehicles(visible)').eq('vehicles.visible', True).eq('is_primary', True).order('created_at', desc=True).limit(12)
+        query = supabase.table('vehicle_media').select(f"{','.join(MEDIA_COLUMNS)},vehicles(visible)").eq('vehicles.visible', True).eq('is_primary', True).order('created_at', desc=True).limit(12)
         response = query.execute()
+        add_surrogate_keys(*(f"vehicle-{m['vehicle_id']}" for m in response.data if m.get('vehicle_id')))
         return jsonify(response.data)
     except Exception as e:
         print(f"Error in gallery preview: {e}")
@@ -25,23 +31,24 @@ def search_gallery():
     """
     Searches and filters all images in the gallery.
     Joins with the vehicles table to allow filtering on vehicle attributes.
+    Only a compact set of vehicle columns is embedded by default; `fields=`
+    selects media columns and embedded `vehicle.<field>` columns explicitly.
     """
+    args = request.args
+    try:
+        select = gallery_select(args.get('fields'))
+    except InvalidFields as e:
+        return jsonify({"message": str(e)}), 400
+
     try:
         supabase = get_supabase()
         # The foreign key is `vehicle_media(vehicle_id) -> vehicles(id)`.
         # We use an inner join to only get media for existing, visible vehicles.
-        query = supabase.table('vehicle_media').select('*, vehicles!inner(*)')
-
-        args = request.args
+        query = supabase.table('vehicle_media').select(select)
 
         # Ensure only visible vehicles are included, respecting RLS.
         query = query.eq('vehicles.visible', True)
 
-        # Pagination
-        limit = int(args.get('limit', 30))
-        offset = int(args.get('offset', 0))
-        query = query.limit(limit).offset(offset)
-
         # Filtering on vehicle properties
         if 'make' in args:
             query = query.eq('vehicles.make', args.get('make'))
@@ -53,13 +60,28 @@ def search_gallery():
             query = query.in_('vehicles.body_type', args.get('body_type').split(','))
 
         # Search functionality
-        if 'q' in args:
-            search_term = args.get('q')
-            # Search across make, model, year, or alt_text.
-            query = query.or_(f"alt_text.ilike.%{search_term}%,vehicles.make.ilike.%{search_term}%,vehicles.model.ilike.%{search_term}%")
+        ranks = None
+        if args.get('q', '').strip():
+            # Search across alt_text, make, model, trim and year using the
+            # full-text and trigram indexes, which yields a bounded ranked set.
+            ranks = rank_gallery_media(supabase, normalize_query(args.get('q')))
+            query = query.in_('id', list(ranks))
+
+        # Pagination
+        limit = int(args.get('limit', 30))
+        offset = int(args.get('offset', 0))
 
         # Sorting
-        sort_by = args.get('sort_by', 'created_at_desc')
+        sort_by = args.get('sort_by', 'relevance' if ranks is not None else 'created_at_desc')
+        if sort_by == 'relevance' and ranks is not None:
+            # Rank order is applied here, so the matched set is fetched whole.
+            response = query.execute()
+            ordered = sorted(response.data, key=lambda m: (-ranks.get(m['id'], 0), m['id']))
+            return jsonify(ordered[offset:offset + limit])
+        if sort_by == 'relevance':
+            # There is no rank without a query, so use the default order.
+            sort_by = 'created_at_desc'
+
         if sort_by == 'created_at_desc':
             query = query.order('created_at', desc=True)
         elif sort_by == 'created_at_asc':
@@ -69,8 +91,10 @@ def search_gallery():
             query = query.order('year', referenced_table='vehicles', desc=True)
         elif sort_by == 'year_asc':
             query = query.order('year', referenced_table='vehicles', desc=False)
+        # Break ties by id so offset paging is stable.
+        query = query.order('id')
 
-        response = query.execute()
+        response = query.limit(limit).offset(offset).execute()
         return jsonify(response.data)
 
     except Exception as e:
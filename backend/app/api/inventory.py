@@ -1,30 +1,58 @@
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, current_app, jsonify, request
+from ..core.concurrency import fan_out
 from ..core.db import get_supabase
-from ..models.schemas import Vehicle, VehicleSearchResponse
-from collections import Counter
-from typing import List
+from ..core.http_cache import add_surrogate_keys, http_cache, not_modified
+from ..services.facets import get_facets
+from ..services.filters import apply_vehicle_filters, parse_vehicle_filters
+from ..services.financing import affordable_price, attach_monthly_payments, parse_finance_terms
+from ..services.inventory_index import get_inventory_snapshot
+from ..services.projection import (
+    VEHICLE_LIST_COLUMNS, InvalidFields, project_vehicles, vehicle_projection,
+)
+from ..services.pagination import (
+    COUNT_STRATEGIES, RELEVANCE, SORT_ORDERS, InvalidCursor, apply_keyset, encode_cursor,
+)
+from ..services.serialization import dump_vehicle, dump_vehicles
+from ..services.text_search import page_by_relevance, rank_vehicles
+from ..services.vehicle_page import get_vehicle_page
 
 # Create a blueprint for inventory-related endpoints
 bp = Blueprint('inventory', __name__, url_prefix='/api/v1/inventory')
 
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
 @bp.route('/featured', methods=['GET'])
+@http_cache(max_age=60, s_maxage=300, keys=('vehicles',))
 def get_featured_vehicles():
     """
     Retrieves a list of vehicles marked as featured.
+    Supports `fields=` to return only the named fields.
     """
     try:
-        supabase = get_supabase()
-        # Query the 'vehicles' table for records where 'is_featured' is true
-        response = supabase.table('vehicles').select('*').eq('is_featured', True).limit(5).execute()
+        columns, names = vehicle_projection(request.args.get('fields'))
+    except InvalidFields as e:
+        return jsonify({"message": str(e)}), 400
+
+    try:
+        snapshot = get_inventory_snapshot()
+        if snapshot is not None:
+            featured_vehicles_data = snapshot.featured(5)
+        else:
+            supabase = get_supabase()
+            # Query the 'vehicles' table for records where 'is_featured' is true
+            select = ','.join(columns or VEHICLE_LIST_COLUMNS)
+            response = supabase.table('vehicles').select(select).eq('is_featured', True).limit(5).execute()
 
-        # The actual data is in the 'data' attribute of the response object
-        featured_vehicles_data = response.data
+            # The actual data is in the 'data' attribute of the response object
+            featured_vehicles_data = response.data
 
-        # Validate the data with the Pydantic model
-        validated_vehicles: List[Vehicle] = [Vehicle.model_validate(v) for v in featured_vehicles_data]
+        add_surrogate_keys(*(f"vehicle-{v['id']}" for v in featured_vehicles_data))
+        if names:
+            return jsonify(project_vehicles(featured_vehicles_data, names))
 
-        # Convert the Pydantic models back to dictionaries for the JSON response
-        return jsonify([v.model_dump(by_alias=True) for v in validated_vehicles])
+        # Validate the rows in bulk and shape them into Vehicle dicts for the JSON response
+        return jsonify(dump_vehicles(featured_vehicles_data))
 
     except Exception as e:
         print(f"Error fetching featured vehicles: {e}")
@@ -34,65 +62,148 @@ def get_featured_vehicles():
 def search_vehicles():
     """
     Searches and filters vehicles from the database and calculates facet counts.
+    Facets are disjunctive: each is counted with every filter except its own.
+    Results are returned one page at a time using opaque keyset cursors over
+    (sort key, id); pass `next_cursor` back as `cursor` to fetch the next page.
+    A free-text `q` matches make, model, trim and year with prefix matching and
+    typo tolerance, and its results are ordered by relevance unless sorted otherwise.
+    `fields=` limits each result to the named fields.
+
+    Affordability search: `payment_max` (with optional `down_payment`, `term` in
+    months and `apr` in percent) is inverted once into a price ceiling pushed
+    down as a price filter. Whenever any of these is given, each result also
+    carries its estimated `monthly_payment`.
     """
+    args = request.args
+    has_query = bool(args.get('q', '').strip())
+
+    sort_by = args.get('sort_by', RELEVANCE if has_query else 'created_at_desc')
+    if sort_by == RELEVANCE and not has_query:
+        return jsonify({"message": "sort_by=relevance requires a search query (q)"}), 400
+    if sort_by not in SORT_ORDERS and sort_by != RELEVANCE:
+        return jsonify({"message": f"Invalid sort_by. Expected one of: {', '.join(SORT_ORDERS)}, {RELEVANCE}"}), 400
+
+    count_strategy = args.get('count', current_app.config.get('INVENTORY_COUNT_STRATEGY', 'estimated'))
+    if count_strategy not in COUNT_STRATEGIES:
+        return jsonify({"message": f"Invalid count. Expected one of: {', '.join(COUNT_STRATEGIES)}"}), 400
+
+    limit = args.get('limit', DEFAULT_PAGE_SIZE, type=int)
+    if limit < 1:
+        return jsonify({"message": "limit must be a positive integer"}), 400
+    limit = min(limit, MAX_PAGE_SIZE)
+
+    try:
+        finance = parse_finance_terms(args)
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+
+    # The sort column is always selected, as next_cursor is built from it,
+    # and the price whenever payments are computed.
+    sort_columns = () if sort_by == RELEVANCE else (SORT_ORDERS[sort_by][0],)
+    if finance is not None:
+        sort_columns += ('price_current',)
     try:
-        supabase = get_supabase()
-        args = request.args
-
-        # Start with a base query
-        query = supabase.table('vehicles').select('*', count='exact')
-
-        # Apply filters from query parameters
-        if 'make' in args:
-            query = query.eq('make', args.get('make'))
-        if 'year_min' in args:
-            query = query.gte('year', args.get('year_min', type=int))
-        if 'price_max' in args:
-            query = query.lte('price_current', args.get('price_max', type=int))
-        if 'bodyType' in args:
-            body_types = args.get('bodyType').split(',')
-            query = query.in_('body_type', body_types)
-        if 'fuelType' in args:
-            fuel_types = args.get('fuelType').split(',')
-            query = query.in_('fuel_type', fuel_types)
-
-        # Execute the query to get filtered vehicles
-        response = query.execute()
-
-        filtered_vehicles_data = response.data
-        total_count = response.count
-
-        # Validate the data with the Pydantic model
-        validated_vehicles: List[Vehicle] = [Vehicle.model_validate(v) for v in filtered_vehicles_data]
-
-        # In a real-world scenario, you might run a separate, broader query for facets
-        # for a better user experience (showing all possible filters).
-        # For this implementation, we'll calculate facets from the filtered results.
-        make_counts = Counter(v.make for v in validated_vehicles)
-        bodyType_counts = Counter(v.body_type for v in validated_vehicles)
-        fuelType_counts = Counter(v.fuel_type for v in validated_vehicles)
-
-        # Create the response object using the Pydantic model
-        search_response = VehicleSearchResponse(
-            data=validated_vehicles,
-            facets={
-                "make": dict(make_counts),
-                "bodyType": dict(bodyType_counts),
-                "fuelType": dict(fuelType_counts),
-            },
-            total=total_count
-        )
-
-        # Return the response, converting the Pydantic model to a JSON-serializable dict
-        return jsonify(search_response.model_dump(by_alias=True))
+        columns, names = vehicle_projection(args.get('fields'), required=sort_columns)
+    except InvalidFields as e:
+        return jsonify({"message": str(e)}), 400
+    if columns is None:
+        columns = VEHICLE_LIST_COLUMNS + [c for c in sort_columns if c not in VEHICLE_LIST_COLUMNS]
+
+    try:
+        filters = parse_vehicle_filters(args)
+        cursor = args.get('cursor')
+
+        if finance is not None and finance['payment_max'] is not None:
+            ceiling = affordable_price(finance)
+            filters['price_max'] = min(filters.get('price_max', ceiling), ceiling)
+
+        # Resolve the text search into a bounded, ranked set of vehicle ids.
+        ranks = None
+        if 'q' in filters:
+            ranks = rank_vehicles(get_supabase(), filters['q'])
+            filters['ids'] = list(ranks)
+
+        try:
+            snapshot = get_inventory_snapshot()
+            if snapshot is not None:
+                # Serve anonymous searches from the in-memory columnar index.
+                if sort_by == RELEVANCE:
+                    matched = snapshot.matching_rows(filters)
+                    page_rows, next_cursor = page_by_relevance(matched, ranks, limit, cursor)
+                    total_count = len(matched)
+                else:
+                    page_rows, total_count, has_more = snapshot.search(filters, sort_by, limit, cursor)
+                    next_cursor = encode_cursor(sort_by, page_rows[-1]) if has_more else None
+                facets = snapshot.facets(filters)
+            else:
+                supabase = get_supabase()
+
+                # Start with a base query
+                count = None if count_strategy == 'none' else count_strategy
+                query = supabase.table('vehicles').select(','.join(columns), count=count)
+
+                # Apply filters from query parameters
+                query = apply_vehicle_filters(query, filters)
+
+                def fetch_page():
+                    if sort_by == RELEVANCE:
+                        # The matched set is bounded by SEARCH_MAX_RESULTS, so it is
+                        # fetched whole and ordered by rank here.
+                        response = query.execute()
+                        page_rows, next_cursor = page_by_relevance(response.data, ranks, limit, cursor)
+                        return page_rows, next_cursor, len(response.data)
+                    # Order by the sort key and id, resuming after the cursor if one was given.
+                    # One extra row is fetched to learn whether another page exists.
+                    response = apply_keyset(query, sort_by, cursor).limit(limit + 1).execute()
+                    page_rows = response.data[:limit]
+                    has_more = len(response.data) > limit
+                    next_cursor = encode_cursor(sort_by, page_rows[-1]) if has_more else None
+                    return page_rows, next_cursor, response.count
+
+                # The page and the facets (counted across all matching vehicles,
+                # not just this page) are independent queries, so run them together.
+                (page_rows, next_cursor, total_count), facets = fan_out(
+                    fetch_page, lambda: get_facets(supabase, filters),
+                )
+        except InvalidCursor as e:
+            return jsonify({"message": str(e)}), 400
+
+        if count_strategy == 'none':
+            total_count = None
+
+        if names:
+            data = project_vehicles(page_rows, names)
+            if finance is not None:
+                attach_monthly_payments(data, page_rows, finance)
+            return jsonify({
+                "data": data,
+                "facets": facets,
+                "total": total_count,
+                "next_cursor": next_cursor,
+            })
+
+        # Build the VehicleSearchResponse shape directly; the rows are validated
+        # in bulk rather than through a nested model per vehicle.
+        data = dump_vehicles(page_rows)
+        if finance is not None:
+            attach_monthly_payments(data, page_rows, finance)
+        return jsonify({
+            "data": data,
+            "facets": facets,
+            "total": total_count,
+            "next_cursor": next_cursor,
+        })
 
     except Exception as e:
         print(f"Error in vehicle search: {e}")
         return jsonify({"message": "An error occurred during vehicle search.", "error": str(e)}), 500
 
+import hashlib
 import uuid
+from datetime import datetime
 
 @bp.route('/<vehicle_id>', methods=['GET'])
+@http_cache(max_age=120, s_maxage=600)
 def get_vehicle_details(vehicle_id):
     """
     Retrieves the full details for a single vehicle by its ID.
@@ -104,17 +215,57 @@ def get_vehicle_details(vehicle_id):
         return jsonify({"message": "Invalid vehicle ID format"}), 400
 
     try:
-        supabase = get_supabase()
-        response = supabase.table('vehicles').select('*').eq('id', vehicle_id).single().execute()
+        snapshot = get_inventory_snapshot()
+        vehicle_data = snapshot.get(vehicle_id) if snapshot is not None else None
 
-        if not response.data:
-            return jsonify({"message": "Vehicle not found"}), 404
+        # Vehicles missing from the snapshot may have been added since it was loaded.
+        if vehicle_data is None:
+            supabase = get_supabase()
+            response = supabase.table('vehicles').select('*').eq('id', vehicle_id).single().execute()
+
+            if not response.data:
+                return jsonify({"message": "Vehicle not found"}), 404
+
+            vehicle_data = response.data
 
-        vehicle_data = response.data
-        validated_vehicle = Vehicle.model_validate(vehicle_data)
+        # The row's updated_at watermark identifies this version of the vehicle,
+        # so a client with a current copy is answered before any serialization.
+        add_surrogate_keys(f"vehicle-{vehicle_id}")
+        if vehicle_data.get('updated_at'):
+            updated_at = datetime.fromisoformat(vehicle_data['updated_at'])
+            etag = hashlib.blake2b(f"{vehicle_id}:{vehicle_data['updated_at']}".encode(), digest_size=16).hexdigest()
+            cached = not_modified(etag, updated_at)
+            if cached is not None:
+                return cached
 
-        return jsonify(validated_vehicle.model_dump(by_alias=True))
+        return jsonify(dump_vehicle(vehicle_data))
 
     except Exception as e:
         print(f"Error fetching vehicle details: {e}")
         return jsonify({"message": "An error occurred while fetching vehicle details.", "error": str(e)}), 500
+
+
+@bp.route('/<vehicle_id>/page', methods=['GET'])
+@http_cache(max_age=5)
+def get_vehicle_page_details(vehicle_id):
+    """
+    Returns everything the vehicle detail page shows in one payload: the
+    vehicle, its media, price history and current bids. Sections are fetched
+    concurrently and cached per section (see services/vehicle_page.py).
+    """
+    try:
+        uuid.UUID(vehicle_id)
+    except ValueError:
+        return jsonify({"message": "Invalid vehicle ID format"}), 400
+
+    try:
+        page = get_vehicle_page(vehicle_id)
+        if page is None:
+            return jsonify({"message": "Vehicle not found"}), 404
+
+        add_surrogate_keys(f"vehicle-{vehicle_id}")
+        return jsonify(page)
+
+    except Exception as e:
+        print(f"Error fetching vehicle page: {e}")
+        return jsonify({"message": "An error occurred while fetching the vehicle page.", "error": str(e)}), 500
@@ -1,7 +1,11 @@
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, current_app, g, jsonify, request, stream_with_context
 from pydantic import ValidationError
 from ..core.db import get_supabase
-from ..models.schemas import VehicleCreate, Vehicle
+from ..core.http_cache import purge_surrogate_keys
+from ..core.security import admin_required
+from ..models.schemas import VehicleCreate
+from ..services.listing_import import IMPORT_FORMATS, import_listings, iter_records
+from ..services.serialization import dump_vehicle
 
 bp = Blueprint('listings', __name__, url_prefix='/api/v1/cars')
 
@@ -40,10 +44,77 @@ def create_listing():
         created_vehicle_data = response.data[0]
 
         # Validate the created vehicle data with the Vehicle model
-        validated_vehicle = Vehicle.model_validate(created_vehicle_data)
+        validated_vehicle = dump_vehicle(created_vehicle_data, trusted=False)
 
-        return jsonify(validated_vehicle.model_dump(by_alias=True)), 201
+        # A new vehicle can appear in any cached vehicle list.
+        purge_surrogate_keys('vehicles')
+
+        return jsonify(validated_vehicle), 201
 
     except Exception as e:
         print(f"Error creating listing: {e}")
         return jsonify({"message": "An error occurred while creating the listing.", "error": str(e)}), 500
+
+
+@bp.route('/sell/bulk', methods=['POST'])
+@admin_required(remote=True)
+def import_listings_bulk():
+    """
+    Imports many vehicle listings from one upload (Admin or Staff access
+    required; rows are inserted as the caller, and the vehicles RLS policy
+    only lets staff and admins insert): a JSON array
+    (application/json), NDJSON (application/x-ndjson) or CSV with a header row
+    (text/csv). Rows are validated as they are read and inserted in chunked
+    batches; VINs already in the inventory or repeated in the upload are
+    reported as duplicates.
+
+    The body is streamed in and per-row results are streamed back, so memory
+    use is bounded by the chunk size, not the upload. Results are a JSON object with
+    `results` and `summary`, or one JSON line per row followed by the summary
+    with `?format=ndjson`.
+    """
+    if g.profile.get('role') not in ('staff', 'admin'):
+        return jsonify({"message": "Administrator or staff access required"}), 403
+
+    upload_format = IMPORT_FORMATS.get(request.mimetype)
+    if upload_format is None:
+        return jsonify({
+            "message": "Unsupported upload type",
+            "supported": sorted(IMPORT_FORMATS),
+        }), 415
+
+    output = request.args.get('format', 'json')
+    if output not in ('json', 'ndjson'):
+        return jsonify({"message": "format must be 'json' or 'ndjson'"}), 400
+
+    chunk_size = current_app.config.get('LISTING_IMPORT_CHUNK_SIZE', 500)
+    dumps = current_app.json.dumps
+
+    def generate():
+        summary = {"received": 0, "created": 0, "duplicate": 0, "invalid": 0, "error": 0}
+        records = iter_records(request.stream, upload_format)
+        if output == 'json':
+            yield '{"results":['
+        try:
+            for i, result in enumerate(import_listings(get_supabase(), records, chunk_size)):
+                summary["received"] += 1
+                summary[result["status"]] += 1
+                if output == 'json':
+                    yield ("," if i else "") + dumps(result)
+                else:
+                    yield dumps(result) + "\n"
+        except Exception as e:
+            # Headers are already sent; report the failure in the body instead.
+            print(f"Error importing listings: {e}")
+            summary["aborted"] = str(e)
+        finally:
+            if summary["created"]:
+                # New vehicles can appear in any cached vehicle list.
+                purge_surrogate_keys('vehicles')
+        if output == 'json':
+            yield '],"summary":' + dumps(summary) + '}'
+        else:
+            yield dumps({"summary": summary}) + "\n"
+
+    mimetype = 'application/json' if output == 'json' else 'application/x-ndjson'
+    return Response(stream_with_context(generate()), mimetype=mimetype)
@@ -1,4 +1,10 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint, Response, current_app, jsonify
+from ..core.db import get_pool
+from ..core.metrics import get_metrics
+from ..core.security import get_token_cache, get_role_cache, internal_required
+from ..services.bidding import get_bid_engine
+from ..services.offers import get_active_offers
+from ..services.profiles import get_profile_cache
 
 # A Blueprint for meta-information endpoints about the API itself.
 bp = Blueprint('meta', __name__, url_prefix='/meta')
@@ -10,3 +16,47 @@ def health_check():
     and responsive.
     """
     return jsonify({"status": "ok", "message": "API is healthy"}), 200
+
+@bp.route('/pool', methods=['GET'])
+@internal_required
+def pool_stats():
+    """
+    Reports utilisation of this worker's Supabase client pool.
+    """
+    return jsonify(get_pool().stats()), 200
+
+@bp.route('/cache', methods=['GET'])
+@internal_required
+def cache_stats():
+    """
+    Reports hit/miss counters for this worker's authentication, profile, bid and offer caches.
+    """
+    return jsonify({
+        "verified_tokens": get_token_cache().stats(),
+        "roles": get_role_cache().stats(),
+        "profiles": get_profile_cache().stats(),
+        "bids": get_bid_engine().stats(),
+        "active_offers": get_active_offers().stats(),
+    }), 200
+
+@bp.route('/stream', methods=['GET'])
+@internal_required
+def stream_stats():
+    """
+    Reports this worker's live event hub and change feed, if streaming has started.
+    """
+    hub = current_app.extensions.get('event_hub')
+    feed = current_app.extensions.get('event_feed')
+    return jsonify({
+        "hub": hub.stats() if hub else None,
+        "feed": feed.stats() if feed else None,
+    }), 200
+
+@bp.route('/metrics', methods=['GET'])
+@internal_required
+def metrics():
+    """
+    Exposes this worker's per-route latency, status, response size and
+    Supabase call metrics in the Prometheus text format.
+    """
+    return Response(get_metrics().render(), mimetype='text/plain; version=0.0.4')
@@ -1,16 +1,30 @@
 from flask import Blueprint, jsonify
-from ..core.db import get_supabase
+from ..core.db import get_supabase, rls_scope
+from ..core.http_cache import cap_max_age, http_cache
+from ..services.offers import get_active_offers
 
 bp = Blueprint('offers', __name__, url_prefix='/api/v1/offers')
 
 @bp.route('/', methods=['GET'])
+@http_cache(max_age=60, s_maxage=300, keys=('offers',))
 def list_active_offers():
     """
     Lists all active and valid offers.
     The RLS policy on the 'offers' table automatically filters for offers
     that are currently active and within their valid date range.
+
+    Anonymous requests are served from the in-memory active-offers index,
+    which only goes back to the table when the active set can have changed.
+    Their cache lifetimes end at the index's expiry, i.e. no later than the
+    next offer start or end, so the CDN never serves a set past a boundary.
     """
     try:
+        if rls_scope() == 'anon':
+            active_offers = get_active_offers()
+            offers = active_offers.active()
+            cap_max_age(active_offers.seconds_until_expiry())
+            return jsonify(offers)
+
         supabase = get_supabase()
         # RLS is applied automatically by Supabase based on the user's JWT or anon key.
         query = supabase.table('offers').select('*').order('end_date', desc=False)
@@ -0,0 +1,98 @@
+import uuid
+from datetime import datetime
+
+from flask import Blueprint, current_app, jsonify, request
+from ..core.db import get_supabase
+from ..core.http_cache import add_surrogate_keys, http_cache
+from ..services.price_series import BUCKETS, SeriesTooLarge, get_price_series
+
+bp = Blueprint('prices', __name__, url_prefix='/api/v1/prices')
+
+
+def _series_params():
+    """
+    Parses the shared series query parameters. Returns (params, None), or
+    (None, error response) if one is invalid.
+    """
+    bucket = request.args.get('bucket', 'raw')
+    if bucket not in BUCKETS:
+        return None, (jsonify({"message": f"bucket must be one of {', '.join(BUCKETS)}"}), 400)
+
+    max_points = current_app.config.get('PRICE_SERIES_MAX_POINTS', 1000)
+    points = request.args.get('points', current_app.config.get('PRICE_SERIES_DEFAULT_POINTS', 200), type=int)
+    points = min(max(points, 3), max_points)
+
+    params = {'bucket': bucket, 'points': points}
+    for name, param in (('since', 'from'), ('until', 'to')):
+        value = request.args.get(param)
+        if value:
+            try:
+                datetime.fromisoformat(value)
+            except ValueError:
+                return None, (jsonify({"message": f"'{param}' must be an ISO 8601 date or timestamp"}), 400)
+        params[name] = value or None
+    return params, None
+
+
+@bp.route('/vehicles/<vehicle_id>', methods=['GET'])
+@http_cache(max_age=60, s_maxage=300)
+def get_vehicle_price_series(vehicle_id):
+    """
+    Returns a vehicle's price history as a chart-ready series.
+
+    Query parameters:
+        bucket   raw (default), day, week or month; bucketed series carry
+                 min/max/last/mean/count per bucket
+        points   maximum points returned (LTTB-downsampled), default 200
+        from/to  optional ISO 8601 bounds on recorded_at (to is exclusive)
+    """
+    try:
+        uuid.UUID(vehicle_id)
+    except ValueError:
+        return jsonify({"message": "Invalid vehicle ID format"}), 400
+
+    params, error = _series_params()
+    if error:
+        return error
+
+    try:
+        series = get_price_series(get_supabase(), vehicle_id=vehicle_id, **params)
+        add_surrogate_keys(f"vehicle-{vehicle_id}")
+        return jsonify({"vehicle_id": vehicle_id, **series}), 200
+
+    except SeriesTooLarge as e:
+        return jsonify({"message": str(e)}), 422
+
+    except Exception as e:
+        print(f"Error fetching vehicle price series: {e}")
+        return jsonify({"message": "An error occurred while fetching the price series.", "error": str(e)}), 500
+
+
+@bp.route('/cohort', methods=['GET'])
+@http_cache(max_age=300, s_maxage=900, keys=('vehicles',))
+def get_cohort_price_series():
+    """
+    Returns the combined price history of every visible vehicle of a make
+    (and optionally model), e.g. /api/v1/prices/cohort?make=Porsche&model=911.
+    Accepts the same bucket, points and from/to parameters as the per-vehicle
+    series; bucketing is recommended since raw points mix many vehicles.
+    """
+    make = request.args.get('make')
+    if not make:
+        return jsonify({"message": "'make' is required"}), 400
+    model = request.args.get('model') or None
+
+    params, error = _series_params()
+    if error:
+        return error
+
+    try:
+        series = get_price_series(get_supabase(), make=make, model=model, **params)
+        return jsonify({"make": make, "model": model, **series}), 200
+
+    except SeriesTooLarge as e:
+        return jsonify({"message": str(e)}), 422
+
+    except Exception as e:
+        print(f"Error fetching cohort price series: {e}")
+        return jsonify({"message": "An error occurred while fetching the price series.", "error": str(e)}), 500
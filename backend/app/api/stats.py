@@ -1,18 +1,38 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint, current_app, jsonify
+from ..core.http_cache import http_cache
+from ..services.stats import get_stats_rollup
 
 bp = Blueprint('stats', __name__, url_prefix='/stats')
 
 @bp.route('/summary', methods=['GET'])
+@http_cache(max_age=300, s_maxage=900, keys=('stats',))
 def get_stats_summary():
     """
     Returns a summary of key site statistics for the Trust Indicators section.
-    NOTE: This endpoint currently returns hardcoded data for frontend development.
-    In a real implementation, this would query an analytics database.
+    Counts come from a rollup this worker recomputes every
+    `STATS_REFRESH_SECONDS` (see services/stats.py); `asOf` is when it was
+    computed. There is no reviews table yet, so the rating and the marketing
+    figures are configured. Until the worker's first rollup is in (normally
+    computed during warmup), the response is a 503.
     """
-    summary_data = {
-        "carsSold": 5123,
-        "averageRating": 4.9,
-        "financingAvailable": "0% APR",
-        "supportHours": "24/7"
-    }
-    return jsonify(summary_data)
+    try:
+        stats_rollup = get_stats_rollup()
+        if not stats_rollup.wait(timeout=current_app.config.get('STATS_FIRST_LOAD_WAIT', 2.0)):
+            return jsonify({"message": "Site statistics are not available yet."}), 503, {'Retry-After': '5'}
+        rollup = stats_rollup.snapshot
+
+        summary_data = {
+            "carsSold": rollup['cars_sold'],
+            "vehiclesAvailable": rollup['vehicles_available'],
+            "bidsPlaced": rollup['bids_placed'],
+            "activeOffers": rollup['active_offers'],
+            "averageRating": current_app.config.get('STATS_AVERAGE_RATING', 4.9),
+            "financingAvailable": current_app.config.get('STATS_FINANCING_HEADLINE', "0% APR"),
+            "supportHours": current_app.config.get('STATS_SUPPORT_HOURS', "24/7"),
+            "asOf": rollup['computed_at'],
+        }
+        return jsonify(summary_data)
+
+    except Exception as e:
+        print(f"Error fetching stats summary: {e}")
+        return jsonify({"message": "An error occurred while fetching site statistics.", "error": str(e)}), 500
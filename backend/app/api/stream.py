@@ -0,0 +1,68 @@
+import uuid
+
+from flask import Blueprint, Response, current_app, jsonify, request
+from ..services.streaming import EVENT_TYPES, TooManySubscribers, get_event_hub
+
+# A Blueprint for live updates pushed to clients over Server-Sent Events.
+bp = Blueprint('stream', __name__, url_prefix='/api/v1/stream')
+
+# Client reconnection delay sent with every stream (milliseconds).
+RETRY_MS = 3000
+
+
+@bp.route('', methods=['GET'])
+def stream_events():
+    """
+    Streams new bids and vehicle status changes as Server-Sent Events.
+    Narrow the stream with `vehicle_id=<id>[,<id>...]` and `types=bid,status`.
+    Reconnecting clients send `Last-Event-ID` and resume from the buffered events;
+    if those no longer reach back that far, a `reset` event tells the client
+    to reload its state, and the stream ends.
+
+    Each open stream holds a worker thread or greenlet, so serve this route
+    from gevent (or another async-capable) workers for large audiences.
+    """
+    vehicle_ids = {v for v in request.args.get('vehicle_id', '').split(',') if v}
+    for vehicle_id in vehicle_ids:
+        try:
+            uuid.UUID(vehicle_id)
+        except ValueError:
+            return jsonify({"message": f"Invalid vehicle_id: {vehicle_id}"}), 400
+
+    event_types = {t for t in request.args.get('types', '').split(',') if t}
+    unknown = event_types - set(EVENT_TYPES)
+    if unknown:
+        return jsonify({"message": f"Unknown event types: {', '.join(sorted(unknown))}"}), 400
+
+    last_event_id = request.headers.get('Last-Event-ID', type=int)
+    heartbeat = current_app.config.get('STREAM_HEARTBEAT_SECONDS', 15)
+    dumps = current_app.json.dumps
+
+    try:
+        subscription = get_event_hub().subscribe(vehicle_ids, event_types, last_event_id, heartbeat)
+    except TooManySubscribers as e:
+        return jsonify({"message": str(e)}), 503, {'Retry-After': str(RETRY_MS // 1000)}
+    except Exception as e:
+        print(f"Error opening event stream: {e}")
+        return jsonify({"message": "An error occurred while opening the event stream.", "error": str(e)}), 500
+
+    def format_event(event):
+        if event is None:
+            return ": keep-alive\n\n"
+        if event['type'] == 'reset':
+            return f"event: reset\ndata: {dumps(event)}\n\n"
+        return f"id: {event['id']}\nevent: {event['type']}\ndata: {dumps(event['data'])}\n\n"
+
+    def generate():
+        try:
+            yield f"retry: {RETRY_MS}\n\n"
+            for event in subscription:
+                yield format_event(event)
+        finally:
+            # Runs when the client disconnects; releases the subscriber slot.
+            subscription.close()
+
+    return Response(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no',
+    })
@@ -1,32 +1,17 @@
-from flask import Blueprint, jsonify, request
+import itertools
+import json
 
-bp = Blueprint('tools', __name__, url_prefix='/api/v1/tools')
-
-def calculate_amortization(principal, annual_rate, term_months):
-    """
-    Calculates the monthly payment for a loan.
-    Returns monthly payment, total interest, and total cost of the loan.
-    """
-    if term_months <= 0:
-        return 0, 0, 0
-
-    if annual_rate == 0:
-        monthly_payment = principal / term_months
-        total_interest = 0
-        total_cost = principal
-        return monthly_payment, total_interest, total_cost
+import numpy as np
+from flask import Blueprint, Response, jsonify, request
+from ..services.amortization import (
+    amortization_schedule, calculate_amortization, calculate_amortization_batch,
+)
 
-    monthly_rate = (annual_rate / 100) / 12
-
-    # Formula for monthly payment
-    numerator = monthly_rate * ((1 + monthly_rate) ** term_months)
-    denominator = ((1 + monthly_rate) ** term_months) - 1
-    monthly_payment = principal * (numerator / denominator)
-
-    total_cost_of_loan = monthly_payment * term_months
-    total_interest = total_cost_of_loan - principal
+bp = Blueprint('tools', __name__, url_prefix='/api/v1/tools')
 
-    return monthly_payment, total_interest, total_cost_of_loan
+PAYMENT_FIELDS = ['vehicle_price', 'down_payment', 'loan_term_months', 'annual_interest_rate']
+MAX_BATCH_SIZE = 10000
+MAX_SCHEDULE_MONTHS = 1200
 
 @bp.route('/calculate-payment', methods=['POST'])
 def calculate_payment_endpoint():
@@ -82,3 +67,151 @@ def calculate_payment_endpoint():
         return jsonify({"message": "Invalid data type for one of the fields. Please use numbers.", "error": str(e)}), 400
     except Exception as e:
         return jsonify({"message": "An error occurred during calculation.", "error": str(e)}), 500
+
+
+def _batch_inputs(data):
+    """
+    Turns a batch request body into equal-length input arrays. Accepts either
+    `items` (a list of individual requests) or `grid` (a value or list per
+    field, expanded to every combination).
+    """
+    if 'grid' in data:
+        grid = data['grid']
+        missing = [field for field in PAYMENT_FIELDS if field not in grid]
+        if missing:
+            raise KeyError(', '.join(missing))
+        axes = [grid[field] if isinstance(grid[field], list) else [grid[field]] for field in PAYMENT_FIELDS]
+        size = int(np.prod([len(axis) for axis in axes]))
+        if size > MAX_BATCH_SIZE:
+            raise OverflowError(size)
+        combos = itertools.product(*axes)
+    elif 'items' in data:
+        items = data['items']
+        if len(items) > MAX_BATCH_SIZE:
+            raise OverflowError(len(items))
+        missing = sorted({field for item in items for field in PAYMENT_FIELDS if field not in item})
+        if missing:
+            raise KeyError(', '.join(missing))
+        combos = ([item[field] for field in PAYMENT_FIELDS] for item in items)
+    else:
+        raise KeyError("items or grid")
+
+    columns = np.array(list(combos), dtype=np.float64).reshape(-1, len(PAYMENT_FIELDS)).T
+    return dict(zip(PAYMENT_FIELDS, columns))
+
+@bp.route('/calculate-payments', methods=['POST'])
+def calculate_payments_batch_endpoint():
+    """
+    Calculates monthly payments for many inputs in one vectorized pass.
+    Accepts JSON with either `items`: [{vehicle_price, down_payment, loan_term_months,
+    annual_interest_rate}, ...] or `grid`: {field: value or [values]} to sweep every
+    combination. Results are returned in input (or grid) order.
+    """
+    data = request.get_json()
+    if not data:
+        return jsonify({"message": "Invalid input: No data provided"}), 400
+
+    try:
+        inputs = _batch_inputs(data)
+    except KeyError as e:
+        return jsonify({"message": f"Missing required fields: {e.args[0]}"}), 400
+    except OverflowError as e:
+        return jsonify({"message": f"Batch of {e.args[0]} exceeds the limit of {MAX_BATCH_SIZE} calculations."}), 400
+    except (ValueError, TypeError) as e:
+        return jsonify({"message": "Invalid data type for one of the fields. Please use numbers.", "error": str(e)}), 400
+
+    vehicle_price = inputs['vehicle_price']
+    down_payment = inputs['down_payment']
+    loan_term_months = np.floor(inputs['loan_term_months'])
+    annual_interest_rate = inputs['annual_interest_rate']
+
+    def first_invalid(mask, message):
+        index = int(np.flatnonzero(mask)[0])
+        return jsonify({"message": message, "index": index}), 400
+
+    if not np.isfinite(np.stack(list(inputs.values()))).all():
+        return jsonify({"message": "Invalid data type for one of the fields. Please use numbers."}), 400
+    negative = (vehicle_price < 0) | (down_payment < 0) | (loan_term_months < 0) | (annual_interest_rate < 0)
+    if negative.any():
+        return first_invalid(negative, "Negative values are not allowed for financial calculations.")
+    if (vehicle_price < down_payment).any():
+        return first_invalid(vehicle_price < down_payment, "Down payment cannot be greater than the vehicle price.")
+    no_term = (loan_term_months == 0) & (vehicle_price > down_payment)
+    if no_term.any():
+        return first_invalid(no_term, "Loan term cannot be zero if there is a balance to pay.")
+
+    principal = vehicle_price - down_payment
+    monthly_payment, total_interest, total_cost_of_loan = calculate_amortization_batch(
+        principal, annual_interest_rate, loan_term_months
+    )
+    # A fully paid vehicle has no loan, matching the single-payment endpoint.
+    paid = principal <= 0
+    monthly_payment = np.where(paid, 0.0, monthly_payment)
+    total_interest = np.where(paid, 0.0, total_interest)
+    total_cost_of_loan = np.where(paid, 0.0, total_cost_of_loan)
+    total_cost_of_vehicle = np.where(paid, vehicle_price, total_cost_of_loan + down_payment)
+
+    columns = {
+        "vehicle_price": vehicle_price,
+        "down_payment": down_payment,
+        "loan_term_months": loan_term_months.astype(np.int64),
+        "annual_interest_rate": annual_interest_rate,
+        "monthly_payment": np.round(monthly_payment, 2),
+        "total_loan_amount": np.round(np.maximum(principal, 0), 2),
+        "total_interest_paid": np.round(total_interest, 2),
+        "total_cost_of_loan": np.round(total_cost_of_loan, 2),
+        "total_cost_of_vehicle": np.round(total_cost_of_vehicle, 2),
+    }
+    lists = {key: values.tolist() for key, values in columns.items()}
+    results = [dict(zip(lists, row)) for row in zip(*lists.values())]
+    return jsonify({"count": len(results), "results": results})
+
+@bp.route('/amortization-schedule', methods=['POST'])
+def amortization_schedule_endpoint():
+    """
+    Streams a month-by-month amortization schedule as JSON lines (default) or
+    CSV (`?format=csv`). Accepts the same JSON body as /calculate-payment.
+    """
+    data = request.get_json()
+    if not data:
+        return jsonify({"message": "Invalid input: No data provided"}), 400
+
+    missing_fields = [field for field in PAYMENT_FIELDS if field not in data]
+    if missing_fields:
+        return jsonify({"message": f"Missing required fields: {', '.join(missing_fields)}"}), 400
+
+    output_format = request.args.get('format', 'ndjson')
+    if output_format not in ('ndjson', 'csv'):
+        return jsonify({"message": "Invalid format. Expected 'ndjson' or 'csv'."}), 400
+
+    try:
+        vehicle_price = float(data['vehicle_price'])
+        down_payment = float(data['down_payment'])
+        loan_term_months = int(data['loan_term_months'])
+        annual_interest_rate = float(data['annual_interest_rate'])
+    except (ValueError, TypeError) as e:
+        return jsonify({"message": "Invalid data type for one of the fields. Please use numbers.", "error": str(e)}), 400
+
+    if vehicle_price < 0 or down_payment < 0 or loan_term_months < 0 or annual_interest_rate < 0:
+        return jsonify({"message": "Negative values are not allowed for financial calculations."}), 400
+    if vehicle_price < down_payment:
+        return jsonify({"message": "Down payment cannot be greater than the vehicle price."}), 400
+    if loan_term_months == 0 and vehicle_price > down_payment:
+        return jsonify({"message": "Loan term cannot be zero if there is a balance to pay."}), 400
+    if loan_term_months > MAX_SCHEDULE_MONTHS:
+        return jsonify({"message": f"Loan term cannot exceed {MAX_SCHEDULE_MONTHS} months."}), 400
+
+    principal = vehicle_price - down_payment
+    rows = amortization_schedule(principal, annual_interest_rate, loan_term_months) if principal > 0 else iter(())
+
+    if output_format == 'csv':
+        def generate():
+            yield "month,payment,principal,interest,balance\n"
+            for row in rows:
+                yield f"{row['month']},{row['payment']:.2f},{row['principal']:.2f},{row['interest']:.2f},{row['balance']:.2f}\n"
+        return Response(generate(), mimetype='text/csv')
+
+    def generate():
+        for row in rows:
+            yield json.dumps(row) + "\n"
+    return Response(generate(), mimetype='application/x-ndjson')
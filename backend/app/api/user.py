@@ -1,6 +1,7 @@
 from flask import Blueprint, jsonify, g, request
 from ..core.db import get_supabase
 from ..core.security import auth_required
+from ..services.profiles import get_profile, update_profile
 
 # A Blueprint for user-related endpoints, such as profile management.
 bp = Blueprint('user', __name__, url_prefix='/users')
@@ -17,13 +18,13 @@ def get_user_profile():
         user_id = g.user.id
         supabase = get_supabase()
 
-        # Fetch the profile from the 'profiles' table using the user's ID
-        profile_response = supabase.table('profiles').select('*').eq('id', user_id).single().execute()
+        # Served from the per-worker profile cache when possible
+        profile = get_profile(supabase, user_id)
 
-        if not profile_response.data:
+        if not profile:
             return jsonify({"message": "Profile not found for this user"}), 404
 
-        return jsonify(profile_response.data), 200
+        return jsonify(profile), 200
 
     except Exception as e:
         return jsonify({"message": "An error occurred while retrieving the profile.", "error": str(e)}), 500
@@ -53,19 +54,14 @@ def update_user_profile():
         if not update_payload:
             return jsonify({"message": "No valid fields to update"}), 400
 
-        # Perform the update operation
-        # The 'returning="minimal"' is default and doesn't return the updated row.
-        # We must re-fetch the data to return the updated profile.
-        supabase.table('profiles').update(update_payload).eq('id', user_id).execute()
+        # Perform the update; PostgREST returns the updated row in the same
+        # round trip, and the profile cache is refreshed with it.
+        updated_profile = update_profile(supabase, user_id, update_payload)
 
-        # Fetch the updated profile to return it in the response
-        updated_profile_response = supabase.table('profiles').select('*').eq('id', user_id).single().execute()
+        if not updated_profile:
+            return jsonify({"message": "Profile not found"}), 404
 
-        if not updated_profile_response.data:
-            # This case should be rare but is a good safeguard
-            return jsonify({"message": "Profile not found after update"}), 404
-
-        return jsonify(updated_profile_response.data), 200
+        return jsonify(updated_profile), 200
 
     except ValidationError as e:
         return jsonify({"message": "Validation failed", "errors": e.errors()}), 422
@@ -0,0 +1,61 @@
+import contextvars
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from flask import current_app
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+_in_fan_out = threading.local()
+
+
+def _get_executor():
+    global _executor, _executor_pid
+    if _executor_pid != os.getpid():
+        with _executor_lock:
+            if _executor_pid != os.getpid():
+                # Threads do not survive a fork, so each worker builds its own pool.
+                _executor = ThreadPoolExecutor(
+                    max_workers=current_app.config.get('FANOUT_MAX_WORKERS', 32),
+                    thread_name_prefix='fan-out',
+                )
+                _executor_pid = os.getpid()
+    return _executor
+
+
+def _run_marked(context, call):
+    _in_fan_out.active = True
+    try:
+        return context.run(call)
+    finally:
+        _in_fan_out.active = False
+
+
+def fan_out(*calls):
+    """
+    Runs independent zero-argument callables concurrently and returns their
+    results in order, so a request waits for its slowest upstream query rather
+    than the sum of them. If calls fail, the exception of the first failing
+    call (in argument order) is re-raised once all of them have finished.
+
+    Each call runs in a copy of the current context, so `current_app`, `g` and
+    `request` work as usual. Call `get_supabase()` before fanning out so the
+    calls share the request's pooled client instead of racing to check one out.
+    Under gevent workers the pool threads are greenlets, so the calls overlap
+    on the event loop. Nested fan-outs, and apps with `FANOUT_ENABLED` off,
+    run the calls one after another.
+    """
+    if len(calls) < 2 or getattr(_in_fan_out, 'active', False) \
+            or not current_app.config.get('FANOUT_ENABLED', True):
+        return [call() for call in calls]
+
+    executor = _get_executor()
+    futures = [executor.submit(_run_marked, contextvars.copy_context(), call) for call in calls[1:]]
+    try:
+        first = calls[0]()
+    finally:
+        # Never let a call outlive the request, even when another one failed.
+        wait(futures)
+    return [first] + [future.result() for future in futures]
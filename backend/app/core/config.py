@@ -14,3 +14,122 @@ class Config:
     SUPABASE_URL = "https://example.supabase.co"
     SUPABASE_KEY = "your-anon-key"
     SUPABASE_SERVICE_ROLE_KEY = "your-service-role-key"
+
+    # Supabase client pool settings (per worker process)
+    SUPABASE_POOL_SIZE = 10
+    SUPABASE_POOL_TIMEOUT = 5.0  # seconds to wait for a free client
+    SUPABASE_HTTP_TIMEOUT = 10.0  # seconds per upstream HTTP request
+
+    # JWT verification. In 'local' mode tokens are checked offline against the
+    # project's JWT secret (HS256) or JWKS endpoint and cached until they expire;
+    # 'remote' mode calls Supabase Auth on every request.
+    AUTH_VERIFY_MODE = "local"
+    SUPABASE_JWT_SECRET = None
+    SUPABASE_JWKS_URL = None  # e.g. "https://<project>.supabase.co/auth/v1/.well-known/jwks.json"
+    SUPABASE_JWT_AUDIENCE = "authenticated"
+    AUTH_TOKEN_CACHE_SIZE = 4096
+
+    # Role cache for admin_required (seconds / entries)
+    ROLE_CACHE_TTL = 60
+    ROLE_CACHE_SIZE = 1024
+
+    # Default `total` count strategy for inventory search:
+    # 'exact', 'planned', 'estimated' or 'none'
+    INVENTORY_COUNT_STRATEGY = "estimated"
+
+    # Facet count cache (seconds / entries)
+    FACET_CACHE_TTL = 60
+    FACET_CACHE_SIZE = 2048
+
+    # Optional in-process columnar read model for anonymous inventory reads
+    INVENTORY_INDEX_ENABLED = False
+    INVENTORY_INDEX_REFRESH_SECONDS = 60
+
+    # Background refreshers (inventory index, stats rollup): seconds before a
+    # failed load is retried
+    REFRESH_RETRY_SECONDS = 30
+
+    # HTTP caching. Responses carry surrogate keys in this header, and writes
+    # purge them via CDN_PURGE_URL (e.g. a Fastly purge endpoint) when set.
+    SURROGATE_KEY_HEADER = "Surrogate-Key"
+    CDN_PURGE_URL = None
+    CDN_PURGE_TOKEN = None
+
+    # Full-text search: max ranked matches per query, and result cache
+    SEARCH_MAX_RESULTS = 200
+    SEARCH_CACHE_TTL = 60
+    SEARCH_CACHE_SIZE = 2048
+
+    # Skip Pydantic validation of vehicle rows read from our own database and
+    # only re-key them for the response (see services/serialization.py).
+    TRUST_DATABASE_ROWS = False
+
+    # Defaults for affordability (monthly payment) inventory search
+    FINANCE_DEFAULT_TERM_MONTHS = 60
+    FINANCE_DEFAULT_APR = 6.9
+
+    # Bidding: minimum raise over the current high bid (must match the
+    # constant in the place_bid function, which enforces it), and the
+    # per-worker high-bid cache (seconds / entries)
+    BID_MIN_INCREMENT = 100
+    BID_CACHE_TTL = 30
+    BID_CACHE_SIZE = 4096
+
+    # Live event streaming (SSE): change-feed poll interval, per-worker event
+    # buffer and subscriber cap, and keep-alive interval (seconds)
+    STREAM_POLL_INTERVAL = 1.0
+    STREAM_BUFFER_SIZE = 1024
+    STREAM_MAX_SUBSCRIBERS = 5000
+    STREAM_HEARTBEAT_SECONDS = 15
+
+    # Bulk listing import: rows per insert request
+    LISTING_IMPORT_CHUNK_SIZE = 500
+
+    # Active-offers index: it reloads at the next offer start/end, after admin
+    # writes, and at the latest after this many seconds
+    OFFERS_CACHE_MAX_AGE = 300
+
+    # Per-user profile cache, written through on profile updates (seconds / entries)
+    PROFILE_CACHE_TTL = 300
+    PROFILE_CACHE_SIZE = 4096
+
+    # Concurrent fan-out of independent upstream queries within a request
+    FANOUT_ENABLED = True
+    FANOUT_MAX_WORKERS = 32
+
+    # Vehicle detail page sections: cache TTL per section (seconds) and entries
+    VDP_SECTION_TTLS = {'vehicle': 60, 'media': 300, 'price_history': 300, 'bids': 2}
+    VDP_CACHE_SIZE = 4096
+
+    # Price-history chart series: default/maximum points per response, rows
+    # read per query, and the per-worker series cache (seconds / entries)
+    PRICE_SERIES_DEFAULT_POINTS = 200
+    PRICE_SERIES_MAX_POINTS = 1000
+    PRICE_SERIES_MAX_ROWS = 100000
+    PRICE_SERIES_CACHE_TTL = 300
+    PRICE_SERIES_CACHE_SIZE = 1024
+
+    # Site statistics (/stats/summary): rollup refresh interval, how long a
+    # request waits for a worker's first rollup (seconds), and the figures
+    # that are not computed from the database
+    STATS_REFRESH_SECONDS = 300
+    STATS_FIRST_LOAD_WAIT = 2.0
+    STATS_AVERAGE_RATING = 4.9
+    STATS_FINANCING_HEADLINE = "0% APR"
+    STATS_SUPPORT_HOURS = "24/7"
+
+    # Request and Supabase call metrics at /meta/metrics, and a log line with
+    # the upstream query chain for requests slower than SLOW_REQUEST_MS (None disables).
+    # The /meta diagnostics (pool, cache, stream, metrics) need staff access or,
+    # for scrapers, `Authorization: Bearer <META_TOKEN>` when a token is set
+    METRICS_ENABLED = True
+    SLOW_REQUEST_MS = 1000
+    META_TOKEN = None
+
+    # Worker warmup after fork (see core/startup.py): primes pooled clients,
+    # the upstream connection, caches and the JWKS before serving requests.
+    # Steps still pending when the budget runs out are skipped; keep it well
+    # below the gunicorn worker timeout
+    WARMUP_ENABLED = True
+    WARMUP_POOL_CLIENTS = 4
+    WARMUP_BUDGET_SECONDS = 10
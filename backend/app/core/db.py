@@ -1,26 +1,217 @@
-from supabase import create_client, Client
-from flask import current_app, g
+import hashlib
+import os
+import queue
+import threading
 
-def get_supabase() -> Client:
+import httpx
+from supabase import create_client, Client, ClientOptions
+from flask import current_app, g, has_request_context, request
+
+
+class SupabasePool:
     """
-    Connects to the Supabase client for the current application context.
-    If a connection is not available, it creates one.
+    A process-wide pool of Supabase clients.
+
+    All pooled clients share one keep-alive httpx connection pool, so requests
+    reuse open TLS connections to PostgREST and GoTrue instead of building a new
+    client (and handshake) per request. Each request checks out a client for its
+    exclusive use, so the per-request Authorization header can be injected
+    without leaking between concurrent requests.
+
+    The pool is fork-safe: it records the PID that built it and rebuilds itself
+    the first time it is touched from a forked child (e.g. a gunicorn worker
+    forked from a preloaded master), so sockets are never shared across processes.
     """
-    if 'supabase' not in g:
-        url = current_app.config.get("SUPABASE_URL")
-        key = current_app.config.get("SUPABASE_KEY")
+
+    def __init__(self, url, key, size=10, timeout=5.0, http_timeout=10.0, event_hooks=None):
         if not url or not key:
             raise ValueError("Supabase URL and Key must be configured.")
-        g.supabase = create_client(url, key)
+        self.url = url
+        self.key = key
+        self.size = size
+        self.timeout = timeout
+        self.http_timeout = http_timeout
+        # httpx event hooks, e.g. the upstream call instrumentation from core/metrics.py
+        self.event_hooks = event_hooks
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        # Called on construction and in forked children. The parent's sockets are
+        # deliberately dropped rather than closed, as the parent still owns them.
+        self._pid = os.getpid()
+        self._idle = queue.LifoQueue()
+        self._http = None
+        self._created = 0
+        self._in_use = 0
+        self._checkouts = 0
+        self._waits = 0
+        self._timeouts = 0
+
+    def _ensure_process(self):
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._reset()
+
+    def _http_client(self):
+        if self._http is None:
+            self._http = httpx.Client(
+                http2=True,
+                follow_redirects=True,
+                timeout=self.http_timeout,
+                event_hooks=self.event_hooks,
+                limits=httpx.Limits(
+                    max_connections=self.size * 2,
+                    max_keepalive_connections=self.size,
+                ),
+            )
+        return self._http
+
+    def _create(self) -> Client:
+        options = ClientOptions(
+            httpx_client=self._http_client(),
+            auto_refresh_token=False,
+            persist_session=False,
+        )
+        return create_client(self.url, self.key, options=options)
+
+    def acquire(self, access_token=None) -> Client:
+        """
+        Checks out a client, creating one if the pool has not reached its size.
+        Blocks for up to `timeout` seconds when every client is in use.
+        """
+        self._ensure_process()
+        client = None
+        with self._lock:
+            self._checkouts += 1
+            try:
+                client = self._idle.get_nowait()
+            except queue.Empty:
+                if self._created < self.size:
+                    self._created += 1
+                    client = self._create()
+        if client is None:
+            with self._lock:
+                self._waits += 1
+            try:
+                client = self._idle.get(timeout=self.timeout)
+            except queue.Empty:
+                with self._lock:
+                    self._timeouts += 1
+                raise RuntimeError("Timed out waiting for a pooled Supabase client.")
+        with self._lock:
+            self._in_use += 1
+
+        # Run PostgREST queries as the calling user so RLS policies apply.
+        client.postgrest.auth(access_token or self.key)
+        return client
+
+    def release(self, client: Client):
+        """Returns a client to the pool, resetting it to the anon key."""
+        if self._pid != os.getpid():
+            # Checked out in the parent before fork; let it be garbage collected.
+            return
+        client.postgrest.auth(self.key)
+        with self._lock:
+            self._in_use -= 1
+        self._idle.put(client)
+
+    def stats(self):
+        """Returns a snapshot of pool utilisation counters."""
+        return {
+            "pid": self._pid,
+            "size": self.size,
+            "created": self._created,
+            "in_use": self._in_use,
+            "idle": self._idle.qsize(),
+            "checkouts": self._checkouts,
+            "waits": self._waits,
+            "timeouts": self._timeouts,
+        }
+
+
+def get_pool(app=None) -> SupabasePool:
+    """
+    Returns the Supabase client pool for the application, creating it on first use.
+    """
+    app = app or current_app
+    pool = app.extensions.get('supabase_pool')
+    if pool is None:
+        from .metrics import httpx_event_hooks
+        pool = SupabasePool(
+            app.config.get("SUPABASE_URL"),
+            app.config.get("SUPABASE_KEY"),
+            size=app.config.get("SUPABASE_POOL_SIZE", 10),
+            timeout=app.config.get("SUPABASE_POOL_TIMEOUT", 5.0),
+            http_timeout=app.config.get("SUPABASE_HTTP_TIMEOUT", 10.0),
+            event_hooks=httpx_event_hooks(app) if app.config.get("METRICS_ENABLED", True) else None,
+        )
+        app.extensions['supabase_pool'] = pool
+    return pool
+
+
+def _request_access_token():
+    """Extracts a bearer token from the current request, if there is one."""
+    if not has_request_context():
+        return None
+    parts = request.headers.get('Authorization', '').split()
+    if len(parts) == 2 and parts[0].lower() == 'bearer':
+        return parts[1]
+    return None
+
+
+def _caller_token():
+    """
+    The caller's token once `auth_required` has verified it (`g.user` is set),
+    otherwise None. Public routes therefore query PostgREST with the anon key,
+    as they did before pooling, so a stale token sent to a public endpoint does
+    not turn into a PostgREST error.
+    """
+    if not has_request_context() or g.get('user') is None:
+        return None
+    return _request_access_token()
+
+
+def rls_scope():
+    """
+    Identifies whose RLS view of the data the current request sees: 'anon' for
+    public routes and unauthenticated requests, otherwise a digest of the
+    caller's token. Caches of query results must be keyed by this so rows
+    hidden by RLS never leak.
+    """
+    token = _caller_token()
+    if token is None:
+        return 'anon'
+    return hashlib.sha256(token.encode()).hexdigest()[:32]
+
+
+def get_supabase() -> Client:
+    """
+    Checks out a pooled Supabase client for the current application context.
+    On authenticated routes the caller's JWT is attached so PostgREST enforces
+    RLS for that user; if the client was checked out before authentication
+    finished (remote token verification), it is switched over here.
+    """
+    token = _caller_token()
+    if 'supabase' not in g:
+        g.supabase = get_pool().acquire(token)
+        g.supabase_token = token
+    elif g.get('supabase_token') != token:
+        g.supabase.postgrest.auth(token or get_pool().key)
+        g.supabase_token = token
     return g.supabase
 
+
 def close_supabase(e=None):
     """
-    Closes the Supabase connection at the end of the request.
+    Returns the request's Supabase client to the pool at the end of the request.
     """
-    # The supabase-py client manages its own connection pool,
-    # so we just need to ensure it's removed from the app context.
-    g.pop('supabase', None)
+    client = g.pop('supabase', None)
+    g.pop('supabase_token', None)
+    if client is not None:
+        get_pool().release(client)
+
 
 def init_app(app):
     """
@@ -0,0 +1,135 @@
+import hashlib
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+
+import httpx
+from flask import current_app, g, make_response, request
+
+from .db import rls_scope
+
+
+def add_surrogate_keys(*keys):
+    """
+    Tags the current response with CDN surrogate keys (e.g. 'vehicle-<id>'),
+    so that purging one key evicts exactly the cached pages that contain it.
+    """
+    g.setdefault('surrogate_keys', set()).update(str(key) for key in keys)
+
+
+def not_modified(etag=None, last_modified=None):
+    """
+    Checks the request's validators against a cheaply computed ETag and/or
+    Last-Modified before the view serializes anything. Returns a 304 response
+    if the client's copy is current, otherwise None. The validators are also
+    remembered and attached to the eventual 200 response.
+    """
+    if etag is not None:
+        g.http_etag = etag
+    if last_modified is not None:
+        g.http_last_modified = last_modified
+
+    if etag is not None and request.if_none_match:
+        if request.if_none_match.contains(etag):
+            return make_response('', 304)
+    elif last_modified is not None and request.if_modified_since:
+        if last_modified.replace(microsecond=0) <= request.if_modified_since:
+            return make_response('', 304)
+    return None
+
+
+def cap_max_age(seconds):
+    """
+    Caps the current response's max-age and s-maxage at `seconds`, for data
+    known to change at a given instant (e.g. when an offer's window ends).
+    """
+    seconds = max(int(seconds), 0)
+    g.http_max_age_cap = min(seconds, g.get('http_max_age_cap', seconds))
+
+
+def http_cache(max_age=60, s_maxage=None, keys=()):
+    """
+    A decorator adding HTTP caching to a read endpoint.
+
+    Successful responses get a strong ETag (the one passed to `not_modified`,
+    or a hash of the body), a per-route Cache-Control header and surrogate keys.
+    Conditional requests are answered with 304. Responses to authenticated
+    requests depend on the caller's RLS view, so they are marked private and
+    carry no surrogate keys. Views can lower the lifetimes with `cap_max_age`.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            add_surrogate_keys(*keys)
+            response = make_response(f(*args, **kwargs))
+            if request.method != 'GET' or response.status_code not in (200, 304):
+                return response
+
+            if response.status_code == 200:
+                etag = g.get('http_etag')
+                if etag is None:
+                    etag = hashlib.blake2b(response.get_data(), digest_size=16).hexdigest()
+                response.set_etag(etag)
+                if g.get('http_last_modified') is not None:
+                    response.last_modified = g.http_last_modified
+            else:
+                response.set_etag(g.get('http_etag', ''))
+
+            response.vary.add('Authorization')
+            cap = g.get('http_max_age_cap')
+            if rls_scope() == 'anon':
+                response.cache_control.public = True
+                response.cache_control.max_age = max_age if cap is None else min(max_age, cap)
+                if s_maxage is not None:
+                    response.cache_control.s_maxage = s_maxage if cap is None else min(s_maxage, cap)
+                header = current_app.config.get('SURROGATE_KEY_HEADER', 'Surrogate-Key')
+                response.headers[header] = ' '.join(sorted(g.get('surrogate_keys', ())))
+            else:
+                response.cache_control.private = True
+                response.cache_control.max_age = max_age if cap is None else min(max_age, cap)
+
+            return response.make_conditional(request)
+        return decorated_function
+    return decorator
+
+
+_purge_executor = None
+_purge_executor_pid = None
+_purge_executor_lock = threading.Lock()
+
+
+def _get_purge_executor():
+    global _purge_executor, _purge_executor_pid
+    if _purge_executor_pid != os.getpid():
+        with _purge_executor_lock:
+            if _purge_executor_pid != os.getpid():
+                # One thread per worker keeps purges ordered; threads do not survive a fork.
+                _purge_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='cdn-purge')
+                _purge_executor_pid = os.getpid()
+    return _purge_executor
+
+
+def _send_purge(purge_url, headers, keys):
+    try:
+        httpx.post(purge_url, headers=headers, timeout=5.0).raise_for_status()
+    except Exception as e:
+        print(f"Error purging surrogate keys {keys}: {e}")
+
+
+def purge_surrogate_keys(*keys, app=None):
+    """
+    Asks the CDN to evict every cached response tagged with any of `keys`.
+    A no-op unless CDN_PURGE_URL is configured. The purge is sent from a
+    background thread, so writes do not wait on the CDN. Failures are logged,
+    not raised, since the cached copies will still expire on their own.
+    """
+    config = (app or current_app).config
+    purge_url = config.get('CDN_PURGE_URL')
+    if not purge_url or not keys:
+        return
+    headers = {config.get('SURROGATE_KEY_HEADER', 'Surrogate-Key'): ' '.join(keys)}
+    token = config.get('CDN_PURGE_TOKEN')
+    if token:
+        headers['Authorization'] = f"Bearer {token}"
+    _get_purge_executor().submit(_send_purge, purge_url, headers, keys)
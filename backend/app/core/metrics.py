@@ -0,0 +1,300 @@
+import bisect
+import contextvars
+import os
+import re
+import threading
+import time
+
+from flask import current_app, g, request
+
+# Histogram bucket upper bounds (Prometheus `le`), plus an implicit +Inf.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+CALL_COUNT_BUCKETS = (0, 1, 2, 3, 4, 6, 8, 12, 16, 32)
+
+# PostgREST filter operators, kept when a query is reduced to its shape.
+FILTER_OPERATORS = frozenset((
+    'eq', 'neq', 'gt', 'gte', 'lt', 'lte', 'like', 'ilike', 'match', 'imatch', 'in', 'is',
+    'isdistinct', 'fts', 'plfts', 'phfts', 'wfts', 'cs', 'cd', 'ov', 'sl', 'sr', 'nxl', 'nxr', 'adj',
+))
+# Query parameters whose values are column lists rather than user input.
+SHAPE_KEEP_VALUES = frozenset(('select', 'order', 'on_conflict', 'columns'))
+_COLUMN = re.compile(r'\w+')
+
+# Upstream calls made while serving the current request, or None outside one.
+# fan_out copies the context into its threads, so their calls land here too.
+_request_calls = contextvars.ContextVar('request_calls', default=None)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(names, values, extra=()):
+    pairs = [f'{n}="{_escape(v)}"' for n, v in (*zip(names, values), *extra)]
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """A thread-safe counter family keyed by label values."""
+
+    kind = 'counter'
+
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, label_values=(), amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        for label_values, value in items:
+            yield f"{self.name}{_labels(self.labels, label_values)} {_number(value)}"
+
+
+class Histogram:
+    """
+    A thread-safe histogram family keyed by label values. Observations are
+    counted per bucket and accumulated into cumulative `le` buckets on render.
+    """
+
+    kind = 'histogram'
+
+    def __init__(self, name, help, buckets, labels=()):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(buckets)
+        self.labels = labels
+        self._series = {}   # label values -> [per-bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, label_values, value):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def samples(self):
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._series.items())
+        for label_values, series in items:
+            cumulative = 0
+            for bound, count in zip((*self.buckets, '+Inf'), series[:-1]):
+                cumulative += count
+                le = (('le', bound if bound == '+Inf' else _number(bound)),)
+                yield f"{self.name}_bucket{_labels(self.labels, label_values, le)} {cumulative}"
+            yield f"{self.name}_sum{_labels(self.labels, label_values)} {_number(series[-1])}"
+            yield f"{self.name}_count{_labels(self.labels, label_values)} {cumulative}"
+
+
+class Metrics:
+    """
+    Per-process request and upstream (Supabase) metrics, rendered in the
+    Prometheus text exposition format. Each gunicorn worker keeps its own
+    registry, so a scrape of /meta/metrics sees the worker that served it;
+    the `pid` label on `process_info` tells workers apart.
+    """
+
+    def __init__(self):
+        route = ('route', 'method')
+        self.request_duration = Histogram(
+            'http_request_duration_seconds', 'Time to produce a response, by route.',
+            LATENCY_BUCKETS, route)
+        self.responses = Counter(
+            'http_responses_total', 'Responses sent, by route and status code.', route + ('status',))
+        self.response_size = Histogram(
+            'http_response_size_bytes', 'Response body size, by route (streamed responses excluded).',
+            SIZE_BUCKETS, route)
+        self.request_upstream_calls = Histogram(
+            'http_request_upstream_calls', 'Supabase calls made while serving one request, by route.',
+            CALL_COUNT_BUCKETS, route)
+        self.request_upstream_duration = Histogram(
+            'http_request_upstream_seconds', 'Summed Supabase call time within one request, by route.',
+            LATENCY_BUCKETS, route)
+        self.upstream_duration = Histogram(
+            'supabase_call_duration_seconds',
+            'Supabase call latency (to response headers), by target table, RPC or auth endpoint.',
+            LATENCY_BUCKETS, ('target', 'method', 'status'))
+        self.families = [
+            self.request_duration, self.responses, self.response_size,
+            self.request_upstream_calls, self.request_upstream_duration, self.upstream_duration,
+        ]
+        self.started_at = time.time()
+
+    def render(self):
+        lines = [
+            '# HELP process_info Worker process serving this scrape.',
+            '# TYPE process_info gauge',
+            f'process_info{_labels(("pid",), (os.getpid(),))} 1',
+            '# HELP process_start_time_seconds When this worker started collecting metrics.',
+            '# TYPE process_start_time_seconds gauge',
+            f'process_start_time_seconds {_number(self.started_at)}',
+        ]
+        for family in self.families:
+            lines.append(f'# HELP {family.name} {family.help}')
+            lines.append(f'# TYPE {family.name} {family.kind}')
+            lines.extend(family.samples())
+        return '\n'.join(lines) + '\n'
+
+
+def get_metrics(app=None) -> Metrics:
+    """Returns the application's metrics registry, creating it on first use."""
+    app = app or current_app
+    metrics = app.extensions.get('metrics')
+    if metrics is None:
+        metrics = app.extensions.setdefault('metrics', Metrics())
+    return metrics
+
+
+def _upstream_target(path):
+    """Maps an upstream URL path to a low-cardinality label, e.g. 'vehicles' or 'rpc/place_bid'."""
+    for prefix, label in (('/rest/v1/', ''), ('/auth/v1/', 'auth/'), ('/storage/v1/', 'storage/')):
+        if path.startswith(prefix):
+            rest = path[len(prefix):]
+            if label == 'storage/':
+                rest = rest.split('/', 1)[0]
+            return label + rest
+    return path
+
+
+def _filter_shape(value):
+    """Reduces a filter value such as 'lte.30000' or 'not.is.null' to its operator."""
+    parts = value.split('.', 2)
+    if parts[0] == 'not' and len(parts) > 1 and parts[1] in FILTER_OPERATORS:
+        return 'not.' + parts[1]
+    return parts[0] if parts[0] in FILTER_OPERATORS else '?'
+
+
+def _logic_shape(value):
+    """Reduces an or/and group such as '(make.ilike.*a*,model.ilike.*a*)' to 'make.ilike,model.ilike'."""
+    shapes = []
+    for item in value.strip('()').split(','):
+        column, _, rest = item.partition('.')
+        shape = column + '.' + _filter_shape(rest) if _COLUMN.fullmatch(column) and rest else '?'
+        if shape not in shapes:
+            shapes.append(shape)
+    return ','.join(shapes)
+
+
+def query_shape(params):
+    """
+    Reduces an upstream PostgREST query to its shape, for logging: filters
+    become `column=operator`, or/and groups list their column.operator pairs,
+    and only column lists (select, order) keep their values. Search terms,
+    ids and other user input never appear.
+    """
+    shape = []
+    for key, value in params:
+        if key in SHAPE_KEEP_VALUES:
+            shape.append(f"{key}={value}")
+        elif key in ('limit', 'offset'):
+            shape.append(key)
+        elif key in ('or', 'and', 'not.or', 'not.and'):
+            shape.append(f"{key}=({_logic_shape(value)})")
+        else:
+            shape.append(f"{key}={_filter_shape(value)}")
+    return '&'.join(shape)
+
+
+def httpx_event_hooks(app):
+    """
+    Returns httpx event hooks that time every Supabase call made through the
+    shared HTTP client, record it in the registry, and attach it to the
+    request being served (for per-request counts and the slow-request log).
+    """
+    metrics = get_metrics(app)
+
+    def on_request(upstream_request):
+        upstream_request.extensions['metrics_started'] = time.perf_counter()
+
+    def on_response(response):
+        started = response.request.extensions.get('metrics_started')
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        url = response.request.url
+        target = _upstream_target(url.path)
+        metrics.upstream_duration.observe((target, response.request.method, str(response.status_code)), elapsed)
+        calls = _request_calls.get()
+        if calls is not None:
+            query = query_shape(url.params.multi_items())
+            calls.append((response.request.method, target + ('?' + query if query else ''),
+                          response.status_code, elapsed))
+
+    return {'request': [on_request], 'response': [on_response]}
+
+
+def _route_label():
+    rule = request.url_rule
+    return rule.rule if rule is not None else '<unmatched>'
+
+
+def _start_timer():
+    g.metrics_started = time.perf_counter()
+    g.metrics_calls_token = _request_calls.set([])
+
+
+def _record_request(response):
+    started = g.pop('metrics_started', None)
+    if started is None:
+        return response
+    elapsed = time.perf_counter() - started
+    calls = _request_calls.get() or []
+    token = g.pop('metrics_calls_token', None)
+    if token is not None:
+        try:
+            _request_calls.reset(token)
+        except ValueError:
+            # Finished in a different context than it started (e.g. an error handler).
+            _request_calls.set(None)
+
+    metrics = get_metrics()
+    labels = (_route_label(), request.method)
+    metrics.request_duration.observe(labels, elapsed)
+    metrics.responses.inc(labels + (str(response.status_code),))
+    if not response.is_streamed:
+        metrics.response_size.observe(labels, response.calculate_content_length() or 0)
+    upstream = sum(duration for *_, duration in calls)
+    metrics.request_upstream_calls.observe(labels, len(calls))
+    metrics.request_upstream_duration.observe(labels, upstream)
+
+    threshold = current_app.config.get('SLOW_REQUEST_MS')
+    if threshold and elapsed * 1000 >= threshold:
+        # The query chain shows N+1 patterns, e.g. auth + role + data in sequence.
+        # Only the route and query shapes are logged, never ids or search terms.
+        lines = [
+            f"Slow request: {request.method} {labels[0]} -> {response.status_code} "
+            f"in {elapsed * 1000:.1f} ms, {len(calls)} upstream calls ({upstream * 1000:.1f} ms)"
+        ]
+        lines.extend(
+            f"    {method} {target[:200]} -> {status} in {duration * 1000:.1f} ms"
+            for method, target, status, duration in calls
+        )
+        print('\n'.join(lines))
+    return response
+
+
+def init_app(app):
+    """
+    Registers request instrumentation with the Flask app. Durations are
+    measured up to the response being returned, so streamed responses (the
+    event stream, CSV exports) count the time to their first byte.
+    """
+    if not app.config.get('METRICS_ENABLED', True):
+        return
+    get_metrics(app)
+    app.before_request(_start_timer)
+    app.after_request(_record_request)
@@ -0,0 +1,91 @@
+import os
+import threading
+import time
+
+
+class BackgroundRefresher:
+    """
+    Per-process state that a background thread rebuilds on a schedule, such
+    as the inventory index. Subclasses implement `load()`, which builds the new
+    state and swaps it in.
+
+    Requests never run `load()` themselves. The first call to `ensure_started()`
+    starts the thread, once per process (threads do not survive a gunicorn fork).
+    The thread loads right away and then every `refresh_interval` seconds. After
+    a failure it waits `failure_backoff` seconds before trying again, and the
+    previous state, if any, is kept. A failing upstream therefore sees one
+    retry per backoff, not one per request. Until the first load succeeds,
+    callers fall back or use `wait()`.
+    """
+
+    name = 'refresher'
+
+    def __init__(self, app, refresh_interval=60, failure_backoff=30):
+        self.app = app
+        self.refresh_interval = refresh_interval
+        self.failure_backoff = failure_backoff
+        self.refreshed_at = None
+        self.last_error = None
+        self.failures = 0
+        self.loaded = threading.Event()
+        self._attempted = threading.Event()
+        self._lock = threading.Lock()
+        self._pid = None
+
+    def load(self):
+        raise NotImplementedError
+
+    def refresh(self):
+        """Runs one load, recording its outcome. Returns True if it succeeded."""
+        try:
+            self.load()
+        except Exception as e:
+            # Keep serving the previous state; the thread retries after the backoff.
+            self.last_error = str(e)
+            self.failures += 1
+            print(f"Error refreshing {self.name}: {e}")
+            return False
+        finally:
+            self._attempted.set()
+        self.refreshed_at = time.time()
+        self.last_error = None
+        self.loaded.set()
+        return True
+
+    def _delay(self):
+        """Seconds to sleep after a refresh."""
+        return self.refresh_interval if self.last_error is None else self.failure_backoff
+
+    def _run(self):
+        while True:
+            self.refresh()
+            time.sleep(self._delay())
+
+    def ensure_started(self):
+        """Starts the refresher thread unless it is already running in this process."""
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            threading.Thread(target=self._run, name=self.name, daemon=True).start()
+            self._pid = os.getpid()
+
+    def wait(self, timeout):
+        """
+        Starts the refresher and waits up to `timeout` seconds for the first
+        load attempt. Once an attempt has been made it returns at once, so
+        callers fall back without stalling while the upstream is down.
+        Returns whether state is available.
+        """
+        self.ensure_started()
+        self._attempted.wait(timeout)
+        return self.loaded.is_set()
+
+    def stats(self):
+        return {
+            "refreshed_at": self.refreshed_at,
+            "refresh_interval": self.refresh_interval,
+            "failures": self.failures,
+            "last_error": self.last_error,
+        }
@@ -1,13 +1,152 @@
+import hmac
+import time
 from functools import wraps
-from flask import request, g, jsonify
+
+import jwt
+from flask import request, g, jsonify, current_app
 from supabase import Client
+from ..core.cache import TTLCache
 from ..core.db import get_supabase
 
-def auth_required(f):
+
+class TokenUser:
+    """
+    A lightweight stand-in for the Supabase `User` object, built from the claims
+    of a locally verified JWT. Exposes the attributes the routes rely on.
+    """
+
+    def __init__(self, claims):
+        self.id = claims['sub']
+        self.email = claims.get('email')
+        self.role = claims.get('role')
+        self.app_metadata = claims.get('app_metadata') or {}
+        self.user_metadata = claims.get('user_metadata') or {}
+        self.claims = claims
+
+
+def get_token_cache() -> TTLCache:
+    """
+    Returns the per-process cache of already-verified tokens. Entries expire at the
+    token's own `exp` claim, so a cached token is never honoured past its lifetime.
+    """
+    cache = current_app.extensions.get('verified_tokens')
+    if cache is None:
+        cache = TTLCache(maxsize=current_app.config.get('AUTH_TOKEN_CACHE_SIZE', 4096))
+        current_app.extensions['verified_tokens'] = cache
+    return cache
+
+
+def get_role_cache() -> TTLCache:
+    """
+    Returns the per-process cache of user roles used by `admin_required`.
+    Entries live for `ROLE_CACHE_TTL` seconds unless invalidated earlier.
+    """
+    cache = current_app.extensions.get('role_cache')
+    if cache is None:
+        cache = TTLCache(
+            maxsize=current_app.config.get('ROLE_CACHE_SIZE', 1024),
+            ttl=current_app.config.get('ROLE_CACHE_TTL', 60),
+        )
+        current_app.extensions['role_cache'] = cache
+    return cache
+
+
+def invalidate_role(user_id=None):
+    """
+    Drops the cached role for `user_id`, or every cached role if no id is given.
+    Call this whenever a profile's role is changed.
+    """
+    cache = get_role_cache()
+    if user_id is None:
+        cache.clear()
+    else:
+        cache.pop(str(user_id))
+
+
+def get_jwks_client():
+    """
+    Returns the per-process JWKS client used to verify asymmetric tokens, or
+    None when no `SUPABASE_JWKS_URL` is configured. Signing keys are cached
+    for an hour after the first fetch.
+    """
+    jwks_url = current_app.config.get('SUPABASE_JWKS_URL')
+    if not jwks_url:
+        return None
+    client = current_app.extensions.get('jwks_client')
+    if client is None:
+        client = jwt.PyJWKClient(jwks_url, cache_keys=True, lifespan=3600)
+        current_app.extensions['jwks_client'] = client
+    return client
+
+
+def local_verification_enabled() -> bool:
+    """True when tokens can be verified offline with the configured secret or JWKS."""
+    config = current_app.config
+    if config.get('AUTH_VERIFY_MODE', 'local') != 'local':
+        return False
+    return bool(config.get('SUPABASE_JWT_SECRET') or config.get('SUPABASE_JWKS_URL'))
+
+
+def decode_token_locally(jwt_token):
+    """
+    Verifies a Supabase JWT's signature, expiry and audience without a network call.
+    Raises `jwt.InvalidTokenError` if the token is not valid.
+    """
+    config = current_app.config
+    options = {"require": ["exp", "sub"]}
+    audience = config.get('SUPABASE_JWT_AUDIENCE')
+
+    secret = config.get('SUPABASE_JWT_SECRET')
+    if secret and jwt.get_unverified_header(jwt_token).get('alg') == 'HS256':
+        return jwt.decode(jwt_token, secret, algorithms=['HS256'], audience=audience, options=options)
+
+    jwks_client = get_jwks_client()
+    if jwks_client is None:
+        raise jwt.InvalidTokenError("No verification key configured for this token's algorithm")
+    signing_key = jwks_client.get_signing_key_from_jwt(jwt_token)
+    return jwt.decode(
+        jwt_token,
+        signing_key.key,
+        algorithms=['RS256', 'ES256', 'EdDSA'],
+        audience=audience,
+        options=options,
+    )
+
+
+def verify_token(jwt_token, remote=False):
+    """
+    Resolves a bearer token to a user. Tokens are verified locally and cached until
+    they expire; with `remote=True` (or when no local key is configured) GoTrue is
+    asked directly, which also catches tokens revoked before their expiry.
+    """
+    cache = get_token_cache()
+
+    if not remote and local_verification_enabled():
+        user = cache.get(jwt_token)
+        if user is not None:
+            return user
+        claims = decode_token_locally(jwt_token)
+        user = TokenUser(claims)
+        cache.set(jwt_token, user, ttl=claims['exp'] - time.time())
+        return user
+
+    # Use the Supabase client to validate the token and get the user
+    supabase: Client = get_supabase()
+    user = supabase.auth.get_user(jwt_token).user
+    return user
+
+
+def auth_required(f=None, *, remote=False):
     """
     A decorator to protect endpoints, requiring a valid Supabase JWT.
     It extracts the user from the token and attaches it to the request context 'g'.
+
+    Use `@auth_required(remote=True)` on revocation-sensitive routes to always
+    validate the token against Supabase Auth instead of the local cache.
     """
+    if f is None:
+        return lambda func: auth_required(func, remote=remote)
+
     @wraps(f)
     def decorated_function(*args, **kwargs):
         auth_header = request.headers.get('Authorization')
@@ -21,10 +160,7 @@ def auth_required(f):
         jwt_token = parts[1]
 
         try:
-            # Use the Supabase client to validate the token and get the user
-            supabase: Client = get_supabase()
-            user_response = supabase.auth.get_user(jwt_token)
-            user = user_response.user
+            user = verify_token(jwt_token, remote=remote)
 
             if not user:
                 return jsonify({"message": "Invalid or expired token"}), 401
@@ -33,33 +169,46 @@ def auth_required(f):
             g.user = user
 
         except Exception as e:
-            # This will catch gotrue.errors.AuthApiError for bad tokens
+            # This will catch jwt.InvalidTokenError and gotrue.errors.AuthApiError for bad tokens
             return jsonify({"message": "Token validation failed", "error": str(e)}), 401
 
         return f(*args, **kwargs)
     return decorated_function
 
 
-def admin_required(f):
+def admin_required(f=None, *, remote=False):
     """
     A decorator that builds on @auth_required to ensure the user has an admin,
-    manager, or staff role. It fetches the user's profile to check their role.
+    manager, or staff role. It fetches the user's profile to check their role,
+    caching it per user so repeated admin calls skip the profile query.
+
+    Use `@admin_required(remote=True)` on sensitive writes (role changes, bulk
+    writes) so a revoked or signed-out token is rejected before it expires.
     """
+    if f is None:
+        return lambda func: admin_required(func, remote=remote)
+
     @wraps(f)
-    @auth_required  # First, ensure the user is authenticated
+    @auth_required(remote=remote)  # First, ensure the user is authenticated
     def decorated_function(*args, **kwargs):
         # g.user is available from the @auth_required decorator
         user = g.user
 
         try:
-            supabase = get_supabase()
-            # Fetch the user's profile from the 'profiles' table to get the role.
-            profile_response = supabase.table('profiles').select('role').eq('id', user.id).single().execute()
+            role_cache = get_role_cache()
+            profile = role_cache.get(str(user.id))
+
+            if profile is None:
+                supabase = get_supabase()
+                # Fetch the user's profile from the 'profiles' table to get the role.
+                profile_response = supabase.table('profiles').select('role').eq('id', user.id).single().execute()
+
+                if not profile_response.data:
+                     return jsonify({"message": "User profile not found, cannot verify role"}), 404
 
-            if not profile_response.data:
-                 return jsonify({"message": "User profile not found, cannot verify role"}), 404
+                profile = profile_response.data
+                role_cache.set(str(user.id), profile)
 
-            profile = profile_response.data
             # Check if the user's role is sufficient
             if profile.get('role') not in ['admin', 'manager', 'staff']:
                 return jsonify({"message": "Administrator or staff access required"}), 403
@@ -72,3 +221,22 @@ def admin_required(f):
 
         return f(*args, **kwargs)
     return decorated_function
+
+
+def internal_required(f):
+    """
+    A decorator for internal diagnostics endpoints. Accepts the configured
+    `META_TOKEN` as a bearer token (for metrics scrapers and probes), and
+    otherwise falls back to @admin_required.
+    """
+    admin_view = admin_required(f)
+
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        meta_token = current_app.config.get('META_TOKEN')
+        parts = request.headers.get('Authorization', '').split()
+        if (meta_token and len(parts) == 2 and parts[0].lower() == 'bearer'
+                and hmac.compare_digest(parts[1].encode(), meta_token.encode())):
+            return f(*args, **kwargs)
+        return admin_view(*args, **kwargs)
+    return decorated_function
@@ -0,0 +1,108 @@
+import time
+
+
+def _timed(results, name, step):
+    started = time.perf_counter()
+    try:
+        step()
+        results[name] = round((time.perf_counter() - started) * 1000, 1)
+    except Exception as e:
+        # Warmup is best effort: the first real request retries whatever failed.
+        results[name] = f"error: {e}"
+        print(f"Error during startup step {name}: {e}")
+
+
+def preload(app):
+    """
+    Does the expensive, I/O-free part of startup once, before gunicorn forks
+    workers (with `preload_app`), so every worker inherits it copy-on-write:
+    compiles the URL map and builds a throwaway Supabase client, which pulls
+    in the lazily imported HTTP/2 and async stacks (httpcore, h2, anyio) that
+    would otherwise load on each worker's first request. Pydantic validators
+    are already compiled at import (services/serialization.py). Pooled
+    clients built here are discarded in the children, so no sockets are shared.
+    """
+    from .db import get_pool
+
+    results = {}
+
+    def url_map():
+        with app.test_request_context('/'):
+            pass
+
+    def supabase_client():
+        pool = get_pool(app)
+        pool.release(pool.acquire())
+
+    _timed(results, 'url_map', url_map)
+    _timed(results, 'supabase_client', supabase_client)
+    return results
+
+
+def warm_up(app, notify=None):
+    """
+    Primes a freshly forked worker before it accepts traffic: builds up to
+    `WARMUP_POOL_CLIENTS` pooled clients, opens the upstream connection while
+    loading the active-offers index, fetches the JWKS when tokens are verified
+    against one, and waits for the first stats rollup and (when enabled)
+    inventory index load, which run on their own refresher threads.
+
+    The whole warmup shares a `WARMUP_BUDGET_SECONDS` deadline: steps reached
+    after it are skipped and left to the first real request. `notify` (the
+    gunicorn worker heartbeat) is called before each step. Returns the
+    milliseconds, error or skip of each step.
+    """
+    if not app.config.get('WARMUP_ENABLED', True):
+        return {}
+
+    from ..services.inventory_index import get_inventory_index
+    from ..services.offers import get_active_offers
+    from ..services.stats import get_stats_rollup
+    from .db import get_pool
+    from .security import get_jwks_client
+
+    results = {}
+    started = time.perf_counter()
+    deadline = started + app.config.get('WARMUP_BUDGET_SECONDS', 10)
+
+    def step(name, run):
+        if notify is not None:
+            notify()
+        if time.perf_counter() >= deadline:
+            results[name] = 'skipped'
+            return
+        _timed(results, name, run)
+
+    def pool_clients():
+        pool = get_pool(app)
+        clients = [pool.acquire() for _ in range(min(app.config.get('WARMUP_POOL_CLIENTS', 4), pool.size))]
+        for client in clients:
+            pool.release(client)
+
+    def jwks():
+        client = get_jwks_client()
+        if client is not None:
+            client.get_signing_keys()
+
+    def first_load(refresher):
+        def run():
+            if not refresher.wait(max(deadline - time.perf_counter(), 0)):
+                raise RuntimeError(refresher.last_error or 'not loaded within the warmup budget')
+        return run
+
+    # Start the refresher threads first so their loads overlap the other steps.
+    refreshers = {'stats_rollup': get_stats_rollup(app)}
+    if app.config.get('INVENTORY_INDEX_ENABLED'):
+        refreshers['inventory_index'] = get_inventory_index(app)
+        refreshers['inventory_index'].ensure_started()
+
+    with app.app_context():
+        step('pool_clients', pool_clients)
+        step('active_offers', lambda: get_active_offers().active())
+        step('jwks', jwks)
+        for name, refresher in refreshers.items():
+            step(name, first_load(refresher))
+
+    results['total'] = round((time.perf_counter() - started) * 1000, 1)
+    print(f"Worker warmup: {results}")
+    return results
@@ -4,6 +4,10 @@ def create_app():
     """Create and configure an instance of the Flask application."""
     app = Flask(__name__)
 
+    # Encode JSON responses with orjson
+    from .core.json_provider import OrjsonProvider
+    app.json = OrjsonProvider(app)
+
     # Load configuration from the config object
     from .core.config import Config
     app.config.from_object(Config)
@@ -18,7 +22,10 @@ def create_app():
     from .api import gallery
     from .api import offers as offers_bp
     from .api.admin import offers as admin_offers_bp
+    from .api.admin import users as admin_users_bp
     from .api import tools as tools_bp
+    from .api import stream as stream_bp
+    from .api import prices as prices_bp
 
     app.register_blueprint(meta.bp)
     app.register_blueprint(user.bp)
@@ -29,10 +36,17 @@ def create_app():
     app.register_blueprint(gallery.bp)
     app.register_blueprint(offers_bp.bp)
     app.register_blueprint(admin_offers_bp.bp)
+    app.register_blueprint(admin_users_bp.bp)
     app.register_blueprint(tools_bp.bp)
+    app.register_blueprint(stream_bp.bp)
+    app.register_blueprint(prices_bp.bp)
 
     # Initialize database connection handling
     from .core import db
     db.init_app(app)
 
+    # Record per-route latency and upstream call metrics (see /meta/metrics)
+    from .core import metrics
+    metrics.init_app(app)
+
     return app
@@ -31,7 +31,10 @@ class VehicleSearchResponse(BaseModel):
     """
     data: List[Vehicle]
     facets: Dict[str, Dict[str, int]]
-    total: int
+    # None when the client requested count=none
+    total: Optional[int] = None
+    # Opaque keyset cursor for the next page; None on the last page
+    next_cursor: Optional[str] = None
 
 class VehicleCreate(BaseModel):
     """
@@ -69,8 +72,8 @@ class Bid(BaseModel):
     id: uuid.UUID
     amount: float
     created_at: str # Using str for simplicity, can be datetime
-    user_id: uuid.UUID
-    # To show user's name, we'd need a join in the query
+    # Only set for the caller's own bids, or for staff (see `vehicle_bids`).
+    user_id: Optional[uuid.UUID] = None
     user_full_name: Optional[str] = None
 
     class Config:
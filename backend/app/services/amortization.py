@@ -0,0 +1,88 @@
+import numpy as np
+
+
+def calculate_amortization(principal, annual_rate, term_months):
+    """
+    Calculates the monthly payment for a loan.
+    Returns monthly payment, total interest, and total cost of the loan.
+    """
+    if term_months <= 0:
+        return 0, 0, 0
+
+    if annual_rate == 0:
+        monthly_payment = principal / term_months
+        total_interest = 0
+        total_cost = principal
+        return monthly_payment, total_interest, total_cost
+
+    monthly_rate = (annual_rate / 100) / 12
+
+    # Formula for monthly payment
+    numerator = monthly_rate * ((1 + monthly_rate) ** term_months)
+    denominator = ((1 + monthly_rate) ** term_months) - 1
+    monthly_payment = principal * (numerator / denominator)
+
+    total_cost_of_loan = monthly_payment * term_months
+    total_interest = total_cost_of_loan - principal
+
+    return monthly_payment, total_interest, total_cost_of_loan
+
+
+def calculate_amortization_batch(principal, annual_rate, term_months):
+    """
+    Vectorized form of `calculate_amortization` over NumPy arrays (or anything
+    broadcastable to them). Returns arrays of monthly payment, total interest,
+    and total cost of the loan.
+    """
+    principal = np.asarray(principal, dtype=np.float64)
+    annual_rate = np.asarray(annual_rate, dtype=np.float64)
+    term_months = np.asarray(term_months, dtype=np.float64)
+
+    monthly_rate = (annual_rate / 100) / 12
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        # r / (1 - (1 + r)^-n) is the standard formula rearranged; the zero-rate
+        # and zero-term cases are substituted afterwards.
+        amortized = principal * monthly_rate / -np.expm1(-term_months * np.log1p(monthly_rate))
+        monthly_payment = np.where(monthly_rate == 0, principal / term_months, amortized)
+    monthly_payment = np.where(term_months <= 0, 0.0, monthly_payment)
+
+    total_cost_of_loan = monthly_payment * term_months
+    total_interest = np.where(term_months <= 0, 0.0, total_cost_of_loan - principal)
+    return monthly_payment, total_interest, total_cost_of_loan
+
+
+def max_principal_for_payment(monthly_payment, annual_rate, term_months):
+    """
+    Inverts the amortization formula: the largest loan principal whose monthly
+    payment does not exceed `monthly_payment` at the given rate and term.
+    """
+    if term_months <= 0:
+        return 0
+    if annual_rate == 0:
+        return monthly_payment * term_months
+    monthly_rate = (annual_rate / 100) / 12
+    return monthly_payment * (1 - (1 + monthly_rate) ** -term_months) / monthly_rate
+
+
+def amortization_schedule(principal, annual_rate, term_months):
+    """
+    Yields one dict per month with the payment split into principal and
+    interest and the remaining balance. Rows are generated lazily, so long
+    schedules never have to be held in memory.
+    """
+    monthly_payment, _, _ = calculate_amortization(principal, annual_rate, term_months)
+    monthly_rate = (annual_rate / 100) / 12
+    balance = principal
+    for month in range(1, term_months + 1):
+        interest = balance * monthly_rate
+        # The final payment absorbs any rounding drift so the balance ends at zero.
+        payment = balance + interest if month == term_months else monthly_payment
+        principal_paid = payment - interest
+        balance -= principal_paid
+        yield {
+            "month": month,
+            "payment": round(payment, 2),
+            "principal": round(principal_paid, 2),
+            "interest": round(interest, 2),
+            "balance": round(max(balance, 0), 2),
+        }
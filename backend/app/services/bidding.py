@@ -0,0 +1,182 @@
+import threading
+import weakref
+
+from flask import current_app
+from postgrest.exceptions import APIError
+from ..core.cache import TTLCache
+
+# Error codes raised by the `place_bid` database function. They are custom
+# SQLSTATEs, so a plain RAISE EXCEPTION (P0001) is never mistaken for them.
+BID_TOO_LOW = 'BD001'
+NOT_BIDDABLE = 'BD002'
+
+# Cached high bid for a vehicle that has no bids yet (bid amounts are > 0).
+NO_BIDS = 0.0
+
+
+class BidRejected(Exception):
+    """Raised when a bid does not beat the current high bid by the minimum increment."""
+
+    def __init__(self, message, high_bid=None, minimum=None):
+        super().__init__(message)
+        self.high_bid = high_bid
+        self.minimum = minimum
+
+
+class VehicleNotBiddable(Exception):
+    """Raised when the vehicle does not exist, is hidden or is no longer available."""
+
+
+class BidEngine:
+    """
+    Places bids for this worker process.
+
+    Placements on the same vehicle are serialized by a per-vehicle lock, so a
+    hot vehicle queues its own bidders without holding up any other vehicle.
+    The lock only orders bids within one process; across processes the
+    `place_bid` function re-checks the high bid under a database lock and
+    inserts conditionally, which is what guarantees a single winner.
+
+    The current high bid per vehicle is cached. Bids that cannot beat it are
+    rejected without a database round trip; the cache can only lag behind
+    (another worker accepted a higher bid), in which case the database
+    rejects the bid and the cache is corrected from its answer.
+    """
+
+    def __init__(self, min_increment=100, cache_size=4096, cache_ttl=30):
+        self.min_increment = float(min_increment)
+        self._high_bids = TTLCache(maxsize=cache_size, ttl=cache_ttl)
+        self._locks = weakref.WeakValueDictionary()
+        self._locks_guard = threading.Lock()
+        self._counter_lock = threading.Lock()
+        self.accepted = 0
+        self.rejected = 0
+        self.rejected_from_cache = 0
+
+    def _lock_for(self, vehicle_id):
+        # Locks are dropped once no thread references them, so idle vehicles cost nothing.
+        with self._locks_guard:
+            lock = self._locks.get(vehicle_id)
+            if lock is None:
+                lock = threading.Lock()
+                self._locks[vehicle_id] = lock
+            return lock
+
+    def _count(self, name):
+        with self._counter_lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def minimum_bid(self, high_bid):
+        """Returns the lowest acceptable amount given the current high bid."""
+        # Any positive amount opens the bidding (0.01 is the smallest DECIMAL(10, 2)).
+        return 0.01 if high_bid == NO_BIDS else high_bid + self.min_increment
+
+    def summary(self, high_bid):
+        """Returns the API view of a high bid: the amount (None if no bids) and the next minimum."""
+        return {
+            "high_bid": None if high_bid == NO_BIDS else high_bid,
+            "minimum_bid": self.minimum_bid(high_bid),
+        }
+
+    def high_bid(self, supabase, vehicle_id):
+        """Returns the current high bid for a vehicle, or `NO_BIDS`."""
+        high = self._high_bids.get(vehicle_id)
+        if high is None:
+            rows = recent_bids(supabase, vehicle_id, limit=1)
+            high = float(rows[0]['amount']) if rows else NO_BIDS
+            self._high_bids.set(vehicle_id, high)
+        return high
+
+    def remember_high_bid(self, vehicle_id, amount):
+        """Records a high bid observed elsewhere (e.g. a freshly read bid list)."""
+        self._high_bids.set(vehicle_id, float(amount))
+
+    def forget(self, vehicle_id=None):
+        """Drops the cached high bid for one vehicle, or for every vehicle."""
+        if vehicle_id is None:
+            self._high_bids.clear()
+        else:
+            self._high_bids.pop(vehicle_id)
+
+    def _reject_from_cache(self, vehicle_id, amount):
+        high = self._high_bids.get(vehicle_id)
+        if high is not None and amount < self.minimum_bid(high):
+            self._count('rejected')
+            self._count('rejected_from_cache')
+            raise BidRejected(
+                f"Bid must be at least {self.minimum_bid(high):.2f}",
+                high_bid=high, minimum=self.minimum_bid(high),
+            )
+
+    def place(self, supabase, vehicle_id, amount):
+        """
+        Places a bid of `amount` on `vehicle_id` for the user the Supabase client
+        is authenticated as, and returns the inserted bid row.
+        Raises `BidRejected` or `VehicleNotBiddable`.
+        """
+        amount = round(float(amount), 2)
+        # Losing bids are turned away before queueing for the vehicle lock, and
+        # again once the lock is held, as the previous holder may have raised the high bid.
+        self._reject_from_cache(vehicle_id, amount)
+        with self._lock_for(vehicle_id):
+            self._reject_from_cache(vehicle_id, amount)
+
+            params = {'p_vehicle_id': vehicle_id, 'p_amount': amount}
+            try:
+                response = supabase.rpc('place_bid', params).execute()
+            except APIError as e:
+                if e.code == BID_TOO_LOW:
+                    try:
+                        high = float(e.hint)
+                    except (TypeError, ValueError):
+                        high = None
+                    if high is None:
+                        self._high_bids.pop(vehicle_id)
+                    else:
+                        self._high_bids.set(vehicle_id, high)
+                    self._count('rejected')
+                    raise BidRejected(
+                        e.message or "Bid is too low",
+                        high_bid=high, minimum=None if high is None else self.minimum_bid(high),
+                    )
+                if e.code == NOT_BIDDABLE:
+                    self._high_bids.pop(vehicle_id)
+                    raise VehicleNotBiddable(e.message or "Vehicle is not open for bidding")
+                raise
+
+            bid = response.data[0] if isinstance(response.data, list) else response.data
+            self._high_bids.set(vehicle_id, float(bid['amount']))
+            self._count('accepted')
+            return bid
+
+    def stats(self):
+        """Returns placement counters and high-bid cache statistics."""
+        return {
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+            "rejected_from_cache": self.rejected_from_cache,
+            "high_bids": self._high_bids.stats(),
+        }
+
+
+def recent_bids(supabase, vehicle_id, limit=50):
+    """
+    Returns a vehicle's bids, highest first, shaped like the `Bid` model. Bids
+    are read through the `vehicle_bids` RPC, which only fills in `user_id` and
+    `user_full_name` for the caller's own bids, or for staff.
+    """
+    response = supabase.rpc('vehicle_bids', {'p_vehicle_id': vehicle_id, 'p_limit': limit}).execute()
+    return response.data or []
+
+
+def get_bid_engine() -> BidEngine:
+    """Returns this worker's bid engine, created on first use from the app config."""
+    engine = current_app.extensions.get('bid_engine')
+    if engine is None:
+        engine = BidEngine(
+            min_increment=current_app.config.get('BID_MIN_INCREMENT', 100),
+            cache_size=current_app.config.get('BID_CACHE_SIZE', 4096),
+            cache_ttl=current_app.config.get('BID_CACHE_TTL', 30),
+        )
+        current_app.extensions['bid_engine'] = engine
+    return engine
@@ -0,0 +1,77 @@
+from flask import current_app, g
+from ..core.cache import TTLCache
+from ..core.db import rls_scope
+from ..core.security import get_role_cache
+from .filters import filter_signature
+
+# Facet name in the API response -> filter key in `parse_vehicle_filters`.
+FACETS = {
+    'make': 'make',
+    'bodyType': 'body_type',
+    'fuelType': 'fuel_type',
+}
+
+
+def get_facet_cache() -> TTLCache:
+    """Returns the per-process cache of facet counts, keyed by filter signature."""
+    cache = current_app.extensions.get('facet_cache')
+    if cache is None:
+        cache = TTLCache(
+            maxsize=current_app.config.get('FACET_CACHE_SIZE', 2048),
+            ttl=current_app.config.get('FACET_CACHE_TTL', 60),
+        )
+        current_app.extensions['facet_cache'] = cache
+    return cache
+
+
+def _visibility_class():
+    """
+    Which vehicles the request sees under RLS: 'public' (visible vehicles only)
+    for anon queries and customers, 'staff' for staff and admins, who see all
+    of them. Facet counts depend only on this, so the cache holds one entry per
+    class rather than one per token. A caller whose role is not known yet is
+    keyed by their own RLS scope.
+    """
+    scope = rls_scope()
+    if scope == 'anon':
+        return 'public'
+    profile = g.get('profile') or get_role_cache().get(str(g.user.id))
+    if profile is None:
+        return scope
+    return 'staff' if profile.get('role') in ('staff', 'admin') else 'public'
+
+
+def compute_facets(supabase, filters):
+    """
+    Returns disjunctive facet counts for the given filters: each facet is counted
+    with every filter applied except its own. Counts come from the grouped
+    `vehicle_facet_counts` function, so no vehicle rows are transferred.
+    """
+    params = {
+        'p_makes': filters.get('make'),
+        'p_year_min': filters.get('year_min'),
+        'p_price_max': filters.get('price_max'),
+        'p_body_types': filters.get('body_type'),
+        'p_fuel_types': filters.get('fuel_type'),
+        'p_vehicle_ids': filters.get('ids'),
+    }
+    response = supabase.rpc('vehicle_facet_counts', params).execute()
+
+    facets = {name: {} for name in FACETS}
+    for row in response.data or []:
+        facets[row['facet']][row['value']] = row['count']
+    return facets
+
+
+def get_facets(supabase, filters):
+    """
+    Returns facet counts for `filters`, served from cache when the same filter
+    signature was computed recently for the same visibility class.
+    """
+    cache = get_facet_cache()
+    key = (_visibility_class(), filter_signature(filters))
+    facets = cache.get(key)
+    if facets is None:
+        facets = compute_facets(supabase, filters)
+        cache.set(key, facets)
+    return facets
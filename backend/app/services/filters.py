@@ -0,0 +1,61 @@
+def _split(value):
+    return [item for item in value.split(',') if item]
+
+
+def parse_vehicle_filters(args):
+    """
+    Normalises inventory search query parameters into a filter dict.
+    Multi-valued filters are comma-separated and stored as sorted lists so that
+    equivalent queries share one cache signature.
+    """
+    filters = {}
+    if args.get('make'):
+        filters['make'] = sorted(_split(args.get('make')))
+    if 'year_min' in args:
+        filters['year_min'] = args.get('year_min', type=int)
+    if 'price_max' in args:
+        filters['price_max'] = args.get('price_max', type=int)
+    if args.get('bodyType'):
+        filters['body_type'] = sorted(_split(args.get('bodyType')))
+    if args.get('fuelType'):
+        filters['fuel_type'] = sorted(_split(args.get('fuelType')))
+    if args.get('q', '').strip():
+        filters['q'] = normalize_query(args.get('q'))
+    return {key: value for key, value in filters.items() if value is not None}
+
+
+def normalize_query(q):
+    """Lower-cases and collapses whitespace so equivalent searches share a cache key."""
+    return ' '.join(q.lower().split())
+
+
+def filter_signature(filters):
+    """
+    Returns a hashable, order-independent key for a filter dict. Resolved text
+    search ids are skipped, as they are fully determined by 'q'.
+    """
+    return tuple(sorted(
+        (key, tuple(value) if isinstance(value, list) else value)
+        for key, value in filters.items()
+        if key != 'ids'
+    ))
+
+
+def apply_vehicle_filters(query, filters):
+    """
+    Applies a filter dict from `parse_vehicle_filters` to a PostgREST query.
+    A text search 'q' must first be resolved into matching 'ids'.
+    """
+    if 'ids' in filters:
+        query = query.in_('id', filters['ids'])
+    if 'make' in filters:
+        query = query.in_('make', filters['make'])
+    if 'year_min' in filters:
+        query = query.gte('year', filters['year_min'])
+    if 'price_max' in filters:
+        query = query.lte('price_current', filters['price_max'])
+    if 'body_type' in filters:
+        query = query.in_('body_type', filters['body_type'])
+    if 'fuel_type' in filters:
+        query = query.in_('fuel_type', filters['fuel_type'])
+    return query
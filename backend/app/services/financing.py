@@ -0,0 +1,52 @@
+import math
+
+import numpy as np
+from flask import current_app
+
+from .amortization import calculate_amortization_batch, max_principal_for_payment
+
+FINANCE_PARAMS = ('payment_max', 'down_payment', 'term', 'apr')
+
+
+def parse_finance_terms(args):
+    """
+    Reads the affordability parameters of an inventory search. Returns None
+    when none were given; missing terms fall back to the configured defaults.
+    Raises ValueError for invalid values.
+    """
+    if not any(param in args for param in FINANCE_PARAMS):
+        return None
+    try:
+        payment_max = float(args['payment_max']) if 'payment_max' in args else None
+        down_payment = float(args.get('down_payment', 0))
+        term = int(args.get('term', current_app.config.get('FINANCE_DEFAULT_TERM_MONTHS', 60)))
+        apr = float(args.get('apr', current_app.config.get('FINANCE_DEFAULT_APR', 6.9)))
+    except ValueError:
+        raise ValueError("payment_max, down_payment, term and apr must be numbers")
+    values = [down_payment, term, apr] + ([payment_max] if payment_max is not None else [])
+    if any(v < 0 or not math.isfinite(v) for v in values):
+        raise ValueError("Negative values are not allowed for financial calculations.")
+    if term == 0:
+        raise ValueError("term must be at least one month")
+    return {'payment_max': payment_max, 'down_payment': down_payment, 'term': term, 'apr': apr}
+
+
+def affordable_price(finance):
+    """The highest vehicle price whose monthly payment fits within payment_max."""
+    principal = max_principal_for_payment(finance['payment_max'], finance['apr'], finance['term'])
+    # Truncate to cents so rounding never admits a vehicle just over budget.
+    return math.floor((principal + finance['down_payment']) * 100) / 100
+
+
+def attach_monthly_payments(results, rows, finance):
+    """
+    Adds an estimated `monthly_payment` to each result dict, computed for the
+    whole page in one vectorized pass from the corresponding row's price.
+    """
+    if not rows:
+        return
+    prices = np.array([row.get('price_current') or 0 for row in rows], dtype=np.float64)
+    principal = np.maximum(prices - finance['down_payment'], 0)
+    payments, _, _ = calculate_amortization_batch(principal, finance['apr'], finance['term'])
+    for result, payment in zip(results, np.round(payments, 2).tolist()):
+        result['monthly_payment'] = payment
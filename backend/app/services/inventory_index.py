@@ -0,0 +1,234 @@
+import bisect
+import time
+from datetime import datetime
+
+import numpy as np
+from flask import current_app
+
+from ..core.db import get_pool, rls_scope
+from ..core.refresher import BackgroundRefresher
+from .facets import FACETS
+from .pagination import SORT_ORDERS, decode_cursor
+
+# Dictionary-encoded columns, keyed by the filter names from `parse_vehicle_filters`.
+CATEGORICAL_COLUMNS = ('make', 'body_type', 'fuel_type')
+LOAD_BATCH_SIZE = 1000
+
+
+def _timestamp(value):
+    if value is None:
+        return np.nan
+    return datetime.fromisoformat(value).timestamp()
+
+
+class InventorySnapshot:
+    """
+    An immutable, columnar copy of the public vehicles table.
+
+    Rows are stored in id order, so a row's position doubles as its rank for
+    the id tie-breaker used by keyset pagination. Numeric columns are NumPy
+    arrays (NULL -> NaN); categorical columns are dictionary-encoded with one
+    boolean bitmap per distinct value.
+    """
+
+    def __init__(self, rows):
+        self.rows = sorted(rows, key=lambda r: str(r['id']))
+        self.ids = [str(r['id']) for r in self.rows]
+        self.positions = {row_id: i for i, row_id in enumerate(self.ids)}
+        self.loaded_at = time.time()
+
+        def numeric(column, convert=float):
+            return np.array(
+                [np.nan if r.get(column) is None else convert(r[column]) for r in self.rows],
+                dtype=np.float64,
+            )
+
+        self.columns = {
+            'year': numeric('year'),
+            'price_current': numeric('price_current'),
+            'mileage': numeric('mileage'),
+            'created_at': numeric('created_at', _timestamp),
+        }
+        self.is_featured = np.array([bool(r.get('is_featured')) for r in self.rows], dtype=bool)
+
+        # column -> (distinct values, per-row codes, value -> bitmap)
+        self.dictionaries = {}
+        for column in CATEGORICAL_COLUMNS:
+            values = sorted({r.get(column) for r in self.rows if r.get(column) is not None})
+            lookup = {value: code for code, value in enumerate(values)}
+            codes = np.array([lookup.get(r.get(column), -1) for r in self.rows], dtype=np.int32)
+            bitmaps = {value: codes == code for value, code in lookup.items()}
+            self.dictionaries[column] = (values, codes, bitmaps)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def _categorical_mask(self, column, wanted):
+        _, _, bitmaps = self.dictionaries[column]
+        mask = np.zeros(len(self.rows), dtype=bool)
+        for value in wanted:
+            bitmap = bitmaps.get(value)
+            if bitmap is not None:
+                mask |= bitmap
+        return mask
+
+    def filter_mask(self, filters, exclude=None):
+        """
+        Returns a boolean mask of rows matching `filters`, optionally ignoring
+        the filter named `exclude` (used for disjunctive facet counts).
+        """
+        mask = np.ones(len(self.rows), dtype=bool)
+        if 'ids' in filters:
+            mask[:] = False
+            positions = [self.positions[i] for i in map(str, filters['ids']) if i in self.positions]
+            mask[positions] = True
+        for column in CATEGORICAL_COLUMNS:
+            if column in filters and column != exclude:
+                mask &= self._categorical_mask(column, filters[column])
+        # NaN comparisons are False, matching SQL's treatment of NULL.
+        if 'year_min' in filters:
+            mask &= self.columns['year'] >= filters['year_min']
+        if 'price_max' in filters:
+            mask &= self.columns['price_current'] <= filters['price_max']
+        return mask
+
+    def facets(self, filters):
+        """Returns disjunctive facet counts, mirroring `vehicle_facet_counts`."""
+        result = {}
+        for name, column in FACETS.items():
+            values, codes, _ = self.dictionaries[column]
+            selected = codes[self.filter_mask(filters, exclude=column)]
+            counts = np.bincount(selected[selected >= 0], minlength=len(values))
+            result[name] = {values[i]: int(n) for i, n in enumerate(counts) if n}
+        return result
+
+    def _sort_keys(self, sort_by):
+        # Keys are expressed so that an ascending sort yields the requested order,
+        # with NULLs last ascending and first descending as in Postgres.
+        column, desc = SORT_ORDERS[sort_by]
+        values = self.columns[column]
+        if desc:
+            return np.where(np.isnan(values), -np.inf, -values), desc
+        return np.where(np.isnan(values), np.inf, values), desc
+
+    def search(self, filters, sort_by, limit, cursor=None):
+        """
+        Filters, sorts and pages the snapshot. Returns (rows, total, has_more).
+        Cursors are interchangeable with the PostgREST path's cursors.
+        """
+        column, _ = SORT_ORDERS[sort_by]
+        mask = self.filter_mask(filters)
+        total = int(mask.sum())
+
+        keys, desc = self._sort_keys(sort_by)
+        rank = np.arange(len(self.rows))
+        if desc:
+            rank = -rank
+
+        if cursor:
+            value, row_id = decode_cursor(sort_by, cursor)
+            if value is None:
+                cursor_key = -np.inf if desc else np.inf
+            else:
+                raw = _timestamp(value) if column == 'created_at' else float(value)
+                cursor_key = -raw if desc else raw
+            if desc:
+                cursor_rank = -bisect.bisect_left(self.ids, row_id)
+                after_id = rank > cursor_rank
+            else:
+                after_id = rank >= bisect.bisect_right(self.ids, row_id)
+            mask &= (keys > cursor_key) | ((keys == cursor_key) & after_id)
+
+        candidates = np.flatnonzero(mask)
+        if len(candidates) > limit + 1:
+            # Only the first page is needed: keep every row whose key is within
+            # the (limit + 1) smallest, ties included, before the full sort.
+            threshold = np.partition(keys[candidates], limit)[limit]
+            candidates = candidates[keys[candidates] <= threshold]
+        order = np.lexsort((rank[candidates], keys[candidates]))
+        page = candidates[order[:limit + 1]]
+        rows = [self.rows[i] for i in page[:limit]]
+        return rows, total, len(page) > limit
+
+    def matching_rows(self, filters):
+        """Returns every row matching `filters`, in id order."""
+        return [self.rows[i] for i in np.flatnonzero(self.filter_mask(filters))]
+
+    def featured(self, limit):
+        return [self.rows[i] for i in np.flatnonzero(self.is_featured)[:limit]]
+
+    def get(self, vehicle_id):
+        position = self.positions.get(str(vehicle_id))
+        return None if position is None else self.rows[position]
+
+
+class InventoryIndex(BackgroundRefresher):
+    """
+    Holds the current `InventorySnapshot`, which a background thread reloads
+    every `refresh_interval` seconds (see core/refresher.py). The snapshot is
+    loaded with the anon key, so it only holds what RLS shows anonymous
+    visitors and must only serve them.
+    """
+
+    name = 'inventory-index'
+
+    def __init__(self, app, refresh_interval=60, failure_backoff=30):
+        super().__init__(app, refresh_interval, failure_backoff)
+        self.snapshot = None
+
+    def load(self):
+        """Reads the whole vehicles table in id-ordered batches and swaps in a new snapshot."""
+        pool = get_pool(self.app)
+        client = pool.acquire()
+        try:
+            rows, last_id = [], None
+            while True:
+                query = client.table('vehicles').select('*').order('id')
+                if last_id is not None:
+                    query = query.gt('id', last_id)
+                batch = query.limit(LOAD_BATCH_SIZE).execute().data
+                rows.extend(batch)
+                if len(batch) < LOAD_BATCH_SIZE:
+                    break
+                last_id = batch[-1]['id']
+        finally:
+            pool.release(client)
+        self.snapshot = InventorySnapshot(rows)
+        return self.snapshot
+
+    def stats(self):
+        snapshot = self.snapshot
+        return {
+            **super().stats(),
+            "rows": len(snapshot) if snapshot else 0,
+            "loaded_at": snapshot.loaded_at if snapshot else None,
+        }
+
+
+def get_inventory_index(app=None) -> InventoryIndex:
+    """Returns the application's inventory index, creating it on first use."""
+    app = app or current_app._get_current_object()
+    index = app.extensions.get('inventory_index')
+    if index is None:
+        index = app.extensions.setdefault('inventory_index', InventoryIndex(
+            app,
+            refresh_interval=app.config.get('INVENTORY_INDEX_REFRESH_SECONDS', 60),
+            failure_backoff=app.config.get('REFRESH_RETRY_SECONDS', 30),
+        ))
+    return index
+
+
+def get_inventory_snapshot():
+    """
+    Returns the in-memory inventory snapshot when the index is enabled, loaded,
+    and the current request sees the anonymous RLS view. Otherwise returns None
+    and callers query PostgREST. That includes the time before the first load
+    completes and while a failed load backs off.
+    """
+    if not current_app.config.get('INVENTORY_INDEX_ENABLED'):
+        return None
+    if rls_scope() != 'anon':
+        return None
+    index = get_inventory_index()
+    index.ensure_started()
+    return index.snapshot
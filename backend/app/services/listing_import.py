@@ -0,0 +1,226 @@
+import codecs
+import csv
+import io
+import json
+from typing import get_args, get_origin
+
+from pydantic import ValidationError
+from ..models.schemas import VehicleCreate
+
+# Upload formats accepted by the bulk import, by request mimetype.
+IMPORT_FORMATS = {
+    'application/json': 'json',
+    'application/x-ndjson': 'ndjson',
+    'application/jsonl': 'ndjson',
+    'text/csv': 'csv',
+}
+READ_SIZE = 64 * 1024
+# Largest single JSON array element accepted (characters).
+MAX_RECORD_CHARS = 1024 * 1024
+
+
+
+def _is_structured(annotation):
+    if get_origin(annotation) in (list, dict):
+        return True
+    return any(_is_structured(arg) for arg in get_args(annotation))
+
+
+# VehicleCreate fields that hold lists or objects; CSV cells carry them as JSON.
+_JSON_FIELDS = {name for name, field in VehicleCreate.model_fields.items() if _is_structured(field.annotation)}
+
+
+class MalformedUpload(ValueError):
+    """Raised when the upload body cannot be parsed any further."""
+
+
+def iter_json_array(stream, read_size=READ_SIZE):
+    """
+    Yields the elements of a top-level JSON array read incrementally from a
+    binary stream, so only the element being decoded is held in memory.
+    """
+    decoder = json.JSONDecoder()
+    text = codecs.getincrementaldecoder('utf-8')()
+    buf, pos, eof = '', 0, False
+
+    def fill():
+        nonlocal buf, pos, eof
+        if len(buf) - pos > MAX_RECORD_CHARS:
+            raise MalformedUpload("JSON array element is too large or malformed")
+        data = stream.read(read_size)
+        eof = not data
+        buf, pos = buf[pos:] + text.decode(data, final=eof), 0
+
+    def peek():
+        # Next non-whitespace character, reading more as needed; '' at the end.
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos].isspace():
+                pos += 1
+            if pos < len(buf) or eof:
+                return buf[pos] if pos < len(buf) else ''
+            fill()
+
+    if peek() != '[':
+        raise MalformedUpload("Expected a JSON array")
+    pos += 1
+    if peek() == ']':
+        return
+    while True:
+        peek()
+        while True:
+            try:
+                value, end = decoder.raw_decode(buf, pos)
+                # A value ending exactly at the buffer edge (e.g. a number) may continue.
+                if end < len(buf) or eof:
+                    break
+            except json.JSONDecodeError as e:
+                if eof:
+                    raise MalformedUpload(f"Invalid JSON: {e.msg}")
+            fill()
+        yield value
+        pos = end
+        separator = peek()
+        if separator == ']':
+            return
+        if separator != ',':
+            raise MalformedUpload("Expected ',' or ']' in JSON array")
+        pos += 1
+
+
+def iter_ndjson(stream):
+    """Yields one parsed object per non-blank line of an NDJSON stream."""
+    for number, line in enumerate(io.TextIOWrapper(stream, encoding='utf-8'), start=1):
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            yield MalformedUpload(f"Line {number}: invalid JSON: {e.msg}")
+
+
+def iter_csv(stream):
+    """
+    Yields one dict per CSV row, keyed by the header row. Empty cells are left
+    out so optional fields fall back to their defaults; list and object fields
+    are read as JSON.
+    """
+    for row in csv.DictReader(io.TextIOWrapper(stream, encoding='utf-8', newline='')):
+        record = {}
+        for key, value in row.items():
+            if key is None or value is None or value == '':
+                continue
+            if key in _JSON_FIELDS:
+                try:
+                    value = json.loads(value)
+                except json.JSONDecodeError:
+                    pass  # left as text; validation reports the field
+            record[key] = value
+        yield record
+
+
+def iter_records(stream, upload_format):
+    """Returns the record iterator for an upload format from `IMPORT_FORMATS`."""
+    if upload_format == 'json':
+        return iter_json_array(stream)
+    if upload_format == 'ndjson':
+        return iter_ndjson(stream)
+    return iter_csv(stream)
+
+
+def _upsert(supabase, rows):
+    return (
+        supabase.table('vehicles')
+        .upsert(rows, on_conflict='vin', ignore_duplicates=True)
+        .execute()
+        .data or []
+    )
+
+
+def _row_results(chunk, inserted):
+    created = {row['vin']: row['id'] for row in inserted}
+    for row_number, data in chunk:
+        if data['vin'] in created:
+            yield {"row": row_number, "vin": data['vin'], "status": "created", "id": created[data['vin']]}
+        else:
+            yield {"row": row_number, "vin": data['vin'], "status": "duplicate",
+                   "error": "A vehicle with this VIN already exists"}
+
+
+def _insert_chunk(supabase, chunk):
+    """
+    Inserts validated rows in one request. Rows whose VIN already exists are
+    skipped by ON CONFLICT DO NOTHING and are missing from the returned rows.
+    If the chunk fails (e.g. another unique column clashes), its rows are
+    retried one by one so only the offending rows are reported as errors.
+    Yields a result per row.
+    """
+    try:
+        inserted = _upsert(supabase, [data for _, data in chunk])
+    except Exception:
+        for row_number, data in chunk:
+            try:
+                yield from _row_results([(row_number, data)], _upsert(supabase, [data]))
+            except Exception as e:
+                yield {"row": row_number, "vin": data['vin'], "status": "error", "error": str(e)}
+        return
+    yield from _row_results(chunk, inserted)
+
+
+def import_listings(supabase, records, chunk_size=500):
+    """
+    Validates and inserts listing records as they are read, yielding one result
+    per input row: 'created', 'duplicate', 'invalid' or 'error'. Results carry
+    their row number; rejected rows are reported at once, valid rows once their
+    chunk of `chunk_size` is inserted. A VIN repeated within a chunk is
+    reported as a duplicate without a database round trip; one repeated in a
+    later chunk is skipped by the database and reported the same way. Only
+    the current chunk is held in memory.
+    """
+    chunk_vins = set()
+    chunk = []
+    row_number = 0
+    records = iter(records)
+
+    while True:
+        try:
+            record = next(records)
+        except StopIteration:
+            break
+        except (MalformedUpload, UnicodeDecodeError, csv.Error) as e:
+            # The body cannot be read past this point; report it and stop.
+            yield from _insert_chunk(supabase, chunk) if chunk else ()
+            yield {"row": row_number + 1, "status": "invalid", "error": str(e)}
+            return
+
+        row_number += 1
+        if isinstance(record, MalformedUpload):
+            yield {"row": row_number, "status": "invalid", "error": str(record)}
+            continue
+        if not isinstance(record, dict):
+            yield {"row": row_number, "status": "invalid", "error": "Expected a JSON object"}
+            continue
+
+        try:
+            listing = VehicleCreate.model_validate(record)
+        except ValidationError as e:
+            yield {"row": row_number, "vin": record.get('vin'), "status": "invalid",
+                   "errors": e.errors(include_url=False, include_context=False)}
+            continue
+
+        vin = listing.vin.strip()
+        if vin in chunk_vins:
+            yield {"row": row_number, "vin": vin, "status": "duplicate",
+                   "error": "VIN appears earlier in this upload"}
+            continue
+        chunk_vins.add(vin)
+
+        data = listing.model_dump()
+        data['vin'] = vin
+        chunk.append((row_number, data))
+        if len(chunk) >= chunk_size:
+            yield from _insert_chunk(supabase, chunk)
+            chunk, chunk_vins = [], set()
+
+    if chunk:
+        yield from _insert_chunk(supabase, chunk)
@@ -0,0 +1,149 @@
+import threading
+import time
+from datetime import datetime, timezone
+
+from flask import current_app
+from ..core.db import get_pool
+
+
+def _parse_timestamp(value):
+    return datetime.fromisoformat(value.replace('Z', '+00:00')) if value else None
+
+
+class ActiveOffers:
+    """
+    An in-memory index of the offers anonymous visitors can see, keyed by
+    their validity windows.
+
+    The active set only changes when an offer's `start_date` or `end_date`
+    passes, or when staff edit offers. The index therefore stays valid until
+    the next of those boundaries (the earliest end of a loaded offer, or the
+    next scheduled start reported by `next_offer_start`) and reloads lazily
+    on the first read after it. Admin writes call `invalidate()`; `max_age`
+    bounds staleness from edits made elsewhere (other workers, the dashboard).
+
+    A failed reload keeps serving the previous index and is retried after
+    `failure_backoff` seconds, so a failing database sees one query per
+    backoff rather than one per request.
+    """
+
+    def __init__(self, app, max_age=300, failure_backoff=30, clock=time.time):
+        self.app = app
+        self.max_age = max_age
+        self.failure_backoff = failure_backoff
+        self._clock = clock
+        # (offers sorted by end_date as the endpoint returns them, parallel
+        # (start, end) epoch-second windows), swapped as one tuple
+        self._index = ([], [])
+        self._expires_at = 0.0
+        self._loaded = False
+        self._lock = threading.Lock()
+        # Bumped by invalidate(). A load that overlaps a write read the table
+        # before it, so it must not push the expiry back into the future.
+        self._generation = 0
+        self._generation_lock = threading.Lock()
+        self.loads = 0
+        self.hits = 0
+        self.failures = 0
+        self.last_error = None
+
+    def load(self):
+        """Reads the active offers and the next scheduled start, and rebuilds the index."""
+        generation = self._generation
+        pool = get_pool(self.app)
+        client = pool.acquire()
+        try:
+            offers = client.table('offers').select('*').order('end_date', desc=False).execute().data or []
+            next_start = _parse_timestamp(client.rpc('next_offer_start', {}).execute().data)
+        finally:
+            pool.release(client)
+
+        now = self._clock()
+        windows = [
+            (_parse_timestamp(o['start_date']).timestamp(), _parse_timestamp(o['end_date']).timestamp())
+            for o in offers
+        ]
+        # Instants at which the visible set changes: a loaded offer ends or a new one starts.
+        boundaries = [end for _, end in windows]
+        if next_start is not None:
+            boundaries.append(next_start.timestamp())
+        upcoming = min((b for b in boundaries if b > now), default=float('inf'))
+
+        with self._generation_lock:
+            self._index = (offers, windows)
+            if self._generation == generation:
+                self._expires_at = min(upcoming, now + self.max_age)
+        self._loaded = True
+        self.last_error = None
+        self.loads += 1
+
+    def _reload(self):
+        generation = self._generation
+        try:
+            self.load()
+        except Exception as e:
+            self.last_error = str(e)
+            self.failures += 1
+            with self._generation_lock:
+                if self._generation == generation:
+                    self._expires_at = self._clock() + self.failure_backoff
+            print(f"Error loading active offers: {e}")
+
+    def invalidate(self):
+        """Forces a reload on the next read (call after any offer write)."""
+        with self._generation_lock:
+            self._generation += 1
+            self._expires_at = 0.0
+
+    def active(self):
+        """
+        Returns the offers active right now, reloading first if a boundary has
+        passed. Raises if no index could be loaded yet.
+        """
+        now = self._clock()
+        if now >= self._expires_at:
+            with self._lock:
+                # Only one thread reloads; the others then see the fresh index.
+                if self._clock() >= self._expires_at:
+                    self._reload()
+        else:
+            self.hits += 1
+        if not self._loaded:
+            raise RuntimeError(f"Active offers are not available: {self.last_error}")
+        now = self._clock()
+        offers, windows = self._index
+        return [o for o, (start, end) in zip(offers, windows) if start <= now <= end]
+
+    def seconds_until_expiry(self):
+        """Seconds the current index stays valid (0 if it is due for a reload)."""
+        return max(self._expires_at - self._clock(), 0.0)
+
+    def stats(self):
+        expires_at = self._expires_at
+        return {
+            "offers": len(self._index[0]),
+            "loads": self.loads,
+            "hits": self.hits,
+            "failures": self.failures,
+            "last_error": self.last_error,
+            "expires_at": datetime.fromtimestamp(expires_at, timezone.utc).isoformat()
+            if 0 < expires_at < float('inf') else None,
+        }
+
+
+def get_active_offers() -> ActiveOffers:
+    """Returns this worker's active-offers index."""
+    index = current_app.extensions.get('active_offers')
+    if index is None:
+        index = ActiveOffers(
+            current_app._get_current_object(),
+            max_age=current_app.config.get('OFFERS_CACHE_MAX_AGE', 300),
+            failure_backoff=current_app.config.get('REFRESH_RETRY_SECONDS', 30),
+        )
+        current_app.extensions['active_offers'] = index
+    return index
+
+
+def invalidate_offers():
+    """Drops this worker's cached active offers after an admin write."""
+    get_active_offers().invalidate()
@@ -0,0 +1,98 @@
+import base64
+import json
+
+# Supported sort orders for keyset pagination: name -> (column, descending).
+# Every order is made total by using the row id as a tie-breaker.
+SORT_ORDERS = {
+    'created_at_desc': ('created_at', True),
+    'created_at_asc': ('created_at', False),
+    'price_asc': ('price_current', False),
+    'price_desc': ('price_current', True),
+    'year_asc': ('year', False),
+    'year_desc': ('year', True),
+    'mileage_asc': ('mileage', False),
+    'mileage_desc': ('mileage', True),
+}
+
+COUNT_STRATEGIES = ('exact', 'planned', 'estimated', 'none')
+
+# Text search results can also be ordered by relevance. The ranked result set is
+# bounded, so its cursor is simply the offset of the next row.
+RELEVANCE = 'relevance'
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor cannot be decoded or does not match the sort."""
+
+
+def _encode(sort_by, value, row_id):
+    payload = json.dumps([sort_by, value, row_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def encode_cursor(sort_by, row):
+    """
+    Builds an opaque cursor pointing just past `row` in the given sort order.
+    """
+    column, _ = SORT_ORDERS[sort_by]
+    return _encode(sort_by, row.get(column), str(row['id']))
+
+
+def encode_offset_cursor(offset, row):
+    """Builds a relevance-order cursor resuming at `offset`."""
+    return _encode(RELEVANCE, offset, str(row['id']))
+
+
+def decode_cursor(sort_by, cursor):
+    """
+    Decodes a cursor produced by `encode_cursor`, returning (sort value, id).
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        cursor_sort, value, row_id = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor("Malformed pagination cursor") from e
+    if cursor_sort != sort_by:
+        raise InvalidCursor("Cursor was issued for a different sort order")
+    return value, row_id
+
+
+def _quote(value):
+    # Double-quote values inside PostgREST logic trees so timestamps and
+    # other values containing reserved characters (',', '.', ':') survive.
+    return '"' + str(value).replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+def keyset_filter(sort_by, value, row_id):
+    """
+    Returns a PostgREST `or` expression selecting rows strictly after
+    (value, row_id) in the given sort order.
+
+    Postgres sorts NULLs last ascending and first descending, which the
+    expression mirrors so nullable sort keys paginate without gaps.
+    """
+    column, desc = SORT_ORDERS[sort_by]
+    op = 'lt' if desc else 'gt'
+    tie = f"id.{op}.{_quote(row_id)}"
+
+    if value is None:
+        if desc:
+            # NULLs come first: everything non-null follows, then later NULL ids.
+            return f"{column}.not.is.null,and({column}.is.null,{tie})"
+        return f"and({column}.is.null,{tie})"
+
+    clauses = [f"{column}.{op}.{_quote(value)}", f"and({column}.eq.{_quote(value)},{tie})"]
+    if not desc:
+        clauses.append(f"{column}.is.null")
+    return ",".join(clauses)
+
+
+def apply_keyset(query, sort_by, cursor=None):
+    """
+    Orders `query` by the sort key and id, and restricts it to rows after `cursor`.
+    """
+    column, desc = SORT_ORDERS[sort_by]
+    if cursor:
+        value, row_id = decode_cursor(sort_by, cursor)
+        query = query.or_(keyset_filter(sort_by, value, row_id))
+    return query.order(column, desc=desc).order('id', desc=desc)
@@ -0,0 +1,174 @@
+from datetime import datetime, timezone
+
+import numpy as np
+from flask import current_app
+from ..core.cache import TTLCache
+from ..core.db import rls_scope
+
+BUCKETS = ('raw', 'day', 'week', 'month')
+DAY = 86400
+FETCH_BATCH_SIZE = 1000
+
+
+class SeriesTooLarge(ValueError):
+    """Raised when a query matches more price records than `PRICE_SERIES_MAX_ROWS`."""
+
+
+def get_series_cache() -> TTLCache:
+    """Returns the per-process cache of computed price series."""
+    cache = current_app.extensions.get('price_series_cache')
+    if cache is None:
+        cache = TTLCache(
+            maxsize=current_app.config.get('PRICE_SERIES_CACHE_SIZE', 1024),
+            ttl=current_app.config.get('PRICE_SERIES_CACHE_TTL', 300),
+        )
+        current_app.extensions['price_series_cache'] = cache
+    return cache
+
+
+def _epoch_seconds(value):
+    return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+
+
+def _iso(seconds):
+    return datetime.fromtimestamp(seconds, timezone.utc).isoformat()
+
+
+def fetch_price_points(supabase, vehicle_id=None, make=None, model=None, since=None, until=None):
+    """
+    Reads (epoch seconds, price) arrays for one vehicle or a make/model cohort,
+    oldest first. Records are joined to `vehicles` so RLS hides the history of
+    vehicles the caller cannot see.
+    """
+    max_rows = current_app.config.get('PRICE_SERIES_MAX_ROWS', 100000)
+    times, prices = [], []
+    offset = 0
+    while True:
+        query = supabase.table('price_history').select('price,recorded_at,vehicles!inner(id)')
+        if vehicle_id is not None:
+            query = query.eq('vehicle_id', vehicle_id)
+        if make is not None:
+            query = query.eq('vehicles.make', make)
+        if model is not None:
+            query = query.eq('vehicles.model', model)
+        if since is not None:
+            query = query.gte('recorded_at', since)
+        if until is not None:
+            query = query.lt('recorded_at', until)
+        batch = (
+            query.order('recorded_at').order('id')
+            .range(offset, offset + FETCH_BATCH_SIZE - 1)
+            .execute()
+        ).data or []
+        for row in batch:
+            times.append(_epoch_seconds(row['recorded_at']))
+            prices.append(float(row['price']))
+        if len(times) > max_rows:
+            raise SeriesTooLarge(f"More than {max_rows} price records match; narrow the date range")
+        if len(batch) < FETCH_BATCH_SIZE:
+            break
+        offset += FETCH_BATCH_SIZE
+    return np.asarray(times, dtype=np.float64), np.asarray(prices, dtype=np.float64)
+
+
+def bucket_starts(times, bucket):
+    """Truncates epoch seconds (UTC) to the start of their day, ISO week (Monday) or month."""
+    days = np.floor(times / DAY).astype(np.int64)
+    if bucket == 'day':
+        return days * DAY
+    if bucket == 'week':
+        # 1970-01-01 was a Thursday, so (days + 3) % 7 is the weekday with Monday = 0.
+        return (days - (days + 3) % 7) * DAY
+    if bucket == 'month':
+        months = times.astype('datetime64[s]').astype('datetime64[M]')
+        return months.astype('datetime64[s]').astype(np.int64)
+    raise ValueError(f"Unknown bucket: {bucket}")
+
+
+def aggregate(times, prices, bucket):
+    """
+    Groups time-ordered points into buckets and returns a dict of parallel
+    arrays: bucket start `t`, `min`, `max`, `last` (final price in the bucket),
+    `mean` and `count`.
+    """
+    keys = bucket_starts(times, bucket)
+    starts, first_index, counts = np.unique(keys, return_index=True, return_counts=True)
+    last_index = first_index + counts - 1
+    return {
+        't': starts.astype(np.float64),
+        'min': np.minimum.reduceat(prices, first_index),
+        'max': np.maximum.reduceat(prices, first_index),
+        'last': prices[last_index],
+        'mean': np.add.reduceat(prices, first_index) / counts,
+        'count': counts,
+    }
+
+
+def lttb_indices(x, y, threshold):
+    """
+    Largest-Triangle-Three-Buckets downsampling: returns the indices of at most
+    `threshold` points that preserve the visual shape of the (x, y) series.
+    The first and last points are always kept.
+    """
+    size = len(x)
+    if threshold >= size or threshold < 3:
+        return np.arange(size) if threshold >= size else np.array([0, size - 1][:max(threshold, 0)])
+
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, size - 1
+    # threshold - 2 buckets spanning the interior points.
+    edges = np.floor(np.linspace(1, size - 1, threshold - 1)).astype(np.int64)
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        next_start = end
+        next_end = edges[i + 2] if i + 2 < len(edges) else size
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+        # Twice the area of the triangle (point a, candidate, next bucket's average).
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(area.argmax())
+        selected[i + 1] = a
+    return selected
+
+
+def build_series(times, prices, bucket='raw', points=200):
+    """
+    Turns raw price points into a compact, column-oriented chart series:
+    optional bucketing with min/max/last/mean aggregation, then LTTB
+    downsampling (on the `last` price of each bucket) to at most `points`.
+    """
+    if bucket == 'raw':
+        columns = {'t': times, 'price': prices}
+        value = prices
+    else:
+        columns = aggregate(times, prices, bucket) if len(times) else {
+            't': times, 'min': prices, 'max': prices, 'last': prices, 'mean': prices,
+            'count': np.zeros(0, dtype=np.int64),
+        }
+        value = columns['last']
+
+    keep = lttb_indices(columns['t'], value, points)
+    series = {name: column[keep].tolist() for name, column in columns.items() if name != 't'}
+    series['t'] = [_iso(t) for t in columns['t'][keep]]
+    return {
+        'bucket': bucket,
+        'source_points': int(len(times)),
+        'points': int(len(keep)),
+        'series': series,
+    }
+
+
+def get_price_series(supabase, bucket='raw', points=200, since=None, until=None, **selector):
+    """
+    Returns the chart series for a vehicle (`vehicle_id=`) or a cohort
+    (`make=`, optionally `model=`), cached per RLS scope and parameters.
+    """
+    cache = get_series_cache()
+    key = (rls_scope(), tuple(sorted(selector.items())), bucket, points, since, until)
+    series = cache.get(key)
+    if series is None:
+        times, prices = fetch_price_points(supabase, since=since, until=until, **selector)
+        series = build_series(times, prices, bucket, points)
+        cache.set(key, series)
+    return series
@@ -0,0 +1,61 @@
+from flask import current_app
+from ..core.cache import TTLCache
+from ..core.security import invalidate_role
+
+
+def get_profile_cache() -> TTLCache:
+    """
+    Returns the per-process cache of user profiles, keyed by user id. It is
+    written through on every profile update, so entries only go stale when a
+    profile is changed outside this worker, and then for at most
+    `PROFILE_CACHE_TTL` seconds.
+    """
+    cache = current_app.extensions.get('profile_cache')
+    if cache is None:
+        cache = TTLCache(
+            maxsize=current_app.config.get('PROFILE_CACHE_SIZE', 4096),
+            ttl=current_app.config.get('PROFILE_CACHE_TTL', 300),
+        )
+        current_app.extensions['profile_cache'] = cache
+    return cache
+
+
+def get_profile(supabase, user_id):
+    """Returns the user's profile row, or None if it does not exist."""
+    cache = get_profile_cache()
+    profile = cache.get(str(user_id))
+    if profile is None:
+        response = supabase.table('profiles').select('*').eq('id', user_id).limit(1).execute()
+        if not response.data:
+            return None
+        profile = response.data[0]
+        cache.set(str(user_id), profile)
+    return profile
+
+
+def update_profile(supabase, user_id, payload):
+    """
+    Applies a partial update and returns the updated row from the same request
+    (PostgREST returns the representation), refreshing the cache with it and
+    dropping the cached role. Returns None if the profile does not exist.
+    """
+    response = supabase.table('profiles').update(payload).eq('id', user_id).execute()
+    if not response.data:
+        return None
+    profile = response.data[0]
+    get_profile_cache().set(str(user_id), profile)
+    invalidate_role(user_id)
+    return profile
+
+
+def invalidate_profile(user_id=None):
+    """
+    Drops the cached profile for `user_id`, or every cached profile if no id
+    is given. Call this from any profile write that bypasses `update_profile`
+    (e.g. the admin role endpoint).
+    """
+    cache = get_profile_cache()
+    if user_id is None:
+        cache.clear()
+    else:
+        cache.pop(str(user_id))
@@ -0,0 +1,82 @@
+from ..models.schemas import Vehicle
+
+# Public vehicle fields selectable with `fields=`, by API name -> database column.
+# Internal columns (cost, visible, search indexes) are deliberately absent.
+VEHICLE_FIELDS = {
+    'id': 'id', 'vin': 'vin', 'stock_number': 'stock_number',
+    'make': 'make', 'model': 'model', 'trim': 'trim', 'year': 'year',
+    'body_type': 'body_type', 'exterior_color': 'exterior_color', 'interior_color': 'interior_color',
+    'mileage': 'mileage', 'fuel_type': 'fuel_type', 'transmission': 'transmission',
+    'drivetrain': 'drivetrain', 'engine': 'engine', 'doors': 'doors', 'seats': 'seats',
+    'condition': 'condition', 'location_id': 'location_id',
+    'price': 'price_current', 'price_original': 'price_original',
+    'is_featured': 'is_featured', 'is_special_offer': 'is_special_offer', 'is_certified': 'is_certified',
+    'status': 'status', 'description': 'description', 'features': 'features',
+    'specifications': 'specifications', 'highlights': 'highlights', 'known_flaws': 'known_flaws',
+    'service_history': 'service_history', 'owner_history': 'owner_history',
+    'seller_notes': 'seller_notes', 'condition_report': 'condition_report',
+    'created_at': 'created_at', 'updated_at': 'updated_at',
+}
+
+# Columns needed to build the `Vehicle` response model, used when no `fields=` is given.
+VEHICLE_LIST_COLUMNS = [name for name in Vehicle.model_fields if name in VEHICLE_FIELDS.values()]
+
+MEDIA_COLUMNS = [
+    'id', 'vehicle_id', 'media_type', 'url', 'thumbnail_url',
+    'position', 'is_primary', 'alt_text', 'created_at',
+]
+# Vehicle columns embedded in gallery results. The filterable columns are always
+# included so the embedded filters keep working whatever the client selects.
+GALLERY_VEHICLE_FIELDS = ['id', 'make', 'model', 'trim', 'year', 'body_type', 'price_current']
+GALLERY_FILTER_COLUMNS = ['visible', 'make', 'model', 'year', 'body_type']
+
+
+class InvalidFields(ValueError):
+    """Raised when `fields=` names a field that cannot be selected."""
+
+
+def _split_fields(value):
+    return [f.strip() for f in value.split(',') if f.strip()]
+
+
+def vehicle_projection(fields_param, required=()):
+    """
+    Resolves a `fields=` parameter into (select columns, API field names).
+    Returns (None, None) when no projection was requested. Columns listed in
+    `required` (e.g. the sort key needed for cursors) are always selected.
+    """
+    if not fields_param:
+        return None, None
+    names = _split_fields(fields_param)
+    unknown = [name for name in names if name not in VEHICLE_FIELDS]
+    if unknown:
+        raise InvalidFields(f"Unknown fields: {', '.join(unknown)}")
+    columns = [VEHICLE_FIELDS[name] for name in names]
+    for column in ('id', *required):
+        if column not in columns:
+            columns.append(column)
+    return columns, names
+
+
+def project_vehicles(rows, names):
+    """Shapes raw vehicle rows into dicts holding only the requested API fields."""
+    return [{name: row.get(VEHICLE_FIELDS[name]) for name in names} for row in rows]
+
+
+def gallery_select(fields_param):
+    """
+    Builds the PostgREST select for gallery search. `fields=` may name media
+    columns and embedded vehicle columns as `vehicle.<column>`.
+    """
+    media, vehicle = list(MEDIA_COLUMNS), list(GALLERY_VEHICLE_FIELDS)
+    if fields_param:
+        media, vehicle = ['id'], []
+        for name in _split_fields(fields_param):
+            if name.startswith('vehicle.') and name[len('vehicle.'):] in VEHICLE_FIELDS:
+                vehicle.append(VEHICLE_FIELDS[name[len('vehicle.'):]])
+            elif name in MEDIA_COLUMNS:
+                media.append(name)
+            else:
+                raise InvalidFields(f"Unknown field: {name}")
+    embedded = list(dict.fromkeys(vehicle + GALLERY_FILTER_COLUMNS))
+    return f"{','.join(dict.fromkeys(media))},vehicles!inner({','.join(embedded)})"
@@ -0,0 +1,45 @@
+from typing import List
+
+from flask import current_app
+from pydantic import TypeAdapter
+
+from ..models.schemas import Bid, Vehicle
+
+# Compiled once at import; validates a whole list of rows in a single call.
+VEHICLE_LIST_ADAPTER = TypeAdapter(List[Vehicle])
+BID_LIST_ADAPTER = TypeAdapter(List[Bid])
+
+# Output key for each Vehicle field (its alias when it has one), with defaults.
+_VEHICLE_KEYS = [
+    (name, field.alias or name, None if field.is_required() else field.default)
+    for name, field in Vehicle.model_fields.items()
+]
+
+
+def _trusted_vehicle(row):
+    return {key: row.get(name, default) for name, key, default in _VEHICLE_KEYS}
+
+
+def dump_vehicles(rows, trusted=None):
+    """
+    Shapes vehicle rows into Vehicle response dicts (by alias) in bulk.
+
+    Rows are validated through one compiled TypeAdapter rather than one model
+    per row. Rows read from our own database may skip validation entirely
+    (TRUST_DATABASE_ROWS), in which case they are only re-keyed.
+    """
+    if trusted is None:
+        trusted = current_app.config.get('TRUST_DATABASE_ROWS', False)
+    if trusted:
+        return [_trusted_vehicle(row) for row in rows]
+    return VEHICLE_LIST_ADAPTER.dump_python(VEHICLE_LIST_ADAPTER.validate_python(rows), by_alias=True)
+
+
+def dump_vehicle(row, trusted=None):
+    """Single-row form of `dump_vehicles`."""
+    return dump_vehicles([row], trusted)[0]
+
+
+def dump_bids(rows):
+    """Shapes bid rows (see `recent_bids`) into Bid response dicts in bulk."""
+    return BID_LIST_ADAPTER.dump_python(BID_LIST_ADAPTER.validate_python(rows), mode='json')
@@ -0,0 +1,49 @@
+from flask import current_app
+from ..core.db import get_pool
+from ..core.refresher import BackgroundRefresher
+
+
+class StatsRollup(BackgroundRefresher):
+    """
+    Holds the latest site statistics computed by the `site_stats` RPC, which
+    a background thread recomputes every `refresh_interval` seconds (see
+    core/refresher.py), so the summary endpoint never aggregates tables on
+    the request path. The figures are site-wide totals, identical for every
+    caller.
+    """
+
+    name = 'stats-rollup'
+
+    def __init__(self, app, refresh_interval=300, failure_backoff=30):
+        super().__init__(app, refresh_interval, failure_backoff)
+        self.snapshot = None
+
+    def load(self):
+        """Recomputes the rollup with one RPC and swaps in the new snapshot."""
+        pool = get_pool(self.app)
+        client = pool.acquire()
+        try:
+            self.snapshot = client.rpc('site_stats', {}).execute().data
+        finally:
+            pool.release(client)
+        return self.snapshot
+
+    def stats(self):
+        return {
+            **super().stats(),
+            "computed_at": self.snapshot.get('computed_at') if self.snapshot else None,
+        }
+
+
+def get_stats_rollup(app=None) -> StatsRollup:
+    """Returns the application's stats rollup, starting its refresher on first use."""
+    app = app or current_app._get_current_object()
+    rollup = app.extensions.get('stats_rollup')
+    if rollup is None:
+        rollup = app.extensions.setdefault('stats_rollup', StatsRollup(
+            app,
+            refresh_interval=app.config.get('STATS_REFRESH_SECONDS', 300),
+            failure_backoff=app.config.get('REFRESH_RETRY_SECONDS', 30),
+        ))
+    rollup.ensure_started()
+    return rollup
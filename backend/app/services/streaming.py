@@ -0,0 +1,308 @@
+import itertools
+import threading
+import time
+from collections import deque
+
+from flask import current_app
+from ..core.db import get_pool
+from ..core.http_cache import purge_surrogate_keys
+from ..core.refresher import BackgroundRefresher
+
+EVENT_TYPES = ('bid', 'status')
+FEED_BATCH_SIZE = 500
+# Ids are assigned at insert but become visible at commit, so a slow transaction
+# can surface an id below the cursor. Skipped ids are re-checked for this many
+# seconds before they are treated as rolled back.
+FEED_GAP_SECONDS = 10
+
+
+class TooManySubscribers(Exception):
+    """Raised when this worker already serves `STREAM_MAX_SUBSCRIBERS` streams."""
+
+
+class EventHub:
+    """
+    Fans events out to every streaming subscriber of this worker.
+
+    Events are kept in one bounded ring buffer shared by all subscribers, each
+    of which only holds its position in it. Publishing is O(1) whatever the
+    number of subscribers and never waits on a slow client. A subscriber that
+    falls more than a full buffer behind is sent a `reset` event and
+    disconnected, so it can reload state and reconnect instead of holding an
+    ever-growing backlog in memory. A client resuming from an event that is
+    no longer buffered gets the same `reset`.
+    """
+
+    def __init__(self, buffer_size=1024, max_subscribers=5000):
+        self.buffer_size = buffer_size
+        self.max_subscribers = max_subscribers
+        self._events = deque(maxlen=buffer_size)  # (sequence, event)
+        self._seq = 0
+        # Every event with an id above this is buffered; None until the feed starts.
+        self._floor = None
+        self._cond = threading.Condition()
+        self._active = threading.Event()  # set while anyone is subscribed
+        self.subscribers = 0
+        self.published = 0
+        self.dropped = 0
+        self.resyncs = 0
+
+    def publish(self, event):
+        """Appends an event and wakes every waiting subscriber."""
+        self.publish_many([event])
+
+    def publish_many(self, events):
+        """
+        Appends several events with a single wake-up. Waking thousands of
+        subscribers dominates publish cost, so batching arrivals matters.
+        """
+        if not events:
+            return
+        with self._cond:
+            for event in events:
+                if len(self._events) == self.buffer_size:
+                    self._floor = self._events[0][1]['id']
+                self._seq += 1
+                self._events.append((self._seq, event))
+            self.published += len(events)
+            self._cond.notify_all()
+
+    def start_history(self, after_id):
+        """
+        Forgets buffered events and records that the feed publishes everything
+        after `after_id` from now on. Called when the feed (re)starts.
+        """
+        with self._cond:
+            self._events.clear()
+            self._floor = after_id
+
+    def pause_if_unsubscribed(self):
+        """
+        Returns True, and marks the hub idle, if nobody is subscribed. The
+        buffer is dropped, as the feed will not see what happens while idle.
+        """
+        with self._cond:
+            if self.subscribers:
+                return False
+            self._active.clear()
+            self._events.clear()
+            self._floor = None
+            return True
+
+    def wait_for_subscribers(self):
+        self._active.wait()
+
+    def _start_position(self, last_event_id):
+        # Resume just after `last_event_id` if every later event is buffered;
+        # None if some may have been missed, in which case the client must resync.
+        if last_event_id is None:
+            return self._seq
+        if self._floor is None or last_event_id < self._floor:
+            return None
+        for seq, event in self._events:
+            if event['id'] > last_event_id:
+                return seq - 1
+        return self._seq
+
+    def subscribe(self, vehicle_ids=None, event_types=None, last_event_id=None, heartbeat=15.0):
+        """
+        Registers a subscriber and returns its `Subscription`. Raises
+        `TooManySubscribers` when this worker is at capacity.
+        """
+        with self._cond:
+            if self.subscribers >= self.max_subscribers:
+                raise TooManySubscribers("Too many live subscribers on this worker")
+            self.subscribers += 1
+            self._active.set()
+            position = self._start_position(last_event_id)
+            if position is None:
+                self.resyncs += 1
+        return Subscription(self, position, vehicle_ids, event_types, heartbeat)
+
+    def _unsubscribe(self):
+        with self._cond:
+            self.subscribers -= 1
+
+    def stats(self):
+        return {
+            "subscribers": self.subscribers,
+            "max_subscribers": self.max_subscribers,
+            "published": self.published,
+            "dropped": self.dropped,
+            "resyncs": self.resyncs,
+            "buffered": len(self._events),
+        }
+
+
+class Subscription:
+    """
+    One subscriber's view of an `EventHub`. Iterating yields matching events as
+    they are published, or None every `heartbeat` seconds of silence so the
+    caller can keep the connection alive. If the subscriber lags a full buffer
+    behind, or resumed from an event that is no longer buffered (`position`
+    is None), it yields a `reset` event and stops. Always `close()` it.
+    """
+
+    def __init__(self, hub, position, vehicle_ids=None, event_types=None, heartbeat=15.0):
+        self.hub = hub
+        self.position = position
+        self.vehicle_ids = vehicle_ids
+        self.event_types = event_types
+        self.heartbeat = heartbeat
+        self.closed = False
+
+    def _next_batch(self):
+        hub = self.hub
+        with hub._cond:
+            if hub._seq == self.position and not hub._cond.wait(timeout=self.heartbeat):
+                return None
+            oldest = hub._events[0][0]
+            if self.position + 1 < oldest:
+                hub.dropped += 1
+                return [{'type': 'reset', 'reason': 'subscriber fell behind'}]
+            batch = [event for _, event in itertools.islice(hub._events, self.position + 1 - oldest, None)]
+            self.position = hub._seq
+            return batch
+
+    def __iter__(self):
+        if self.position is None:
+            yield {'type': 'reset', 'reason': 'events since Last-Event-ID are no longer available'}
+            return
+        while not self.closed:
+            batch = self._next_batch()
+            if batch is None:
+                yield None
+                continue
+            # Matching and writing happen outside the hub lock.
+            for event in batch:
+                if event['type'] == 'reset':
+                    yield event
+                    return
+                if self.vehicle_ids and event['vehicle_id'] not in self.vehicle_ids:
+                    continue
+                if self.event_types and event['type'] not in self.event_types:
+                    continue
+                yield event
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self.hub._unsubscribe()
+
+
+class ChangeFeed(BackgroundRefresher):
+    """
+    Polls the `live_events` table from a background thread and publishes new
+    rows to the hub, so each worker issues one small indexed query per poll
+    interval no matter how many clients are connected, and none while no
+    client is (unless CDN purging needs to see status changes).
+    """
+
+    name = 'live-events-feed'
+
+    def __init__(self, app, hub, poll_interval=1.0):
+        super().__init__(app, refresh_interval=poll_interval, failure_backoff=poll_interval)
+        self.hub = hub
+        self.cursor = None
+        self.last_read = 0
+        self._gaps = {}  # skipped id -> time it was first noticed
+
+    def _query(self, client, after_id=None, limit=FEED_BATCH_SIZE, desc=False):
+        query = client.table('live_events').select('id, event_type, vehicle_id, payload, created_at')
+        if after_id is not None:
+            if self._gaps:
+                gaps = ','.join(str(i) for i in sorted(self._gaps))
+                query = query.or_(f"id.gt.{after_id},id.in.({gaps})")
+            else:
+                query = query.gt('id', after_id)
+        return query.order('id', desc=desc).limit(limit).execute().data or []
+
+    def poll(self):
+        """Publishes events committed since the last poll. Returns how many rows were read."""
+        pool = get_pool(self.app)
+        client = pool.acquire()
+        try:
+            if self.cursor is None:
+                # Start from the head of the feed; history is not replayed.
+                latest = self._query(client, limit=1, desc=True)
+                self.cursor = latest[0]['id'] if latest else 0
+                self.hub.start_history(self.cursor)
+                return 0
+            rows = self._query(client, after_id=self.cursor)
+        finally:
+            pool.release(client)
+
+        now = time.monotonic()
+        events = []
+        for row in rows:
+            if row['id'] > self.cursor:
+                if row['id'] - self.cursor <= FEED_BATCH_SIZE:
+                    for missing in range(self.cursor + 1, row['id']):
+                        self._gaps[missing] = now
+                self.cursor = row['id']
+            else:
+                self._gaps.pop(row['id'], None)
+            events.append({
+                'id': row['id'],
+                'type': row['event_type'],
+                'vehicle_id': row['vehicle_id'],
+                'data': row['payload'],
+                'created_at': row['created_at'],
+            })
+        self.hub.publish_many(events)
+        # Status changes are written outside the API, so this is where they are seen.
+        changed = sorted({f"vehicle-{e['vehicle_id']}" for e in events if e['type'] == 'status'})
+        purge_surrogate_keys(*changed, app=self.app)
+        self._gaps = {i: seen for i, seen in self._gaps.items() if now - seen < FEED_GAP_SECONDS}
+        return len(rows)
+
+    def _pause_while_idle(self):
+        """
+        Stops polling until someone subscribes. Events committed meanwhile are
+        not replayed: the feed restarts at the head, and clients resuming from
+        before the pause are sent a reset.
+        """
+        if self.app.config.get('CDN_PURGE_URL') or not self.hub.pause_if_unsubscribed():
+            return
+        self.hub.wait_for_subscribers()
+        self.cursor = None
+        self._gaps.clear()
+
+    def load(self):
+        self.last_read = self.poll()
+
+    def _delay(self):
+        # Drain a backlog without sleeping between full batches.
+        if self.last_error is None and self.last_read >= FEED_BATCH_SIZE:
+            return 0
+        return super()._delay()
+
+    def _run(self):
+        while True:
+            self._pause_while_idle()
+            self.refresh()
+            time.sleep(self._delay())
+
+    def stats(self):
+        return {
+            **super().stats(),
+            "cursor": self.cursor,
+            "pending_gaps": len(self._gaps),
+        }
+
+
+def get_event_hub() -> EventHub:
+    """Returns this worker's event hub, starting its change feed on first use."""
+    hub = current_app.extensions.get('event_hub')
+    if hub is None:
+        hub = EventHub(
+            buffer_size=current_app.config.get('STREAM_BUFFER_SIZE', 1024),
+            max_subscribers=current_app.config.get('STREAM_MAX_SUBSCRIBERS', 5000),
+        )
+        current_app.extensions['event_hub'] = hub
+        current_app.extensions['event_feed'] = ChangeFeed(
+            current_app._get_current_object(), hub,
+            poll_interval=current_app.config.get('STREAM_POLL_INTERVAL', 1.0),
+        )
+    current_app.extensions['event_feed'].ensure_started()
+    return hub
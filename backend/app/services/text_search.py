@@ -0,0 +1,59 @@
+from flask import current_app
+from ..core.cache import TTLCache
+from ..core.db import rls_scope
+from .pagination import RELEVANCE, InvalidCursor, decode_cursor, encode_offset_cursor
+
+
+def get_search_cache() -> TTLCache:
+    """Returns the per-process cache of ranked text search results."""
+    cache = current_app.extensions.get('text_search_cache')
+    if cache is None:
+        cache = TTLCache(
+            maxsize=current_app.config.get('SEARCH_CACHE_SIZE', 2048),
+            ttl=current_app.config.get('SEARCH_CACHE_TTL', 60),
+        )
+        current_app.extensions['text_search_cache'] = cache
+    return cache
+
+
+def _ranked(supabase, function, q):
+    cache = get_search_cache()
+    key = (function, rls_scope(), q)
+    ranks = cache.get(key)
+    if ranks is None:
+        params = {'p_query': q, 'p_limit': current_app.config.get('SEARCH_MAX_RESULTS', 200)}
+        response = supabase.rpc(function, params).execute()
+        # Rows arrive best match first; dicts preserve that order.
+        ranks = {row['id']: row['rank'] for row in response.data or []}
+        cache.set(key, ranks)
+    return ranks
+
+
+def rank_vehicles(supabase, q):
+    """
+    Returns {vehicle id: rank} for vehicles matching `q`, best match first.
+    Matching uses the full-text index with prefix matching plus trigram word
+    similarity for typo tolerance (see `search_vehicles_ranked`).
+    """
+    return _ranked(supabase, 'search_vehicles_ranked', q)
+
+
+def rank_gallery_media(supabase, q):
+    """Returns {media id: rank} for gallery media matching `q`, best match first."""
+    return _ranked(supabase, 'search_gallery_media', q)
+
+
+def page_by_relevance(rows, ranks, limit, cursor=None):
+    """
+    Orders a bounded set of matched rows by search rank and returns one page.
+    Returns (page rows, next cursor or None).
+    """
+    offset = 0
+    if cursor:
+        offset, _ = decode_cursor(RELEVANCE, cursor)
+        if not isinstance(offset, int) or offset < 0:
+            raise InvalidCursor("Malformed pagination cursor")
+    ordered = sorted(rows, key=lambda r: (-ranks.get(str(r['id']), 0), str(r['id'])))
+    page = ordered[offset:offset + limit]
+    has_more = len(ordered) > offset + limit
+    return page, (encode_offset_cursor(offset + limit, page[-1]) if has_more else None)
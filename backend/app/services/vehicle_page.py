@@ -0,0 +1,125 @@
+from flask import current_app
+from ..core.cache import TTLCache
+from ..core.concurrency import fan_out
+from ..core.db import get_supabase, rls_scope
+from .bidding import NO_BIDS, get_bid_engine, recent_bids
+from .inventory_index import get_inventory_snapshot
+from .projection import MEDIA_COLUMNS
+from .serialization import dump_bids, dump_vehicle
+
+PRICE_HISTORY_COLUMNS = ['id', 'price', 'price_type', 'recorded_at']
+PRICE_HISTORY_LIMIT = 100
+RECENT_BIDS_LIMIT = 10
+
+# Section name -> default TTL (seconds). Media and specs rarely change, bids constantly.
+DEFAULT_SECTION_TTLS = {
+    'vehicle': 60,
+    'media': 300,
+    'price_history': 300,
+    'bids': 2,
+}
+
+
+def get_section_cache() -> TTLCache:
+    """Returns the per-process cache of vehicle page sections; each entry carries its section's TTL."""
+    cache = current_app.extensions.get('vehicle_page_cache')
+    if cache is None:
+        cache = TTLCache(maxsize=current_app.config.get('VDP_CACHE_SIZE', 4096))
+        current_app.extensions['vehicle_page_cache'] = cache
+    return cache
+
+
+def _fetch_vehicle(supabase, vehicle_id):
+    snapshot = get_inventory_snapshot()
+    row = snapshot.get(vehicle_id) if snapshot is not None else None
+    if row is None:
+        response = supabase.table('vehicles').select('*').eq('id', vehicle_id).limit(1).execute()
+        row = response.data[0] if response.data else None
+    return dump_vehicle(row) if row is not None else None
+
+
+def _fetch_media(supabase, vehicle_id):
+    return (
+        supabase.table('vehicle_media')
+        .select(','.join(MEDIA_COLUMNS))
+        .eq('vehicle_id', vehicle_id)
+        .order('position')
+        .execute()
+    ).data or []
+
+
+def _fetch_price_history(supabase, vehicle_id):
+    return (
+        supabase.table('price_history')
+        .select(','.join(PRICE_HISTORY_COLUMNS))
+        .eq('vehicle_id', vehicle_id)
+        .order('recorded_at', desc=True)
+        .limit(PRICE_HISTORY_LIMIT)
+        .execute()
+    ).data or []
+
+
+def _fetch_bids(supabase, vehicle_id):
+    engine = get_bid_engine()
+    rows = recent_bids(supabase, vehicle_id, RECENT_BIDS_LIMIT)
+    high = float(rows[0]['amount']) if rows else NO_BIDS
+    engine.remember_high_bid(vehicle_id, high)
+    return {**engine.summary(high), "recent": dump_bids(rows)}
+
+
+SECTIONS = {
+    'vehicle': _fetch_vehicle,
+    'media': _fetch_media,
+    'price_history': _fetch_price_history,
+    'bids': _fetch_bids,
+}
+
+
+def _section(name, supabase, vehicle_id):
+    """Returns (value, error) for one section, from cache or freshly fetched."""
+    cache = get_section_cache()
+    key = (name, rls_scope(), vehicle_id)
+    value = cache.get(key)
+    if value is not None:
+        return value, None
+    try:
+        value = SECTIONS[name](supabase, vehicle_id)
+    except Exception as e:
+        if name == 'vehicle':
+            raise
+        # A failing secondary section degrades the page instead of failing it.
+        print(f"Error fetching vehicle page section {name}: {e}")
+        return None, str(e)
+    if value is not None:
+        ttls = current_app.config.get('VDP_SECTION_TTLS', DEFAULT_SECTION_TTLS)
+        cache.set(key, value, ttl=ttls.get(name, DEFAULT_SECTION_TTLS[name]))
+    return value, None
+
+
+def get_vehicle_page(vehicle_id):
+    """
+    Assembles the vehicle detail page: the vehicle, its media, price history
+    and bids. Uncached sections are fetched concurrently, so the page costs
+    one round trip to its slowest section. Returns None if the vehicle does
+    not exist or is not visible to the caller.
+    """
+    supabase = get_supabase()
+    results = fan_out(*(
+        (lambda name=name: _section(name, supabase, vehicle_id)) for name in SECTIONS
+    ))
+    sections = dict(zip(SECTIONS, results))
+
+    vehicle, _ = sections.pop('vehicle')
+    if vehicle is None:
+        # Media, prices and bids are not RLS-filtered by vehicle visibility.
+        return None
+
+    page = {"vehicle": vehicle}
+    errors = {}
+    for name, (value, error) in sections.items():
+        page[name] = value
+        if error:
+            errors[name] = error
+    if errors:
+        page["errors"] = errors
+    return page
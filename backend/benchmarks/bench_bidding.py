@@ -0,0 +1,158 @@
+"""
+Load test for bid placement on one hot vehicle. Many bidder threads race to
+outbid each other against a simulated `place_bid` function that has the same
+semantics as the database one (a per-vehicle lock around a conditional
+insert) and a fixed round-trip latency.
+
+Compares sending every bid straight to the database with the BidEngine
+(per-vehicle lock plus high-bid cache), and checks that the accepted bids
+form a strictly increasing sequence, i.e. no two concurrent bids both won.
+
+    python benchmarks/bench_bidding.py --bidders 64 --workers 4 --latency-ms 5
+"""
+import argparse
+import random
+import statistics
+import sys
+import os
+import threading
+import time
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from postgrest.exceptions import APIError  # noqa: E402
+
+from app.services.bidding import BID_TOO_LOW, BidEngine, BidRejected  # noqa: E402
+
+
+class _Result:
+    def __init__(self, data):
+        self.data = data
+
+
+class SimulatedDatabase:
+    """Mimics the `place_bid` RPC: serialized per vehicle, conditional insert."""
+
+    def __init__(self, latency, min_increment):
+        self.latency = latency
+        self.min_increment = min_increment
+        self.bids = []
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def rpc(self, name, params):
+        return _Call(self, params)
+
+    def place_bid(self, params):
+        time.sleep(self.latency / 2)  # request travels to the database
+        with self._lock:
+            self.calls += 1
+            high = self.bids[-1]['amount'] if self.bids else None
+            if high is not None and params['p_amount'] < high + self.min_increment:
+                error = APIError({'message': 'Bid too low', 'code': BID_TOO_LOW, 'hint': str(high)})
+            else:
+                error = None
+                bid = {
+                    'id': str(uuid.uuid4()), 'vehicle_id': params['p_vehicle_id'],
+                    'user_id': str(uuid.uuid4()), 'amount': params['p_amount'],
+                    'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                }
+                self.bids.append(bid)
+        time.sleep(self.latency / 2)  # response travels back
+        if error:
+            raise error
+        return _Result(bid)
+
+
+class _Call:
+    def __init__(self, db, params):
+        self.db, self.params = db, params
+
+    def execute(self):
+        return self.db.place_bid(self.params)
+
+
+class DirectPlacement:
+    """Baseline: every bid goes to the database, no lock or cache in the app."""
+
+    def __init__(self, min_increment):
+        self.min_increment = min_increment
+
+    def place(self, db, vehicle_id, amount):
+        params = {'p_vehicle_id': vehicle_id, 'p_amount': amount}
+        try:
+            return db.rpc('place_bid', params).execute().data
+        except APIError as e:
+            high = float(e.hint)
+            raise BidRejected(e.message, high_bid=high, minimum=high + self.min_increment)
+
+
+def run(make_engine, args):
+    db = SimulatedDatabase(args.latency_ms / 1000, args.increment)
+    engines = [make_engine() for _ in range(args.workers)]  # one per worker process
+    vehicle_id = str(uuid.uuid4())
+    latencies, lock = [], threading.Lock()
+    counts = {'accepted': 0, 'rejected': 0}
+    deadline = time.perf_counter() + args.seconds
+
+    def bidder(index):
+        rng = random.Random(index)
+        engine = engines[index % len(engines)]
+        next_amount = 1000.0
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                bid = engine.place(db, vehicle_id, next_amount)
+                outcome = 'accepted'
+                next_amount = bid['amount'] + args.increment * rng.randint(1, 3)
+            except BidRejected as e:
+                outcome = 'rejected'
+                next_amount = e.minimum + args.increment * rng.randint(0, 2)
+            with lock:
+                counts[outcome] += 1
+                latencies.append(time.perf_counter() - start)
+            time.sleep(args.think_ms / 1000 * rng.random())
+
+    threads = [threading.Thread(target=bidder, args=(i,)) for i in range(args.bidders)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    amounts = [b['amount'] for b in db.bids]
+    consistent = all(b >= a + args.increment for a, b in zip(amounts, amounts[1:]))
+    latencies.sort()
+    return {
+        'accepted/s': counts['accepted'] / args.seconds,
+        'rejected/s': counts['rejected'] / args.seconds,
+        'db calls/s': db.calls / args.seconds,
+        'p50 ms': statistics.median(latencies) * 1000,
+        'p99 ms': latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        'consistent': consistent,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--bidders', type=int, default=64, help='concurrent bidder threads')
+    parser.add_argument('--workers', type=int, default=4, help='simulated worker processes (engines)')
+    parser.add_argument('--seconds', type=float, default=5.0, help='duration per run')
+    parser.add_argument('--latency-ms', type=float, default=5.0, help='database round-trip latency')
+    parser.add_argument('--think-ms', type=float, default=2.0, help='max pause between a bidder\'s bids')
+    parser.add_argument('--increment', type=float, default=100.0, help='minimum bid increment')
+    args = parser.parse_args()
+
+    modes = [
+        ('direct to database', lambda: DirectPlacement(args.increment)),
+        ('BidEngine', lambda: BidEngine(min_increment=args.increment)),
+    ]
+    columns = ['accepted/s', 'rejected/s', 'db calls/s', 'p50 ms', 'p99 ms']
+    print(f"{'mode':<22}" + ''.join(f'{c:>12}' for c in columns) + f"{'consistent':>12}")
+    for name, make_engine in modes:
+        result = run(make_engine, args)
+        print(f"{name:<22}" + ''.join(f'{result[c]:>12,.1f}' for c in columns) + f"{str(result['consistent']):>12}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,202 @@
+"""
+Per-endpoint throughput and latency benchmark that runs fully offline.
+
+The Flask app is driven in-process from N client threads against the fake
+Supabase in fake_supabase.py, which is seeded from migrations/seed.sql plus
+--rows synthetic vehicles and adds --latency-ms to every round trip. Each
+endpoint runs for --seconds and reports requests per second and p50/p95/p99
+latency.
+
+    python benchmarks/bench_endpoints.py --rows 5000 --latency-ms 5
+
+Results can be stored as a named baseline and later runs compared against it,
+so an optimization is judged against numbers taken on the same machine:
+
+    python benchmarks/bench_endpoints.py --save before
+    # ... change something ...
+    python benchmarks/bench_endpoints.py --compare before
+
+Baselines are JSON files in benchmarks/baselines/. By default caches stay
+warm between requests, as in production; --cold clears every per-process
+cache before each request, to measure the uncached path.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.main import create_app  # noqa: E402
+from app.services.inventory_index import get_inventory_index  # noqa: E402
+from fake_supabase import FakeDatabase, FakePool  # noqa: E402
+
+BASELINE_DIR = os.path.join(os.path.dirname(__file__), 'baselines')
+
+PAYMENT = {'vehicle_price': 32000, 'down_payment': 4000, 'loan_term_months': 60, 'annual_interest_rate': 6.9}
+
+# name -> (method, path, JSON body)
+ENDPOINTS = {
+    'inventory search': ('GET', '/api/v1/inventory/search?limit=20', None),
+    'inventory filtered': ('GET', '/api/v1/inventory/search?make=Toyota,Ford&bodyType=SUV&sort_by=price_asc', None),
+    'inventory text': ('GET', '/api/v1/inventory/search?q=toyota', None),
+    'gallery search': ('GET', '/api/v1/gallery/search?make=Tesla&limit=30', None),
+    'featured': ('GET', '/api/v1/inventory/featured', None),
+    'offers': ('GET', '/api/v1/offers/', None),
+    'payment calc': ('POST', '/api/v1/tools/calculate-payment', PAYMENT),
+}
+
+
+def clear_caches(app):
+    """Empties every per-process cache and index held in `app.extensions`."""
+    for name, extension in app.extensions.items():
+        if name == 'supabase_pool':
+            continue
+        if hasattr(extension, 'clear'):
+            extension.clear()
+        elif hasattr(extension, 'invalidate'):
+            extension.invalidate()
+
+
+def percentile(sorted_samples, q):
+    return sorted_samples[min(len(sorted_samples) - 1, int(len(sorted_samples) * q))]
+
+
+def run_endpoint(app, method, path, body, threads, seconds, cold):
+    client = app.test_client()
+    latencies, lock = [], threading.Lock()
+    # One untimed request to load lazily built state (indexes, first cache fill).
+    client.open(path, method=method, json=body)
+    deadline = time.perf_counter() + seconds
+
+    def worker():
+        local = []
+        while time.perf_counter() < deadline:
+            if cold:
+                clear_caches(app)
+            start = time.perf_counter()
+            response = client.open(path, method=method, json=body)
+            assert response.status_code == 200, response.get_data(as_text=True)
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'rps': round(len(latencies) / seconds, 1),
+        'p50_ms': round(statistics.median(latencies) * 1000, 2),
+        'p95_ms': round(percentile(latencies, 0.95) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 2),
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+            cwd=os.path.dirname(__file__), check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def baseline_path(name):
+    return os.path.join(BASELINE_DIR, f'{name}.json')
+
+
+def load_baseline(name):
+    with open(baseline_path(name)) as f:
+        return json.load(f)
+
+
+def save_baseline(name, params, results):
+    os.makedirs(BASELINE_DIR, exist_ok=True)
+    with open(baseline_path(name), 'w') as f:
+        json.dump({
+            'name': name,
+            'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'params': params,
+            'results': results,
+        }, f, indent=2)
+        f.write('\n')
+    print(f"\nSaved baseline '{name}' to {os.path.relpath(baseline_path(name))}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=2000, help='synthetic vehicles added to the seed data')
+    parser.add_argument('--latency-ms', type=float, default=2.0, help='simulated PostgREST round trip')
+    parser.add_argument('--threads', type=int, default=4, help='concurrent request threads')
+    parser.add_argument('--seconds', type=float, default=3.0, help='duration per endpoint')
+    parser.add_argument('--cold', action='store_true', help='clear per-process caches before every request')
+    parser.add_argument('--index', action='store_true', help='enable the in-memory inventory index')
+    parser.add_argument('--only', help='comma-separated endpoint names to run')
+    parser.add_argument('--save', metavar='NAME', help='store the results as baselines/NAME.json')
+    parser.add_argument('--compare', metavar='NAME', help='compare against baselines/NAME.json')
+    parser.add_argument('--list', action='store_true', help='list the endpoints and stored baselines')
+    args = parser.parse_args()
+
+    if args.list:
+        for name, (method, path, _) in ENDPOINTS.items():
+            print(f"{name:<20}{method:<6}{path}")
+        stored = sorted(f[:-5] for f in os.listdir(BASELINE_DIR) if f.endswith('.json')) \
+            if os.path.isdir(BASELINE_DIR) else []
+        print(f"\nbaselines: {', '.join(stored) or '(none)'}")
+        return
+
+    names = [n.strip() for n in args.only.split(',')] if args.only else list(ENDPOINTS)
+    unknown = [n for n in names if n not in ENDPOINTS]
+    if unknown:
+        parser.error(f"unknown endpoints: {', '.join(unknown)}")
+
+    params = {
+        'rows': args.rows, 'latency_ms': args.latency_ms, 'threads': args.threads,
+        'seconds': args.seconds, 'cold': args.cold, 'index': args.index,
+    }
+    baseline = load_baseline(args.compare) if args.compare else None
+    workload = {k: v for k, v in params.items() if k != 'seconds'}
+    if baseline and {k: v for k, v in baseline['params'].items() if k != 'seconds'} != workload:
+        print(f"warning: baseline '{args.compare}' was taken with {baseline['params']}")
+
+    app = create_app()
+    app.config['INVENTORY_INDEX_ENABLED'] = args.index
+    app.extensions['supabase_pool'] = FakePool(FakeDatabase.seeded(rows=args.rows), latency=args.latency_ms / 1000)
+    if args.index and not get_inventory_index(app).wait(timeout=60):
+        parser.error(f"inventory index failed to load: {get_inventory_index(app).last_error}")
+
+    header = f"{'endpoint':<20}{'req/s':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+    print(header + (f"{'base req/s':>12}{'change':>9}" if baseline else ''))
+    results = {}
+    for name in names:
+        method, path, body = ENDPOINTS[name]
+        result = run_endpoint(app, method, path, body, args.threads, args.seconds, args.cold)
+        results[name] = result
+        line = (f"{name:<20}{result['rps']:>10,.1f}{result['p50_ms']:>9.2f}"
+                f"{result['p95_ms']:>9.2f}{result['p99_ms']:>9.2f}")
+        previous = baseline['results'].get(name) if baseline else None
+        if previous:
+            change = (result['rps'] / previous['rps'] - 1) * 100
+            line += f"{previous['rps']:>12,.1f}{change:>+8.1f}%"
+        print(line)
+
+    if args.save:
+        save_baseline(args.save, params, results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,184 @@
+"""
+Load test for concurrent upstream fan-out and the serving mode.
+
+In-process mode (default) drives the Flask app from N client threads, as a
+gthread worker with N threads would, against a simulated PostgREST with a
+fixed round-trip latency. It compares requests per second with fan-out off
+(every query in sequence) and on, for inventory search, which issues the
+page and facet queries together.
+
+    python benchmarks/bench_fanout.py --threads 8 --latency-ms 20
+
+Live mode load-tests a running server, e.g. one gunicorn worker started with
+GUNICORN_WORKERS=1 and GUNICORN_WORKER_CLASS=sync, then again with gevent, to
+compare requests per second per worker:
+
+    python benchmarks/bench_fanout.py --url http://localhost:5000/api/v1/inventory/search \\
+        --concurrency 64 --seconds 10
+"""
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+
+import httpx
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.main import create_app  # noqa: E402
+from bench_inventory_index import synthetic_vehicles  # noqa: E402
+
+
+class _Result:
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+
+class SimulatedQuery:
+    """Accepts any PostgREST builder chain; `execute()` waits one round trip."""
+
+    def __init__(self, latency, data, single=False):
+        self.latency = latency
+        self.data = data
+        self.single_row = single
+
+    def single(self):
+        return SimulatedQuery(self.latency, self.data, single=True)
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self
+
+    def execute(self):
+        time.sleep(self.latency)
+        if self.single_row:
+            return _Result(self.data[0] if self.data else None)
+        return _Result(self.data, count=len(self.data))
+
+
+class SimulatedClient:
+    def __init__(self, latency, vehicles):
+        self.latency = latency
+        self.tables = {
+            'vehicles': vehicles,
+            'profiles': [{'role': 'admin'}],
+            'offers': [],
+        }
+
+    def table(self, name):
+        return SimulatedQuery(self.latency, self.tables.get(name, []))
+
+    def rpc(self, name, params=None):
+        return SimulatedQuery(self.latency, [])
+
+
+class SimulatedPool:
+    def __init__(self, client):
+        self.client = client
+
+    def acquire(self, access_token=None):
+        return self.client
+
+    def release(self, client):
+        pass
+
+    def stats(self):
+        return {}
+
+
+def run_in_process(app, path, headers, threads, seconds, before_request):
+    client = app.test_client()
+    latencies, lock = [], threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def worker():
+        local = []
+        while time.perf_counter() < deadline:
+            before_request()
+            start = time.perf_counter()
+            response = client.get(path, headers=headers)
+            assert response.status_code == 200, response.get_data(as_text=True)
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    return len(latencies) / seconds, statistics.median(latencies) * 1000
+
+
+def in_process(args):
+    app = create_app()
+    app.config['FACET_CACHE_TTL'] = 0
+    app.extensions['supabase_pool'] = SimulatedPool(
+        SimulatedClient(args.latency_ms / 1000, synthetic_vehicles(21)),
+    )
+    def clear_caches():
+        # Force the uncached facet counts on every request.
+        with app.app_context():
+            from app.services.facets import get_facet_cache
+            get_facet_cache().clear()
+
+    endpoints = [
+        ('inventory search', '/api/v1/inventory/search?limit=20&count=none', {}),
+    ]
+    print(f"{'endpoint':<20}{'fan-out':>9}{'req/s':>10}{'p50 ms':>10}")
+    for name, path, headers in endpoints:
+        for enabled in (False, True):
+            app.config['FANOUT_ENABLED'] = enabled
+            rps, p50 = run_in_process(app, path, headers, args.threads, args.seconds, clear_caches)
+            print(f"{name:<20}{'on' if enabled else 'off':>9}{rps:>10,.1f}{p50:>10.1f}")
+
+
+def live(args):
+    latencies, errors, lock = [], 0, threading.Lock()
+    deadline = time.perf_counter() + args.seconds
+
+    def worker():
+        nonlocal errors
+        local, failed = [], 0
+        with httpx.Client(timeout=30) as client:
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                try:
+                    ok = client.get(args.url).status_code < 500
+                except httpx.HTTPError:
+                    ok = False
+                if ok:
+                    local.append(time.perf_counter() - start)
+                else:
+                    failed += 1
+        with lock:
+            latencies.extend(local)
+            errors += failed
+
+    pool = [threading.Thread(target=worker) for _ in range(args.concurrency)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    latencies.sort()
+    print(f"requests/s {len(latencies) / args.seconds:,.1f}   errors {errors}")
+    if latencies:
+        print(f"p50 {statistics.median(latencies) * 1000:.1f} ms   "
+              f"p99 {latencies[int(len(latencies) * 0.99) - 1] * 1000:.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', help='load-test a running server instead of the in-process app')
+    parser.add_argument('--concurrency', type=int, default=64, help='concurrent clients (live mode)')
+    parser.add_argument('--threads', type=int, default=8, help='request threads (in-process mode)')
+    parser.add_argument('--latency-ms', type=float, default=20.0, help='simulated PostgREST latency')
+    parser.add_argument('--seconds', type=float, default=5.0, help='duration per run')
+    args = parser.parse_args()
+    live(args) if args.url else in_process(args)
+
+
+if __name__ == '__main__':
+    main()
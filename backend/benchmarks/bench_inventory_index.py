@@ -0,0 +1,102 @@
+"""
+Compares inventory search latency between the in-memory columnar index and
+the PostgREST query path.
+
+    python benchmarks/bench_inventory_index.py --rows 50000
+    python benchmarks/bench_inventory_index.py --live   # also time PostgREST (reads db.env)
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.services.filters import apply_vehicle_filters  # noqa: E402
+from app.services.inventory_index import InventorySnapshot  # noqa: E402
+from app.services.pagination import apply_keyset  # noqa: E402
+
+MAKES = ['Toyota', 'Honda', 'Ford', 'Tesla', 'BMW', 'Audi', 'Kia', 'Mazda', 'Subaru', 'Chevrolet']
+BODY_TYPES = ['Sedan', 'SUV', 'Truck', 'Hatchback', 'Coupe', 'Convertible', 'Minivan', 'Wagon']
+FUEL_TYPES = ['Gasoline', 'Diesel', 'Electric', 'Hybrid', 'Plug-in Hybrid']
+
+QUERIES = [
+    ('unfiltered', {}, 'created_at_desc'),
+    ('make', {'make': ['Toyota']}, 'price_asc'),
+    ('make+body+price', {'make': ['Ford', 'Toyota'], 'body_type': ['SUV', 'Truck'], 'price_max': 40000}, 'year_desc'),
+    ('year+fuel', {'year_min': 2020, 'fuel_type': ['Electric', 'Hybrid']}, 'mileage_asc'),
+]
+
+
+def synthetic_vehicles(n, seed=42):
+    """Generates `n` vehicle rows shaped like the `vehicles` table."""
+    rng = random.Random(seed)
+    rows = []
+    for i in range(n):
+        rows.append({
+            'id': str(uuid.UUID(int=rng.getrandbits(128))),
+            'vin': f'SYNTH{i:012d}',
+            'make': rng.choice(MAKES),
+            'model': f'Model {rng.randint(1, 20)}',
+            'year': rng.randint(2010, 2025),
+            'price_current': float(rng.randrange(8000, 120000, 500)),
+            'mileage': rng.randrange(0, 150000, 100),
+            'body_type': rng.choice(BODY_TYPES),
+            'fuel_type': rng.choice(FUEL_TYPES),
+            'transmission': 'Automatic',
+            'exterior_color': 'Black',
+            'is_featured': rng.random() < 0.02,
+            'created_at': f'2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T12:00:00+00:00',
+        })
+    return rows
+
+
+def timeit(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.95) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=20000, help='synthetic vehicles in the index')
+    parser.add_argument('--limit', type=int, default=20, help='page size')
+    parser.add_argument('--repeat', type=int, default=200, help='timed iterations per query')
+    parser.add_argument('--live', action='store_true', help='also time the PostgREST path using db.env')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    snapshot = InventorySnapshot(synthetic_vehicles(args.rows))
+    print(f"Built snapshot of {len(snapshot)} rows in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    supabase = None
+    if args.live:
+        from dotenv import load_dotenv
+        from supabase import create_client
+        load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '..', 'db.env'))
+        supabase = create_client(os.environ['SUPABASE_URL'], os.environ['SUPABASE_KEY'])
+
+    print(f"{'query':<18}{'index p50':>12}{'index p95':>12}{'facets p50':>12}{'postgrest p50':>15}")
+    for name, filters, sort_by in QUERIES:
+        search_p50, search_p95 = timeit(lambda: snapshot.search(filters, sort_by, args.limit), args.repeat)
+        facets_p50, _ = timeit(lambda: snapshot.facets(filters), args.repeat)
+        remote = ''
+        if supabase is not None:
+            def run_remote():
+                query = supabase.table('vehicles').select('*', count='estimated')
+                query = apply_keyset(apply_vehicle_filters(query, filters), sort_by)
+                query.limit(args.limit + 1).execute()
+            remote_p50, _ = timeit(run_remote, max(args.repeat // 10, 5))
+            remote = f"{remote_p50:.2f} ms"
+        print(f"{name:<18}{search_p50:>9.3f} ms{search_p95:>9.3f} ms{facets_p50:>9.3f} ms{remote:>15}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""
+Measures vehicle serialization throughput (rows per second) for the
+per-row Pydantic + stdlib json path against the bulk TypeAdapter and
+trusted-row paths encoded with orjson.
+
+    python benchmarks/bench_serialization.py --rows 5000
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from flask import Flask  # noqa: E402
+
+from app.core.json_provider import OrjsonProvider  # noqa: E402
+from app.models.schemas import Vehicle  # noqa: E402
+from app.services.serialization import dump_vehicles  # noqa: E402
+from bench_inventory_index import synthetic_vehicles  # noqa: E402
+
+
+def per_row_stdlib(rows):
+    validated = [Vehicle.model_validate(v) for v in rows]
+    return json.dumps([v.model_dump(by_alias=True, mode='json') for v in validated], sort_keys=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=5000, help='vehicle rows per batch')
+    parser.add_argument('--repeat', type=int, default=20, help='timed batches per path')
+    args = parser.parse_args()
+
+    rows = synthetic_vehicles(args.rows)
+    provider = OrjsonProvider(Flask(__name__))
+
+    paths = [
+        ('per-row model + json', lambda: per_row_stdlib(rows)),
+        ('TypeAdapter + orjson', lambda: provider.dumps(dump_vehicles(rows, trusted=False))),
+        ('trusted + orjson', lambda: provider.dumps(dump_vehicles(rows, trusted=True))),
+    ]
+
+    baseline = None
+    print(f"{'path':<24}{'rows/s':>14}{'speedup':>10}")
+    for name, fn in paths:
+        fn()  # warm up
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            fn()
+        rate = args.rows * args.repeat / (time.perf_counter() - start)
+        baseline = baseline or rate
+        print(f"{name:<24}{rate:>14,.0f}{rate / baseline:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,157 @@
+"""
+Startup benchmark: import time, app construction, preload and warmup cost,
+and the latency of a fresh process's first requests.
+
+Each run starts a new interpreter so import and first-use costs are real.
+Supabase clients are really constructed (which is where the HTTP/2 and async
+stacks get imported) but query the fake database from fake_supabase.py, so
+no network is needed. Two modes are compared:
+
+    cold     create_app, then serve: the first request pays for client
+             construction, lazy imports, connection and cache fills
+    warm     create_app + preload (done once in the gunicorn master), then
+             warm_up (done per worker after fork), then serve
+
+    python benchmarks/bench_startup.py --runs 5 --latency-ms 20
+
+The import of app.main plus create_app is checked against --budget-ms; the
+run exits non-zero when the median exceeds it. --top N lists the slowest
+imports (from python -X importtime).
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BACKEND = os.path.join(HERE, '..')
+
+PATHS = ['/api/v1/offers/', '/api/v1/inventory/featured', '/api/v1/inventory/search?limit=20']
+
+
+def probe(mode, latency, rows):
+    """Runs inside the child interpreter; prints one JSON line of timings (ms)."""
+    started = time.perf_counter()
+    sys.path.insert(0, BACKEND)
+    sys.path.insert(0, HERE)
+
+    def lap(since):
+        return round((time.perf_counter() - since) * 1000, 1)
+
+    t = time.perf_counter()
+    from app.main import create_app
+    timings = {'import': lap(t)}
+
+    t = time.perf_counter()
+    app = create_app()
+    timings['create_app'] = lap(t)
+
+    from app.core.db import SupabasePool
+    from fake_supabase import FakeDatabase, FakeSupabase
+
+    db = FakeDatabase.seeded(rows=rows)
+
+    class FakeBackedPool(SupabasePool):
+        """Builds real Supabase clients but answers queries from the fake database."""
+
+        def _create(self):
+            super()._create()
+            return FakeSupabase(db, latency, anon_key=self.key)
+
+    pool = FakeBackedPool(app.config['SUPABASE_URL'], app.config['SUPABASE_KEY'],
+                          size=app.config.get('SUPABASE_POOL_SIZE', 10))
+    app.extensions['supabase_pool'] = pool
+    ready = time.perf_counter()
+
+    if mode == 'warm':
+        from app.core.startup import preload, warm_up
+        t = time.perf_counter()
+        preload(app)
+        timings['preload'] = lap(t)
+        # Everything before this point happens once in the gunicorn master.
+        pool._reset()
+        ready = time.perf_counter()
+        warm_up(app)
+        timings['warm_up'] = lap(ready)
+
+    client = app.test_client()
+    for i, path in enumerate(PATHS):
+        t = time.perf_counter()
+        response = client.get(path)
+        assert response.status_code == 200, response.get_data(as_text=True)
+        timings[f'request_{i + 1}'] = lap(t)
+    timings['worker_ready_to_served'] = lap(ready)
+    timings['process_total'] = lap(started)
+    print(json.dumps(timings))
+
+
+def run_probe(mode, args):
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE='1')
+    output = subprocess.run(
+        [sys.executable, __file__, '--probe', mode,
+         '--latency-ms', str(args.latency_ms), '--rows', str(args.rows)],
+        capture_output=True, text=True, check=True, cwd=BACKEND, env=env,
+    ).stdout
+    # Warmup logs a line of its own; the timings are the last line.
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def slowest_imports(top):
+    stderr = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import app.main; app.main.create_app()'],
+        capture_output=True, text=True, cwd=BACKEND,
+    ).stderr
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        _, cumulative_us, name = line[len('import time:'):].split('|')
+        if cumulative_us.strip().isdigit():
+            entries.append((int(cumulative_us), name.strip()))
+    print(f"\n{'slowest imports (cumulative)':<40}{'ms':>8}")
+    for cumulative_us, name in sorted(entries, reverse=True)[:top]:
+        print(f"{name:<40}{cumulative_us / 1000:>8.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5, help='fresh processes per mode')
+    parser.add_argument('--latency-ms', type=float, default=20.0, help='simulated Supabase round trip')
+    parser.add_argument('--rows', type=int, default=500, help='synthetic vehicles in the fake database')
+    parser.add_argument('--budget-ms', type=float, default=1500.0, help='budget for import + create_app')
+    parser.add_argument('--top', type=int, default=0, help='also list the N slowest imports')
+    parser.add_argument('--probe', choices=('cold', 'warm'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.probe:
+        probe(args.probe, args.latency_ms / 1000, args.rows)
+        return
+
+    results = {mode: [run_probe(mode, args) for _ in range(args.runs)] for mode in ('cold', 'warm')}
+    columns = ['import', 'create_app', 'preload', 'warm_up', 'request_1', 'request_2', 'request_3',
+               'worker_ready_to_served']
+    print(f"median of {args.runs} runs, ms")
+    print(f"{'':<24}" + ''.join(f"{mode:>10}" for mode in results))
+    for column in columns:
+        cells = []
+        for runs in results.values():
+            values = [r[column] for r in runs if column in r]
+            cells.append(f"{statistics.median(values):>10.1f}" if values else f"{'-':>10}")
+        print(f"{column:<24}" + ''.join(cells))
+
+    startup = statistics.median(r['import'] + r['create_app'] for runs in results.values() for r in runs)
+    within = startup <= args.budget_ms
+    print(f"\nimport + create_app {startup:.1f} ms (budget {args.budget_ms:.0f} ms): "
+          f"{'ok' if within else 'OVER BUDGET'}")
+
+    if args.top:
+        slowest_imports(args.top)
+    if not within:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
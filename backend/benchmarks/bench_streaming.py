@@ -0,0 +1,115 @@
+"""
+Measures how many concurrent live-event subscribers one worker's EventHub can
+serve. Each subscriber is a thread consuming its own Subscription, as a
+streaming request would; a publisher emits bid events at a fixed rate.
+Reports delivery latency percentiles, publish cost per publish call and how
+many slow subscribers were reset by backpressure, per subscriber count.
+
+    python benchmarks/bench_streaming.py --subscribers 100,1000,3000 --rate 200
+    python benchmarks/bench_streaming.py --batch 20   # coalesced, as the change feed publishes
+"""
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.services.streaming import EventHub  # noqa: E402
+
+
+def run(subscriber_count, args):
+    hub = EventHub(buffer_size=args.buffer, max_subscribers=subscriber_count)
+    vehicles = [str(uuid.uuid4()) for _ in range(args.vehicles)]
+    latencies, lock = [], threading.Lock()
+    resets = 0
+    stop = threading.Event()
+    ready = threading.Barrier(subscriber_count + 1)
+
+    def subscriber(index):
+        nonlocal resets
+        # Every tenth subscriber watches a single vehicle, the rest watch everything.
+        watch = {vehicles[index % len(vehicles)]} if index % 10 == 0 else None
+        subscription = hub.subscribe(vehicle_ids=watch, heartbeat=0.2)
+        slow = index < subscriber_count * args.slow_fraction
+        ready.wait()
+        local = []
+        try:
+            for event in subscription:
+                if stop.is_set():
+                    break
+                if event is None:
+                    continue
+                if event['type'] == 'reset':
+                    with lock:
+                        resets += 1
+                    break
+                local.append(time.perf_counter() - event['data']['sent'])
+                if slow:
+                    time.sleep(0.05)  # a client on a congested connection
+        finally:
+            subscription.close()
+            with lock:
+                latencies.extend(local)
+
+    threads = [threading.Thread(target=subscriber, args=(i,), daemon=True) for i in range(subscriber_count)]
+    for t in threads:
+        t.start()
+    ready.wait()
+
+    interval = args.batch / args.rate
+    publish_time, published, calls = 0.0, 0, 0
+    deadline = time.perf_counter() + args.seconds
+    next_at = time.perf_counter()
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        events = []
+        for _ in range(args.batch):
+            vehicle_id = vehicles[published % len(vehicles)]
+            events.append({'id': published, 'type': 'bid', 'vehicle_id': vehicle_id,
+                           'data': {'vehicle_id': vehicle_id, 'amount': 1000 + published, 'sent': start}})
+            published += 1
+        hub.publish_many(events)
+        publish_time += time.perf_counter() - start
+        calls += 1
+        next_at += interval
+        time.sleep(max(0.0, next_at - time.perf_counter()))
+
+    stop.set()
+    for t in threads:
+        t.join(timeout=5)
+
+    latencies.sort()
+    return {
+        'delivered/s': len(latencies) / args.seconds,
+        'p50 ms': statistics.median(latencies) * 1000 if latencies else 0.0,
+        'p99 ms': latencies[int(len(latencies) * 0.99) - 1] * 1000 if latencies else 0.0,
+        'publish us': publish_time / max(calls, 1) * 1e6,
+        'resets': resets,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--subscribers', default='100,1000,3000', help='comma-separated subscriber counts')
+    parser.add_argument('--rate', type=float, default=200, help='events published per second')
+    parser.add_argument('--seconds', type=float, default=5.0, help='duration per run')
+    parser.add_argument('--vehicles', type=int, default=50, help='distinct vehicles in the event stream')
+    parser.add_argument('--batch', type=int, default=1,
+                        help='events per publish (the change feed publishes each poll as one batch)')
+    parser.add_argument('--buffer', type=int, default=1024, help='hub ring buffer size')
+    parser.add_argument('--slow-fraction', type=float, default=0.01, help='share of deliberately slow subscribers')
+    args = parser.parse_args()
+
+    columns = ['delivered/s', 'p50 ms', 'p99 ms', 'publish us', 'resets']
+    print(f"{'subscribers':>12}" + ''.join(f'{c:>14}' for c in columns))
+    for count in (int(c) for c in args.subscribers.split(',')):
+        result = run(count, args)
+        print(f"{count:>12}" + ''.join(f'{result[c]:>14,.1f}' for c in columns))
+
+
+if __name__ == '__main__':
+    main()
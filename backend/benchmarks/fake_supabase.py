@@ -0,0 +1,702 @@
+"""
+An in-process stand-in for the parts of the Supabase client the API uses:
+PostgREST table queries (select with embedded resources, filters including
+`or` logic trees, ordering, paging and counts; insert/update/delete), the RPC
+functions from migrations/, and `auth.get_user`. Every `execute()` sleeps for
+an injected latency, so benchmarks can model the network round trip.
+
+The database starts from migrations/seed.sql and can be scaled with synthetic
+vehicles (and media, offers and bids for them):
+
+    db = FakeDatabase.seeded(rows=5000)
+    app.extensions['supabase_pool'] = FakePool(db, latency=0.005)
+
+Row-level security is approximated for the anon and authenticated roles
+(visible vehicles, currently active offers); staff and admin see everything.
+It is a benchmarking aid, not a PostgREST reimplementation.
+"""
+import copy
+import os
+import random
+import re
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import jwt
+
+from bench_inventory_index import synthetic_vehicles
+
+SEED_PATH = os.path.join(os.path.dirname(__file__), '..', 'migrations', 'seed.sql')
+SEED_CREATED_AT = '2025-09-01T12:00:00+00:00'
+
+# Embedded resource name -> foreign key column on the embedding table.
+FOREIGN_KEYS = {'vehicles': 'vehicle_id', 'profiles': 'user_id', 'locations': 'location_id'}
+
+VEHICLE_DEFAULTS = {
+    'status': 'Available', 'visible': True, 'condition': 'Used', 'is_featured': False,
+    'is_special_offer': False, 'is_certified': False, 'mileage': 0, 'fuel_type': 'Gasoline',
+    'created_at': SEED_CREATED_AT, 'updated_at': SEED_CREATED_AT,
+}
+
+
+class FakeAPIError(Exception):
+    """Raised for requests the stand-in cannot serve, like postgrest's APIError."""
+
+
+def _now():
+    return datetime.now(timezone.utc)
+
+
+# --- seed.sql --------------------------------------------------------------
+
+_INSERT = re.compile(r"INSERT INTO (?:public\.)?(\w+)\s*\(([^)]*)\)\s*VALUES\s*(.*?);", re.S | re.I)
+_TOKEN = re.compile(r"\s*(?:('(?:[^']|'')*')|(ARRAY\[)|(\])|(\()|(\))|(,)|([^\s,()\[\]]+))")
+
+
+def _parse_values(text):
+    """Parses `(a, 'b', ARRAY['c']), (...)` into a list of row tuples."""
+    rows, stack, pos = [], [], 0
+    while pos < len(text):
+        match = _TOKEN.match(text, pos)
+        if not match or match.end() == pos:
+            break
+        pos = match.end()
+        string, array, close_array, open_row, close_row, _, literal = match.groups()
+        if open_row or array:
+            stack.append([])
+        elif close_row or close_array:
+            values = stack.pop()
+            if stack:
+                stack[-1].append(values)
+            else:
+                rows.append(values)
+        elif string is not None:
+            stack[-1].append(string[1:-1].replace("''", "'"))
+        elif literal is not None:
+            upper = literal.upper()
+            if upper == 'NULL':
+                value = None
+            elif upper in ('TRUE', 'FALSE'):
+                value = upper == 'TRUE'
+            else:
+                try:
+                    value = int(literal)
+                except ValueError:
+                    value = float(literal)
+            stack[-1].append(value)
+    return rows
+
+
+def load_seed(path=SEED_PATH):
+    """Returns {table: [row dicts]} from the INSERT statements in a seed file."""
+    with open(path) as f:
+        sql = re.sub(r'--[^\n]*', '', f.read())
+    tables = {}
+    for table, columns, values in _INSERT.findall(sql):
+        names = [c.strip() for c in columns.split(',')]
+        tables.setdefault(table, []).extend(dict(zip(names, row)) for row in _parse_values(values))
+    return tables
+
+
+# --- query evaluation --------------------------------------------------------
+
+def _split_top_level(text, sep=','):
+    parts, depth, quoted, current = [], 0, False, ''
+    for i, char in enumerate(text):
+        if char == '"' and (i == 0 or text[i - 1] != '\\'):
+            quoted = not quoted
+        elif not quoted and char == '(':
+            depth += 1
+        elif not quoted and char == ')':
+            depth -= 1
+        if char == sep and depth == 0 and not quoted:
+            parts.append(current)
+            current = ''
+        else:
+            current += char
+    if current:
+        parts.append(current)
+    return parts
+
+
+def _unquote(value):
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        return value[1:-1].replace('\\"', '"').replace('\\\\', '\\')
+    return value
+
+
+def _coerce(value, like):
+    """Converts a filter value to the type of the column value it is compared with."""
+    if value is None or like is None or isinstance(value, type(like)):
+        return value
+    if isinstance(like, bool):
+        return str(value).lower() == 'true'
+    if isinstance(like, (int, float)):
+        return float(value)
+    return str(value)
+
+
+def _compare(op, actual, expected):
+    if op == 'is':
+        wanted = None if str(expected).lower() == 'null' else str(expected).lower() == 'true'
+        return actual is wanted
+    if op == 'in':
+        if actual is None:
+            return False
+        if not isinstance(expected, frozenset):
+            expected = frozenset(str(v) for v in expected)
+        return str(actual) in expected
+    if actual is None or expected is None:
+        return False
+    expected = _coerce(expected, actual)
+    if op == 'eq':
+        return actual == expected
+    if op == 'neq':
+        return actual != expected
+    if op == 'gt':
+        return actual > expected
+    if op == 'gte':
+        return actual >= expected
+    if op == 'lt':
+        return actual < expected
+    if op == 'lte':
+        return actual <= expected
+    if op in ('like', 'ilike'):
+        pattern = re.escape(str(expected)).replace('%', '.*').replace(r'\*', '.*')
+        return re.fullmatch(pattern, str(actual), re.I if op == 'ilike' else 0) is not None
+    raise FakeAPIError(f"Unsupported operator: {op}")
+
+
+def _logic_tree(expression):
+    """Compiles a PostgREST `or`/`and` expression into a row predicate."""
+    predicates = []
+    for term in _split_top_level(expression):
+        term = term.strip()
+        for joiner in ('and', 'or'):
+            if term.startswith(f'{joiner}(') and term.endswith(')'):
+                inner = _logic_tree(term[len(joiner) + 1:-1])
+                predicates.append(inner if joiner == 'or' else (lambda row, p=inner.parts: all(f(row) for f in p)))
+                break
+        else:
+            column, rest = term.split('.', 1)
+            negate = rest.startswith('not.')
+            if negate:
+                rest = rest[len('not.'):]
+            op, value = rest.split('.', 1)
+            if op == 'in':
+                value = [_unquote(v) for v in _split_top_level(value[1:-1])]
+            else:
+                value = _unquote(value)
+            predicates.append(
+                lambda row, c=column, o=op, v=value, n=negate: _compare(o, row.get(c), v) != n
+            )
+
+    def any_of(row):
+        return any(p(row) for p in predicates)
+    any_of.parts = predicates
+    return any_of
+
+
+def _parse_select(select):
+    """Returns ([columns], {embedded table: (inner join?, [columns])})."""
+    columns, embeds = [], {}
+    for item in _split_top_level(select.replace(' ', '')):
+        match = re.fullmatch(r'(\w+)(!inner)?\((.*)\)', item)
+        if match:
+            embeds[match.group(1)] = (bool(match.group(2)), _split_top_level(match.group(3)))
+        elif item:
+            columns.append(item)
+    return columns, embeds
+
+
+class _Result:
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+
+class FakeQuery:
+    """A PostgREST request builder evaluated against `FakeDatabase` tables."""
+
+    def __init__(self, client, table):
+        self.client = client
+        self.table_name = table
+        self.action = 'select'
+        self.columns, self.embeds = ['*'], {}
+        self.count_strategy = None
+        self.filters = []          # (column or 'table.column', predicate)
+        self.orders = []
+        self.start, self.stop = 0, None
+        self.single_row = self.maybe_single_row = False
+        self.payload = None
+        self.on_conflict = None
+
+    # Builders -------------------------------------------------------------
+
+    def select(self, columns='*', count=None):
+        self.columns, self.embeds = _parse_select(columns)
+        self.count_strategy = count
+        return self
+
+    def insert(self, rows, **kwargs):
+        self.action, self.payload = 'insert', rows
+        return self
+
+    def upsert(self, rows, on_conflict=None, ignore_duplicates=False, **kwargs):
+        self.action, self.payload = 'upsert', rows
+        self.on_conflict = (on_conflict or 'id', ignore_duplicates)
+        return self
+
+    def update(self, values, **kwargs):
+        self.action, self.payload = 'update', values
+        return self
+
+    def delete(self, **kwargs):
+        self.action = 'delete'
+        return self
+
+    def _filter(self, column, op, value):
+        self.filters.append((column, lambda row, c=column.split('.')[-1]: _compare(op, row.get(c), value)))
+        return self
+
+    def eq(self, column, value):
+        return self._filter(column, 'eq', value)
+
+    def neq(self, column, value):
+        return self._filter(column, 'neq', value)
+
+    def gt(self, column, value):
+        return self._filter(column, 'gt', value)
+
+    def gte(self, column, value):
+        return self._filter(column, 'gte', value)
+
+    def lt(self, column, value):
+        return self._filter(column, 'lt', value)
+
+    def lte(self, column, value):
+        return self._filter(column, 'lte', value)
+
+    def like(self, column, value):
+        return self._filter(column, 'like', value)
+
+    def ilike(self, column, value):
+        return self._filter(column, 'ilike', value)
+
+    def is_(self, column, value):
+        return self._filter(column, 'is', value)
+
+    def in_(self, column, values):
+        return self._filter(column, 'in', frozenset(str(v) for v in values))
+
+    def or_(self, expression, reference_table=None):
+        predicate = _logic_tree(expression)
+        self.filters.append((f'{reference_table}.' if reference_table else '', predicate))
+        return self
+
+    def order(self, column, desc=False, nullsfirst=None, foreign_table=None, referenced_table=None):
+        if not (foreign_table or referenced_table):
+            # Ordering an embedded to-one resource does not reorder the parent rows.
+            self.orders.append((column, desc, desc if nullsfirst is None else nullsfirst))
+        return self
+
+    def limit(self, size, foreign_table=None):
+        self.stop = self.start + size
+        return self
+
+    def offset(self, size):
+        size_left = None if self.stop is None else self.stop - self.start
+        self.start = size
+        self.stop = None if size_left is None else size + size_left
+        return self
+
+    def range(self, start, end, foreign_table=None):
+        self.start, self.stop = start, end + 1
+        return self
+
+    def single(self):
+        self.single_row = True
+        return self
+
+    def maybe_single(self):
+        self.maybe_single_row = True
+        return self
+
+    # Evaluation -----------------------------------------------------------
+
+    def _embed(self, row, targets):
+        """Attaches embedded resources; returns None if an inner join drops the row."""
+        if not self.embeds:
+            return row
+        out = dict(row)
+        for name, (inner, columns) in self.embeds.items():
+            key = FOREIGN_KEYS.get(name)
+            target = targets[name].get(row.get(key)) if key else None
+            scoped = [p for c, p in self.filters if c.startswith(f'{name}.')]
+            if target is not None and not all(p(target) for p in scoped):
+                target = None
+            if target is None and inner:
+                return None
+            out[name] = None if target is None else (
+                dict(target) if '*' in columns else {c: target.get(c) for c in columns}
+            )
+        return out
+
+    def _matching(self):
+        rows = []
+        targets = {name: self.client.visible_rows_by_id(name) for name in self.embeds}
+        for row in self.client.visible_rows(self.table_name):
+            if not all(p(row) for c, p in self.filters if '.' not in c):
+                continue
+            embedded = self._embed(row, targets)
+            if embedded is not None:
+                rows.append((row, embedded))
+        return rows
+
+    def _sorted(self, rows):
+        for column, desc, nulls_first in reversed(self.orders):
+            present = [r for r in rows if r[1].get(column) is not None]
+            nulls = [r for r in rows if r[1].get(column) is None]
+            present.sort(key=lambda r: r[1][column], reverse=desc)
+            rows = nulls + present if nulls_first else present + nulls
+        return rows
+
+    def _project(self, row):
+        if '*' in self.columns:
+            out = dict(row)
+        else:
+            out = {c: row.get(c) for c in self.columns}
+        out.update({name: row[name] for name in self.embeds if name in row})
+        return out
+
+    def _write(self):
+        db = self.client.db
+        with db.lock:
+            table = db.tables.setdefault(self.table_name, [])
+            if self.action in ('insert', 'upsert'):
+                payload = self.payload if isinstance(self.payload, list) else [self.payload]
+                written = []
+                for values in payload:
+                    row = {'id': str(uuid.uuid4()), 'created_at': _now().isoformat(), **copy.deepcopy(values)}
+                    if self.action == 'upsert':
+                        keys, ignore = self.on_conflict
+                        keys = keys.split(',')
+                        existing = next((r for r in table if all(r.get(k) == row.get(k) for k in keys)), None)
+                        if existing is not None:
+                            if not ignore:
+                                existing.update(values)
+                                written.append(dict(existing))
+                            continue
+                    table.append(row)
+                    written.append(dict(row))
+                return written
+            matched = {id(row) for row, _ in self._matching()}
+            if self.action == 'update':
+                written = []
+                for row in table:
+                    if id(row) in matched:
+                        row.update(copy.deepcopy(self.payload))
+                        if 'updated_at' in row:
+                            row['updated_at'] = _now().isoformat()
+                        written.append(dict(row))
+                return written
+            deleted = [dict(row) for row in table if id(row) in matched]
+            db.tables[self.table_name] = [row for row in table if id(row) not in matched]
+            return deleted
+
+    def execute(self):
+        self.client.round_trip()
+        if self.action != 'select':
+            return _Result(self._write())
+
+        rows = self._sorted(self._matching())
+        count = len(rows) if self.count_strategy else None
+        rows = [self._project(embedded) for _, embedded in rows[self.start:self.stop]]
+        if self.single_row:
+            if len(rows) != 1:
+                raise FakeAPIError(f"JSON object requested, multiple (or no) rows returned ({len(rows)})")
+            return _Result(rows[0], count)
+        if self.maybe_single_row:
+            return _Result(rows[0] if rows else None, count) if rows else None
+        return _Result(rows, count)
+
+
+# --- RPC functions -----------------------------------------------------------
+
+def _words(text):
+    return [w for w in re.split(r'[^0-9a-z]+', text.lower()) if w]
+
+
+def _text_rank(query, text):
+    """Prefix-matches every query word against `text`; returns a rank or 0."""
+    words = _words(text)
+    terms = _words(query)
+    if not terms or not all(any(w.startswith(t) for w in words) for t in terms):
+        return 0.0
+    return sum(1.0 for t in terms if t in words) + 0.5
+
+
+def _vehicle_text(vehicle):
+    return ' '.join(str(vehicle.get(c) or '') for c in ('make', 'model', 'trim', 'year'))
+
+
+def rpc_vehicle_facet_counts(client, params):
+    ids = set(map(str, params.get('p_vehicle_ids') or [])) if params.get('p_vehicle_ids') is not None else None
+    base = [
+        v for v in client.visible_rows('vehicles')
+        if (params.get('p_year_min') is None or v['year'] >= params['p_year_min'])
+        and (params.get('p_price_max') is None or v['price_current'] <= params['p_price_max'])
+        and (ids is None or str(v['id']) in ids)
+    ]
+    filters = {'make': params.get('p_makes'), 'body_type': params.get('p_body_types'),
+               'fuel_type': params.get('p_fuel_types')}
+    names = {'make': 'make', 'body_type': 'bodyType', 'fuel_type': 'fuelType'}
+    out = []
+    for column, facet in names.items():
+        counts = {}
+        for v in base:
+            if v.get(column) is None:
+                continue
+            if all(wanted is None or v.get(c) in wanted for c, wanted in filters.items() if c != column):
+                counts[v[column]] = counts.get(v[column], 0) + 1
+        out.extend({'facet': facet, 'value': value, 'count': n} for value, n in counts.items())
+    return out
+
+
+def rpc_search_vehicles_ranked(client, params):
+    ranked = [
+        {'id': v['id'], 'rank': rank} for v in client.visible_rows('vehicles')
+        if (rank := _text_rank(params['p_query'], _vehicle_text(v)))
+    ]
+    ranked.sort(key=lambda r: (-r['rank'], r['id']))
+    return ranked[:params.get('p_limit', 200)]
+
+
+def rpc_search_gallery_media(client, params):
+    vehicles = client.visible_rows_by_id('vehicles')
+    ranked = []
+    for m in client.visible_rows('vehicle_media'):
+        vehicle = vehicles.get(m.get('vehicle_id'))
+        if vehicle is None:
+            continue
+        rank = max(_text_rank(params['p_query'], m.get('alt_text') or ''),
+                   _text_rank(params['p_query'], _vehicle_text(vehicle)))
+        if rank:
+            ranked.append({'id': m['id'], 'rank': rank})
+    ranked.sort(key=lambda r: (-r['rank'], r['id']))
+    return ranked[:params.get('p_limit', 200)]
+
+
+def rpc_next_offer_start(client, params):
+    now = _now().isoformat()
+    starts = [o['start_date'] for o in client.db.tables.get('offers', [])
+              if o.get('is_active') and o['start_date'] > now and o['end_date'] > o['start_date']]
+    return min(starts, default=None)
+
+
+def rpc_vehicle_bids(client, params):
+    tables = client.db.tables
+    names = {p['id']: p.get('full_name') for p in tables.get('profiles', [])}
+    staff = client.role in ('staff', 'admin')
+    bids = sorted((b for b in tables.get('bids', []) if b['vehicle_id'] == params['p_vehicle_id']),
+                  key=lambda b: (-float(b['amount']), b['created_at']))
+    limit = min(max(params.get('p_limit') or 50, 1), 200)
+    rows = []
+    for b in bids[:limit]:
+        shown = staff or b['user_id'] == client.user_id
+        rows.append({'id': b['id'], 'amount': b['amount'], 'created_at': b['created_at'],
+                     'user_id': b['user_id'] if shown else None,
+                     'user_full_name': names.get(b['user_id']) if shown else None})
+    return rows
+
+
+def rpc_site_stats(client, params):
+    tables = client.db.tables
+    now = _now().isoformat()
+    return {
+        'cars_sold': sum(1 for v in tables.get('vehicles', []) if v.get('status') == 'Sold'),
+        'vehicles_available': sum(1 for v in tables.get('vehicles', [])
+                                  if v.get('status') == 'Available' and v.get('visible')),
+        'bids_placed': len(tables.get('bids', [])),
+        'active_offers': sum(1 for o in tables.get('offers', [])
+                             if o.get('is_active') and o['start_date'] <= now <= o['end_date']),
+        'computed_at': now,
+    }
+
+
+RPC_FUNCTIONS = {
+    'vehicle_facet_counts': rpc_vehicle_facet_counts,
+    'search_vehicles_ranked': rpc_search_vehicles_ranked,
+    'search_gallery_media': rpc_search_gallery_media,
+    'next_offer_start': rpc_next_offer_start,
+    'site_stats': rpc_site_stats,
+    'vehicle_bids': rpc_vehicle_bids,
+}
+
+
+class FakeRPC:
+    def __init__(self, client, name, params):
+        self.client, self.name, self.params = client, name, params or {}
+
+    def execute(self):
+        self.client.round_trip()
+        function = RPC_FUNCTIONS.get(self.name)
+        if function is None:
+            raise FakeAPIError(f"Could not find the function public.{self.name}")
+        return _Result(function(self.client, self.params))
+
+
+# --- clients -----------------------------------------------------------------
+
+class FakeDatabase:
+    """Tables as lists of row dicts, shared by every client of a `FakePool`."""
+
+    def __init__(self, tables=None):
+        self.tables = tables or {}
+        self.lock = threading.Lock()
+
+    @classmethod
+    def seeded(cls, rows=0, seed=42, seed_path=SEED_PATH):
+        """
+        Loads seed.sql, then adds `rows` synthetic vehicles with one to three
+        media items each, a few bids, and a handful of current offers.
+        """
+        rng = random.Random(seed)
+        tables = load_seed(seed_path)
+        for vehicle in tables.get('vehicles', []):
+            vehicle.setdefault('id', str(uuid.uuid5(uuid.NAMESPACE_URL, vehicle['vin'])))
+        tables['vehicles'] = [{**VEHICLE_DEFAULTS, **v} for v in tables.get('vehicles', []) + synthetic_vehicles(rows, seed)]
+
+        media, bids = [], []
+        customers = [p['id'] for p in tables.get('profiles', []) if p.get('role') == 'customer']
+        for vehicle in tables['vehicles']:
+            for position in range(rng.randint(1, 3)):
+                media.append({
+                    'id': str(uuid.UUID(int=rng.getrandbits(128))),
+                    'vehicle_id': vehicle['id'], 'media_type': 'image',
+                    'url': f"https://cdn.example.com/{vehicle['id']}/{position}.jpg",
+                    'thumbnail_url': None, 'position': position, 'is_primary': position == 0,
+                    'alt_text': f"{vehicle['year']} {vehicle['make']} {vehicle['model']}",
+                    'created_at': vehicle['created_at'],
+                })
+            if customers and rng.random() < 0.1:
+                bids.append({'id': str(uuid.uuid4()), 'vehicle_id': vehicle['id'], 'user_id': customers[0],
+                             'amount': vehicle['price_current'], 'created_at': vehicle['created_at']})
+        now = _now()
+        offers = [{
+            'id': str(uuid.UUID(int=rng.getrandbits(128))), 'title': f'Offer {i}',
+            'description': 'Limited-time deal', 'promo_type': 'deal', 'terms_md': None,
+            'start_date': (now - timedelta(days=7)).isoformat(),
+            'end_date': (now + timedelta(days=7 + i)).isoformat(),
+            'is_active': True, 'created_at': SEED_CREATED_AT, 'updated_at': SEED_CREATED_AT,
+        } for i in range(5)]
+        tables.update({'vehicle_media': media, 'bids': bids, 'offers': offers})
+        return cls(tables)
+
+
+class _Postgrest:
+    def __init__(self, client):
+        self.client = client
+
+    def auth(self, token):
+        self.client.set_token(token)
+
+
+class _User:
+    def __init__(self, claims):
+        self.id = claims['sub']
+        self.email = claims.get('email')
+        self.role = claims.get('role', 'authenticated')
+        self.user_metadata = claims.get('user_metadata', {})
+
+
+class _UserResponse:
+    def __init__(self, user):
+        self.user = user
+
+
+class FakeAuth:
+    def __init__(self, client):
+        self.client = client
+
+    def get_user(self, jwt_token=None):
+        self.client.round_trip()
+        claims = jwt.decode(jwt_token, options={'verify_signature': False, 'verify_aud': False})
+        return _UserResponse(_User(claims))
+
+
+class FakeSupabase:
+    """One client of a `FakePool`: a Supabase-like facade over a `FakeDatabase`."""
+
+    def __init__(self, db, latency=0.0, jitter=0.0, anon_key='anon'):
+        self.db = db
+        self.latency = latency
+        self.jitter = jitter
+        self.anon_key = anon_key
+        self.postgrest = _Postgrest(self)
+        self.auth = FakeAuth(self)
+        self.set_token(anon_key)
+
+    def set_token(self, token):
+        self.user_id, self.role = None, 'anon'
+        if token and token != self.anon_key:
+            claims = jwt.decode(token, options={'verify_signature': False, 'verify_aud': False})
+            self.user_id = claims.get('sub')
+            profile = next((p for p in self.db.tables.get('profiles', []) if p['id'] == self.user_id), None)
+            self.role = (profile or {}).get('role', 'authenticated')
+
+    def round_trip(self):
+        if self.latency or self.jitter:
+            time.sleep(self.latency + random.uniform(0, self.jitter))
+
+    def visible_rows(self, table):
+        """Rows of `table` that RLS shows this client's role."""
+        rows = self.db.tables.get(table, [])
+        if self.role in ('staff', 'admin'):
+            return rows
+        if table == 'vehicles':
+            return [v for v in rows if v.get('visible')]
+        if table == 'offers':
+            now = _now().isoformat()
+            return [o for o in rows if o.get('is_active') and o['start_date'] <= now <= o['end_date']]
+        if table in ('profiles', 'bids'):
+            key = 'id' if table == 'profiles' else 'user_id'
+            return [row for row in rows if row[key] == self.user_id]
+        return rows
+
+    def visible_rows_by_id(self, table):
+        return {row['id']: row for row in self.visible_rows(table)}
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+    def from_(self, name):
+        return self.table(name)
+
+    def rpc(self, name, params=None):
+        return FakeRPC(self, name, params)
+
+
+class FakePool:
+    """A `SupabasePool` replacement handing out `FakeSupabase` clients."""
+
+    def __init__(self, db, latency=0.0, jitter=0.0, size=10):
+        self.db = db
+        self.latency = latency
+        self.jitter = jitter
+        self.size = size
+        self.checkouts = 0
+
+    def acquire(self, access_token=None):
+        self.checkouts += 1
+        client = FakeSupabase(self.db, self.latency, self.jitter)
+        client.postgrest.auth(access_token or client.anon_key)
+        return client
+
+    def release(self, client):
+        pass
+
+    def stats(self):
+        return {'size': self.size, 'checkouts': self.checkouts, 'latency_ms': self.latency * 1000}
@@ -0,0 +1,58 @@
+"""
+Gunicorn settings, picked up automatically when running `gunicorn`
+from this directory. Every value can be overridden from the environment.
+
+Startup: with GUNICORN_PRELOAD (default on) the app is imported and
+preloaded once in the master and forked into workers; each worker then runs
+the warmup hook (app/core/startup.py) before accepting requests.
+
+Serving modes (GUNICORN_WORKER_CLASS):
+    sync     one request per worker at a time (the default)
+    gthread  GUNICORN_THREADS requests per worker, each on its own thread
+    gevent   opt-in cooperative I/O: a worker serves up to
+             GUNICORN_WORKER_CONNECTIONS requests at once, so throughput is
+             bound by the database rather than by the worker count. Suits the
+             event stream. CPU-bound work (the inventory index and stats
+             refreshers) then runs on greenlets and stalls the worker's other
+             requests while it runs.
+
+gevent must patch the standard library before anything else imports it, so
+it has its own entry point, wsgi_gevent.py. Run plain `gunicorn` (the app is
+picked from the worker class) or name it explicitly:
+
+    GUNICORN_WORKER_CLASS=gevent gunicorn wsgi_gevent:app
+"""
+import gc
+import multiprocessing
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'sync')
+threads = int(os.environ.get('GUNICORN_THREADS', 8 if worker_class == 'gthread' else 1))
+worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', 1000))
+
+# Long-lived event streams only send keep-alives every STREAM_HEARTBEAT_SECONDS,
+# so the timeout must stay well above that for async workers.
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30 if worker_class == 'sync' else 120))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))
+
+wsgi_app = 'wsgi_gevent:app' if worker_class == 'gevent' else 'wsgi:app'
+
+preload_app = os.environ.get('GUNICORN_PRELOAD', 'true').lower() in ('1', 'true', 'yes')
+
+
+def when_ready(server):
+    # Runs in the master after preloading and before the first fork. Freezing
+    # moves everything loaded so far out of the collector's reach, so garbage
+    # collections in workers do not write to (and copy) the shared pages.
+    gc.freeze()
+
+
+def post_worker_init(worker):
+    # Prime connections and caches before this worker accepts requests. The
+    # warmup heartbeats between steps so the arbiter does not kill a worker
+    # that is still warming up against a slow upstream.
+    from app.core.startup import warm_up
+    warm_up(worker.wsgi, notify=worker.notify)
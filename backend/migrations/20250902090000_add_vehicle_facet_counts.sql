@@ -0,0 +1,51 @@
+-- Migration to compute inventory search facets with a single grouped query.
+
+-- Facets are "disjunctive": the counts for each facet are computed with every
+-- active filter applied EXCEPT that facet's own filter, so users can see how
+-- many vehicles they would get by selecting another value of the same facet.
+-- SECURITY INVOKER keeps the vehicles RLS policies in force for the caller.
+CREATE OR REPLACE FUNCTION public.vehicle_facet_counts(
+    p_makes TEXT[] DEFAULT NULL,
+    p_year_min INTEGER DEFAULT NULL,
+    p_price_max NUMERIC DEFAULT NULL,
+    p_body_types TEXT[] DEFAULT NULL,
+    p_fuel_types TEXT[] DEFAULT NULL
+)
+RETURNS TABLE (facet TEXT, value TEXT, count BIGINT)
+LANGUAGE sql
+STABLE
+SECURITY INVOKER
+AS $$
+    WITH base AS (
+        SELECT v.make, v.body_type::TEXT AS body_type, v.fuel_type::TEXT AS fuel_type
+        FROM public.vehicles v
+        WHERE (p_year_min IS NULL OR v.year >= p_year_min)
+          AND (p_price_max IS NULL OR v.price_current <= p_price_max)
+    )
+    SELECT 'make', make, COUNT(*)
+    FROM base
+    WHERE (p_body_types IS NULL OR body_type = ANY(p_body_types))
+      AND (p_fuel_types IS NULL OR fuel_type = ANY(p_fuel_types))
+    GROUP BY make
+    UNION ALL
+    SELECT 'bodyType', body_type, COUNT(*)
+    FROM base
+    WHERE body_type IS NOT NULL
+      AND (p_makes IS NULL OR make = ANY(p_makes))
+      AND (p_fuel_types IS NULL OR fuel_type = ANY(p_fuel_types))
+    GROUP BY body_type
+    UNION ALL
+    SELECT 'fuelType', fuel_type, COUNT(*)
+    FROM base
+    WHERE fuel_type IS NOT NULL
+      AND (p_makes IS NULL OR make = ANY(p_makes))
+      AND (p_body_types IS NULL OR body_type = ANY(p_body_types))
+    GROUP BY fuel_type;
+$$;
+
+GRANT EXECUTE ON FUNCTION public.vehicle_facet_counts(TEXT[], INTEGER, NUMERIC, TEXT[], TEXT[]) TO anon, authenticated;
+
+-- Indexes supporting the facet filters and grouping.
+CREATE INDEX IF NOT EXISTS idx_vehicles_make ON public.vehicles (make);
+CREATE INDEX IF NOT EXISTS idx_vehicles_body_type ON public.vehicles (body_type);
+CREATE INDEX IF NOT EXISTS idx_vehicles_fuel_type ON public.vehicles (fuel_type);
@@ -0,0 +1,137 @@
+-- Migration to replace leading-wildcard ILIKE searches with indexed full-text
+-- and trigram search over vehicles and vehicle media.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- 1. Searchable columns, maintained by Postgres as generated columns.
+
+-- Lower-cased "make model trim year" used for typo-tolerant trigram matching.
+ALTER TABLE public.vehicles
+ADD COLUMN search_text TEXT GENERATED ALWAYS AS (
+    lower(make || ' ' || model || ' ' || coalesce(trim, '') || ' ' || year::TEXT)
+) STORED;
+
+-- The same fields as a tsvector for ranked, prefix-matching full-text search.
+ALTER TABLE public.vehicles
+ADD COLUMN search_vector TSVECTOR GENERATED ALWAYS AS (
+    to_tsvector('simple', make || ' ' || model || ' ' || coalesce(trim, '') || ' ' || year::TEXT)
+) STORED;
+
+ALTER TABLE public.vehicle_media
+ADD COLUMN search_vector TSVECTOR GENERATED ALWAYS AS (
+    to_tsvector('simple', coalesce(alt_text, ''))
+) STORED;
+
+CREATE INDEX idx_vehicles_search_vector ON public.vehicles USING GIN (search_vector);
+CREATE INDEX idx_vehicles_search_text_trgm ON public.vehicles USING GIN (search_text gin_trgm_ops);
+CREATE INDEX idx_vehicle_media_search_vector ON public.vehicle_media USING GIN (search_vector);
+CREATE INDEX idx_vehicle_media_alt_text_trgm ON public.vehicle_media USING GIN (lower(alt_text) gin_trgm_ops);
+
+
+-- 2. Turns free text into a prefix tsquery: 'toyota cam' -> 'toyota':* & 'cam':*
+CREATE OR REPLACE FUNCTION public.prefix_tsquery(p_query TEXT)
+RETURNS TSQUERY
+LANGUAGE sql
+IMMUTABLE
+AS $$
+    SELECT to_tsquery('simple', string_agg(quote_literal(word) || ':*', ' & '))
+    FROM regexp_split_to_table(lower(p_query), '[^[:alnum:]]+') AS word
+    WHERE word <> '';
+$$;
+
+
+-- 3. Ranked search functions. A row matches on a full-text prefix match or,
+-- for typo tolerance, on trigram word similarity. SECURITY INVOKER keeps RLS.
+CREATE OR REPLACE FUNCTION public.search_vehicles_ranked(p_query TEXT, p_limit INTEGER DEFAULT 200)
+RETURNS TABLE (id UUID, rank REAL)
+LANGUAGE sql
+STABLE
+SECURITY INVOKER
+AS $$
+    WITH q AS (
+        SELECT public.prefix_tsquery(p_query) AS tsq, lower(p_query) AS text
+    )
+    SELECT v.id,
+           (ts_rank(v.search_vector, q.tsq) + word_similarity(q.text, v.search_text))::REAL AS rank
+    FROM public.vehicles v, q
+    WHERE v.search_vector @@ q.tsq
+       OR q.text <% v.search_text
+    ORDER BY rank DESC, v.id
+    LIMIT p_limit;
+$$;
+
+CREATE OR REPLACE FUNCTION public.search_gallery_media(p_query TEXT, p_limit INTEGER DEFAULT 200)
+RETURNS TABLE (id UUID, rank REAL)
+LANGUAGE sql
+STABLE
+SECURITY INVOKER
+AS $$
+    WITH q AS (
+        SELECT public.prefix_tsquery(p_query) AS tsq, lower(p_query) AS text
+    )
+    SELECT m.id,
+           GREATEST(
+               ts_rank(m.search_vector, q.tsq) + word_similarity(q.text, coalesce(lower(m.alt_text), '')),
+               ts_rank(v.search_vector, q.tsq) + word_similarity(q.text, v.search_text)
+           )::REAL AS rank
+    FROM public.vehicle_media m
+    JOIN public.vehicles v ON v.id = m.vehicle_id, q
+    WHERE v.visible = true
+      AND (m.search_vector @@ q.tsq
+           OR q.text <% lower(m.alt_text)
+           OR v.search_vector @@ q.tsq
+           OR q.text <% v.search_text)
+    ORDER BY rank DESC, m.id
+    LIMIT p_limit;
+$$;
+
+GRANT EXECUTE ON FUNCTION public.prefix_tsquery(TEXT) TO anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.search_vehicles_ranked(TEXT, INTEGER) TO anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.search_gallery_media(TEXT, INTEGER) TO anon, authenticated;
+
+
+-- 4. Let facet counts be restricted to the vehicles matched by a text search.
+DROP FUNCTION IF EXISTS public.vehicle_facet_counts(TEXT[], INTEGER, NUMERIC, TEXT[], TEXT[]);
+
+CREATE OR REPLACE FUNCTION public.vehicle_facet_counts(
+    p_makes TEXT[] DEFAULT NULL,
+    p_year_min INTEGER DEFAULT NULL,
+    p_price_max NUMERIC DEFAULT NULL,
+    p_body_types TEXT[] DEFAULT NULL,
+    p_fuel_types TEXT[] DEFAULT NULL,
+    p_vehicle_ids UUID[] DEFAULT NULL
+)
+RETURNS TABLE (facet TEXT, value TEXT, count BIGINT)
+LANGUAGE sql
+STABLE
+SECURITY INVOKER
+AS $$
+    WITH base AS (
+        SELECT v.make, v.body_type::TEXT AS body_type, v.fuel_type::TEXT AS fuel_type
+        FROM public.vehicles v
+        WHERE (p_year_min IS NULL OR v.year >= p_year_min)
+          AND (p_price_max IS NULL OR v.price_current <= p_price_max)
+          AND (p_vehicle_ids IS NULL OR v.id = ANY(p_vehicle_ids))
+    )
+    SELECT 'make', make, COUNT(*)
+    FROM base
+    WHERE (p_body_types IS NULL OR body_type = ANY(p_body_types))
+      AND (p_fuel_types IS NULL OR fuel_type = ANY(p_fuel_types))
+    GROUP BY make
+    UNION ALL
+    SELECT 'bodyType', body_type, COUNT(*)
+    FROM base
+    WHERE body_type IS NOT NULL
+      AND (p_makes IS NULL OR make = ANY(p_makes))
+      AND (p_fuel_types IS NULL OR fuel_type = ANY(p_fuel_types))
+    GROUP BY body_type
+    UNION ALL
+    SELECT 'fuelType', fuel_type, COUNT(*)
+    FROM base
+    WHERE fuel_type IS NOT NULL
+      AND (p_makes IS NULL OR make = ANY(p_makes))
+      AND (p_body_types IS NULL OR body_type = ANY(p_body_types))
+    GROUP BY fuel_type;
+$$;
+
+GRANT EXECUTE ON FUNCTION public.vehicle_facet_counts(TEXT[], INTEGER, NUMERIC, TEXT[], TEXT[], UUID[]) TO anon, authenticated;
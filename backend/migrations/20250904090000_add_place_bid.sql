@@ -0,0 +1,137 @@
+-- Migration to make bid placement atomic. Bids are accepted only through
+-- `place_bid`, which serialises placement per vehicle and inserts a bid only
+-- if it beats the current high bid, so two concurrent bids can never both win.
+
+-- 1. Fast lookup of a vehicle's high bid and bid history.
+CREATE INDEX IF NOT EXISTS idx_bids_vehicle_amount ON public.bids (vehicle_id, amount DESC, created_at);
+
+
+-- 2. Bids can no longer be inserted directly. Bidders read their own bids and
+-- staff read all of them; the public bid history goes through `vehicle_bids`
+-- (section 4), which leaves bidder identities out.
+ALTER TABLE public.bids ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Allow_individual_read_access_on_bids"
+ON public.bids
+FOR SELECT
+USING (auth.uid() = user_id);
+
+CREATE POLICY "Allow_full_access_for_staff_and_admins_on_bids"
+ON public.bids
+FOR ALL
+USING (
+  EXISTS (
+    SELECT 1
+    FROM public.profiles
+    WHERE profiles.id = auth.uid() AND profiles.role IN ('staff', 'admin')
+  )
+)
+WITH CHECK (
+  EXISTS (
+    SELECT 1
+    FROM public.profiles
+    WHERE profiles.id = auth.uid() AND profiles.role IN ('staff', 'admin')
+  )
+);
+
+
+-- 3. Conditional insert. A transaction-scoped advisory lock on the vehicle id
+-- orders concurrent placements on the same vehicle (other vehicles are not
+-- blocked); the high bid is then re-read and compared under that lock.
+-- The minimum increment is fixed here, not taken from the caller; the API's
+-- BID_MIN_INCREMENT must match it, as it is only used to reject early.
+-- Errors: BD001 (bid too low, HINT carries the current high bid) and
+-- BD002 (vehicle missing, hidden or not available).
+CREATE OR REPLACE FUNCTION public.place_bid(
+    p_vehicle_id UUID,
+    p_amount NUMERIC
+)
+RETURNS public.bids
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+    v_min_increment CONSTANT NUMERIC := 100;
+    v_user UUID := auth.uid();
+    v_high NUMERIC;
+    v_bid public.bids;
+BEGIN
+    IF v_user IS NULL THEN
+        RAISE EXCEPTION 'Authentication required' USING ERRCODE = '28000';
+    END IF;
+
+    IF p_amount IS NULL OR p_amount <= 0 THEN
+        RAISE EXCEPTION 'Bid amount must be positive' USING ERRCODE = '22023';
+    END IF;
+
+    PERFORM pg_advisory_xact_lock(hashtextextended(p_vehicle_id::TEXT, 0));
+
+    IF NOT EXISTS (
+        SELECT 1 FROM public.vehicles
+        WHERE id = p_vehicle_id AND visible AND status = 'Available'
+    ) THEN
+        RAISE EXCEPTION 'Vehicle is not open for bidding' USING ERRCODE = 'BD002';
+    END IF;
+
+    SELECT max(amount) INTO v_high FROM public.bids WHERE vehicle_id = p_vehicle_id;
+
+    IF v_high IS NOT NULL AND p_amount < v_high + v_min_increment THEN
+        RAISE EXCEPTION 'Bid must be at least %', v_high + v_min_increment
+            USING ERRCODE = 'BD001', HINT = v_high::TEXT;
+    END IF;
+
+    INSERT INTO public.bids (vehicle_id, user_id, amount)
+    VALUES (p_vehicle_id, v_user, p_amount)
+    RETURNING * INTO v_bid;
+
+    RETURN v_bid;
+END;
+$$;
+
+REVOKE EXECUTE ON FUNCTION public.place_bid(UUID, NUMERIC) FROM PUBLIC, anon;
+GRANT EXECUTE ON FUNCTION public.place_bid(UUID, NUMERIC) TO authenticated;
+
+
+-- 4. Public bid history, highest first. Amounts and times are public; the
+-- bidder's id and name are returned only to that bidder and to staff.
+CREATE OR REPLACE FUNCTION public.vehicle_bids(
+    p_vehicle_id UUID,
+    p_limit INTEGER DEFAULT 50
+)
+RETURNS TABLE (
+    id UUID,
+    amount NUMERIC,
+    created_at TIMESTAMPTZ,
+    user_id UUID,
+    user_full_name VARCHAR
+)
+LANGUAGE sql
+STABLE
+SECURITY DEFINER
+SET search_path = public
+AS $$
+    WITH viewer AS (
+        SELECT
+            auth.uid() AS uid,
+            EXISTS (
+                SELECT 1 FROM public.profiles
+                WHERE profiles.id = auth.uid() AND profiles.role IN ('staff', 'admin')
+            ) AS is_staff
+    )
+    SELECT
+        b.id,
+        b.amount,
+        b.created_at,
+        CASE WHEN viewer.is_staff OR b.user_id = viewer.uid THEN b.user_id END,
+        CASE WHEN viewer.is_staff OR b.user_id = viewer.uid THEN p.full_name END
+    FROM public.bids b
+    CROSS JOIN viewer
+    LEFT JOIN public.profiles p ON p.id = b.user_id
+    WHERE b.vehicle_id = p_vehicle_id
+    ORDER BY b.amount DESC, b.created_at
+    LIMIT LEAST(GREATEST(COALESCE(p_limit, 50), 1), 200);
+$$;
+
+REVOKE EXECUTE ON FUNCTION public.vehicle_bids(UUID, INTEGER) FROM PUBLIC;
+GRANT EXECUTE ON FUNCTION public.vehicle_bids(UUID, INTEGER) TO anon, authenticated;
@@ -0,0 +1,102 @@
+-- Migration to add an append-only change feed for live updates. Triggers record
+-- new bids and vehicle status changes; each API worker polls this one table
+-- and fans the events out to its streaming subscribers.
+
+CREATE TABLE public.live_events (
+    id BIGSERIAL PRIMARY KEY,
+    event_type TEXT NOT NULL,
+    vehicle_id UUID NOT NULL REFERENCES public.vehicles(id) ON DELETE CASCADE,
+    payload JSONB NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    CONSTRAINT live_event_type CHECK (event_type IN ('bid', 'status'))
+);
+
+COMMENT ON TABLE public.live_events IS 'Change feed of bids and vehicle status changes, read by the streaming endpoint.';
+
+CREATE INDEX idx_live_events_created_at ON public.live_events (created_at);
+
+ALTER TABLE public.live_events ENABLE ROW LEVEL SECURITY;
+
+-- Events are only written for visible vehicles, so they are safe to read publicly.
+CREATE POLICY "Allow_public_read_access_to_live_events"
+ON public.live_events
+FOR SELECT
+USING (true);
+
+
+-- 1. New bids.
+CREATE OR REPLACE FUNCTION public.record_bid_event()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM public.vehicles WHERE id = NEW.vehicle_id AND visible) THEN
+        INSERT INTO public.live_events (event_type, vehicle_id, payload)
+        VALUES ('bid', NEW.vehicle_id, jsonb_build_object(
+            'bid_id', NEW.id,
+            'vehicle_id', NEW.vehicle_id,
+            'amount', NEW.amount,
+            'created_at', NEW.created_at
+        ));
+    END IF;
+    RETURN NEW;
+END;
+$$;
+
+CREATE TRIGGER bids_live_event
+AFTER INSERT ON public.bids
+FOR EACH ROW EXECUTE FUNCTION public.record_bid_event();
+
+
+-- 2. Vehicle status changes (e.g. Available -> Pending -> Sold).
+CREATE OR REPLACE FUNCTION public.record_vehicle_status_event()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+    IF NEW.visible THEN
+        INSERT INTO public.live_events (event_type, vehicle_id, payload)
+        VALUES ('status', NEW.id, jsonb_build_object(
+            'vehicle_id', NEW.id,
+            'status', NEW.status,
+            'previous_status', OLD.status
+        ));
+    END IF;
+    RETURN NEW;
+END;
+$$;
+
+CREATE TRIGGER vehicles_status_live_event
+AFTER UPDATE OF status ON public.vehicles
+FOR EACH ROW
+WHEN (OLD.status IS DISTINCT FROM NEW.status)
+EXECUTE FUNCTION public.record_vehicle_status_event();
+
+
+-- 3. Retention. Subscribers only resume from recent events, so old rows can be
+-- pruned on a schedule (e.g. pg_cron: SELECT public.prune_live_events();).
+CREATE OR REPLACE FUNCTION public.prune_live_events(p_keep INTERVAL DEFAULT INTERVAL '1 day')
+RETURNS INTEGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+    v_deleted INTEGER;
+BEGIN
+    IF p_keep IS NULL OR p_keep <= INTERVAL '0' THEN
+        RAISE EXCEPTION 'Retention interval must be positive' USING ERRCODE = '22023';
+    END IF;
+
+    DELETE FROM public.live_events WHERE created_at < NOW() - p_keep;
+    GET DIAGNOSTICS v_deleted = ROW_COUNT;
+    RETURN v_deleted;
+END;
+$$;
+
+REVOKE EXECUTE ON FUNCTION public.prune_live_events(INTERVAL) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.prune_live_events(INTERVAL) TO service_role;
@@ -0,0 +1,19 @@
+-- Migration to let the API know when the next scheduled offer goes live.
+-- RLS hides offers until they start, so the active-offers cache cannot see
+-- upcoming start dates itself. This function reveals only the timestamp.
+
+CREATE INDEX IF NOT EXISTS idx_offers_active_window ON public.offers (start_date, end_date) WHERE is_active;
+
+CREATE OR REPLACE FUNCTION public.next_offer_start()
+RETURNS TIMESTAMPTZ
+LANGUAGE sql
+STABLE
+SECURITY DEFINER
+SET search_path = public
+AS $$
+    SELECT min(start_date)
+    FROM public.offers
+    WHERE is_active AND start_date > NOW() AND end_date > start_date;
+$$;
+
+GRANT EXECUTE ON FUNCTION public.next_offer_start() TO anon, authenticated;
@@ -0,0 +1,28 @@
+-- Migration to compute the site-wide statistics shown in the Trust Indicators
+-- section in one round trip. Each API worker calls this on a schedule from a
+-- background thread and serves the result from memory, so the aggregates run
+-- once per refresh interval rather than once per homepage view.
+-- SECURITY DEFINER so sold (and hidden) vehicles are counted; only totals are returned.
+
+CREATE INDEX IF NOT EXISTS idx_vehicles_status ON public.vehicles (status);
+
+CREATE OR REPLACE FUNCTION public.site_stats()
+RETURNS JSON
+LANGUAGE sql
+STABLE
+SECURITY DEFINER
+SET search_path = public
+AS $$
+    SELECT json_build_object(
+        'cars_sold', (SELECT COUNT(*) FROM public.vehicles WHERE status = 'Sold'),
+        'vehicles_available', (SELECT COUNT(*) FROM public.vehicles WHERE status = 'Available' AND visible),
+        'bids_placed', (SELECT COUNT(*) FROM public.bids),
+        'active_offers', (
+            SELECT COUNT(*) FROM public.offers
+            WHERE is_active AND start_date <= NOW() AND end_date >= NOW()
+        ),
+        'computed_at', NOW()
+    );
+$$;
+
+GRANT EXECUTE ON FUNCTION public.site_stats() TO anon, authenticated;
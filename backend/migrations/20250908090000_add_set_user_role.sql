@@ -0,0 +1,39 @@
+-- Migration to let admins change a user's role through the API. Profiles are
+-- otherwise only readable and updatable by their owner, so the change goes
+-- through `set_user_role`, which checks that the caller is an admin.
+-- Errors: 42501 (caller is not an admin) and P0002 (no such profile).
+
+CREATE OR REPLACE FUNCTION public.set_user_role(
+    p_user_id UUID,
+    p_role user_role
+)
+RETURNS public.profiles
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+    v_profile public.profiles;
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM public.profiles
+        WHERE id = auth.uid() AND role = 'admin'
+    ) THEN
+        RAISE EXCEPTION 'Administrator access required' USING ERRCODE = '42501';
+    END IF;
+
+    UPDATE public.profiles
+    SET role = p_role
+    WHERE id = p_user_id
+    RETURNING * INTO v_profile;
+
+    IF NOT FOUND THEN
+        RAISE EXCEPTION 'Profile not found' USING ERRCODE = 'P0002';
+    END IF;
+
+    RETURN v_profile;
+END;
+$$;
+
+REVOKE EXECUTE ON FUNCTION public.set_user_role(UUID, user_role) FROM PUBLIC;
+GRANT EXECUTE ON FUNCTION public.set_user_role(UUID, user_role) TO authenticated;
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from app.services.amortization import (
+    amortization_schedule, calculate_amortization, calculate_amortization_batch, max_principal_for_payment,
+)
+
+
+def test_monthly_payment_matches_the_standard_formula():
+    payment, interest, cost = calculate_amortization(20000, 6, 60)
+    assert payment == pytest.approx(386.66, abs=0.01)
+    assert cost == pytest.approx(payment * 60)
+    assert interest == pytest.approx(cost - 20000)
+
+
+def test_zero_rate_and_zero_term():
+    assert calculate_amortization(12000, 0, 48) == (250, 0, 12000)
+    assert calculate_amortization(12000, 5, 0) == (0, 0, 0)
+
+
+def test_batch_matches_the_scalar_calculation():
+    principal = np.array([20000, 12000, 5000, 9000])
+    rate = np.array([6, 0, 19.9, 3.5])
+    term = np.array([60, 48, 12, 0])
+    payments, interest, cost = calculate_amortization_batch(principal, rate, term)
+    for i in range(len(principal)):
+        expected = calculate_amortization(principal[i], rate[i], term[i])
+        assert (payments[i], interest[i], cost[i]) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize('rate', [0, 4.9])
+def test_max_principal_inverts_the_payment(rate):
+    principal = max_principal_for_payment(400, rate, 72)
+    payment, _, _ = calculate_amortization(principal, rate, 72)
+    assert payment == pytest.approx(400)
+
+
+@pytest.mark.parametrize('principal, rate, term', [(20000, 6, 60), (10000.01, 7.25, 37), (5000, 0, 7)])
+def test_schedule_pays_the_loan_off_exactly(principal, rate, term):
+    rows = list(amortization_schedule(principal, rate, term))
+    payment, interest, _ = calculate_amortization(principal, rate, term)
+
+    assert [row['month'] for row in rows] == list(range(1, term + 1))
+    assert rows[-1]['balance'] == 0
+    assert sum(row['principal'] for row in rows) == pytest.approx(principal, abs=0.01 * term)
+    assert sum(row['interest'] for row in rows) == pytest.approx(interest, abs=0.01 * term)
+    # Every payment but the last is the regular one; the last absorbs the rounding drift.
+    assert {row['payment'] for row in rows[:-1]} == {round(payment, 2)}
+    assert rows[-1]['payment'] == pytest.approx(payment, abs=0.01)
+
+
+def test_schedule_rows_split_each_payment():
+    for row in amortization_schedule(15000, 5.5, 36):
+        assert row['principal'] + row['interest'] == pytest.approx(row['payment'], abs=0.011)
+
+
+def test_empty_schedule_for_zero_term():
+    assert list(amortization_schedule(10000, 5, 0)) == []
@@ -0,0 +1,121 @@
+import io
+import json
+
+import pytest
+
+from app.services.listing_import import (
+    MalformedUpload, import_listings, iter_csv, iter_json_array, iter_ndjson,
+)
+
+
+def stream(text):
+    return io.BytesIO(text.encode('utf-8'))
+
+
+def listing(vin, **overrides):
+    return {
+        'vin': vin, 'make': 'Toyota', 'model': 'Corolla', 'year': 2020, 'price_current': 15000,
+        'mileage': 30000, 'body_type': 'Sedan', 'fuel_type': 'Petrol', 'transmission': 'Automatic',
+        'exterior_color': 'Blue', **overrides,
+    }
+
+
+@pytest.mark.parametrize('read_size', [1, 2, 3, 7, 64 * 1024])
+def test_json_array_across_read_boundaries(read_size):
+    records = [
+        {'vin': 'A1', 'note': 'quote " comma , bracket ] brace }'},
+        {'vin': 'B2', 'note': 'café – \U0001F697'},  # multibyte characters split across reads
+        {'vin': 'C3', 'price': 123456},  # a number ending at a read boundary
+        [1, 2, 3],
+    ]
+    body = ' \n[ ' + ' ,\n'.join(json.dumps(r, ensure_ascii=False) for r in records) + ' ]\n'
+    assert list(iter_json_array(stream(body), read_size=read_size)) == records
+
+
+def test_json_array_empty():
+    assert list(iter_json_array(stream('  [ ]  '), read_size=1)) == []
+
+
+@pytest.mark.parametrize('body', ['{"vin": "A1"}', '', '[{"vin": "A1"} {"vin": "B2"}]', '[{"vin": "A1"'])
+def test_json_array_malformed(body):
+    with pytest.raises(MalformedUpload):
+        list(iter_json_array(stream(body), read_size=4))
+
+
+def test_json_array_yields_elements_before_a_later_error():
+    records = iter_json_array(stream('[{"vin": "A1"}, {"vin": '), read_size=4)
+    assert next(records) == {'vin': 'A1'}
+    with pytest.raises(MalformedUpload):
+        next(records)
+
+
+def test_ndjson_skips_blank_lines_and_reports_bad_ones():
+    records = list(iter_ndjson(stream('{"vin": "A1"}\n\n   \n{"vin": \n{"vin": "B2"}')))
+    assert records[0] == {'vin': 'A1'}
+    assert isinstance(records[1], MalformedUpload) and 'Line 4' in str(records[1])
+    assert records[2] == {'vin': 'B2'}
+
+
+def test_csv_drops_empty_cells_and_parses_json_fields():
+    body = 'vin,trim,highlights\r\nA1,,"[""Sunroof"", ""Heated seats""]"\r\nB2,LE,not json\r\n'
+    assert list(iter_csv(stream(body))) == [
+        {'vin': 'A1', 'highlights': ['Sunroof', 'Heated seats']},
+        {'vin': 'B2', 'trim': 'LE', 'highlights': 'not json'},
+    ]
+
+
+class FakeVehicles:
+    """Records upserts; VINs in `existing` are skipped like ON CONFLICT DO NOTHING."""
+
+    def __init__(self, existing=(), fail_chunks=False, bad_vins=()):
+        self.existing = set(existing)
+        self.fail_chunks = fail_chunks
+        self.bad_vins = set(bad_vins)
+        self.calls = []
+
+    def table(self, name):
+        return self
+
+    def upsert(self, rows, on_conflict=None, ignore_duplicates=False):
+        self.rows = rows
+        return self
+
+    def execute(self):
+        self.calls.append([row['vin'] for row in self.rows])
+        if (self.fail_chunks and len(self.rows) > 1) or any(row['vin'] in self.bad_vins for row in self.rows):
+            raise RuntimeError('duplicate key value violates unique constraint')
+        inserted = [{'vin': row['vin'], 'id': f"id-{row['vin']}"}
+                    for row in self.rows if row['vin'] not in self.existing]
+        self.existing.update(row['vin'] for row in self.rows)
+        return type('Response', (), {'data': inserted})()
+
+
+def test_import_reports_duplicates_within_a_chunk_and_across_chunks():
+    db = FakeVehicles(existing={'OLD'})
+    records = [listing('A1'), listing('A1'), listing('OLD'), listing('B2'), listing('A1')]
+    results = list(import_listings(db, records, chunk_size=3))
+
+    assert [(r['row'], r['status']) for r in results] == [
+        (2, 'duplicate'), (1, 'created'), (3, 'duplicate'), (4, 'created'), (5, 'duplicate'),
+    ]
+    # Chunks count valid rows only; the repeat in the second chunk goes to the
+    # database, which skips it.
+    assert db.calls == [['A1', 'OLD', 'B2'], ['A1']]
+
+
+def test_import_retries_a_failed_chunk_row_by_row():
+    db = FakeVehicles(fail_chunks=True, bad_vins={'B2'})
+    results = list(import_listings(db, [listing('A1'), listing('B2'), listing('C3')], chunk_size=10))
+
+    assert [(r['row'], r['status']) for r in results] == [(1, 'created'), (2, 'error'), (3, 'created')]
+    assert db.calls == [['A1', 'B2', 'C3'], ['A1'], ['B2'], ['C3']]
+
+
+def test_import_reports_invalid_rows_and_an_unreadable_body():
+    db = FakeVehicles()
+    records = iter_json_array(stream(json.dumps([listing('A1'), {'vin': 'B2'}, 'text'])[:-1] + ', {'), read_size=8)
+    results = list(import_listings(db, records, chunk_size=10))
+
+    assert [(r['row'], r['status']) for r in results] == [
+        (2, 'invalid'), (3, 'invalid'), (1, 'created'), (4, 'invalid'),
+    ]
@@ -0,0 +1,92 @@
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+from app.services.price_series import aggregate, bucket_starts, lttb_indices
+
+
+def epoch(*args):
+    return datetime(*args, tzinfo=timezone.utc).timestamp()
+
+
+def iso_dates(seconds):
+    return [datetime.fromtimestamp(s, timezone.utc).date().isoformat() for s in seconds]
+
+
+def test_day_buckets_split_at_utc_midnight():
+    times = np.array([epoch(2025, 9, 1, 23, 59, 59), epoch(2025, 9, 2)])
+    assert iso_dates(bucket_starts(times, 'day')) == ['2025-09-01', '2025-09-02']
+
+
+def test_week_buckets_start_on_monday():
+    times = np.array([
+        epoch(2025, 8, 31, 23, 59, 59),  # Sunday
+        epoch(2025, 9, 1),               # Monday
+        epoch(2025, 9, 7, 12),           # Sunday
+    ])
+    assert iso_dates(bucket_starts(times, 'week')) == ['2025-08-25', '2025-09-01', '2025-09-01']
+
+
+def test_week_buckets_cross_the_year_boundary():
+    # 2025-01-01 is a Wednesday; its ISO week starts in December 2024.
+    times = np.array([epoch(2025, 1, 1), epoch(2024, 12, 30)])
+    assert iso_dates(bucket_starts(times, 'week')) == ['2024-12-30', '2024-12-30']
+
+
+def test_month_buckets_handle_month_ends_and_leap_days():
+    times = np.array([
+        epoch(2025, 1, 31, 23, 59, 59),
+        epoch(2025, 2, 1),
+        epoch(2024, 2, 29, 12),
+        epoch(2024, 12, 31, 23, 59, 59),
+    ])
+    assert iso_dates(bucket_starts(times, 'month')) == ['2025-01-01', '2025-02-01', '2024-02-01', '2024-12-01']
+
+
+def test_unknown_bucket_is_rejected():
+    with pytest.raises(ValueError):
+        bucket_starts(np.array([0.0]), 'year')
+
+
+def test_aggregate_reports_each_bucket():
+    times = np.array([epoch(2025, 9, 1, 8), epoch(2025, 9, 1, 20), epoch(2025, 9, 2, 9)])
+    prices = np.array([300.0, 100.0, 200.0])
+    columns = aggregate(times, prices, 'day')
+
+    assert iso_dates(columns['t']) == ['2025-09-01', '2025-09-02']
+    assert columns['min'].tolist() == [100.0, 200.0]
+    assert columns['max'].tolist() == [300.0, 200.0]
+    # The last price is the latest in the bucket, not the largest.
+    assert columns['last'].tolist() == [100.0, 200.0]
+    assert columns['mean'].tolist() == [200.0, 200.0]
+    assert columns['count'].tolist() == [2, 1]
+
+
+def test_lttb_keeps_endpoints_and_returns_threshold_points():
+    x = np.arange(1000, dtype=np.float64)
+    y = np.sin(x / 50)
+    keep = lttb_indices(x, y, 50)
+
+    assert len(keep) == 50
+    assert keep[0] == 0 and keep[-1] == 999
+    assert np.all(np.diff(keep) > 0)
+
+
+def test_lttb_keeps_a_spike():
+    x = np.arange(500, dtype=np.float64)
+    y = np.zeros(500)
+    y[271] = 100.0
+    assert 271 in lttb_indices(x, y, 20)
+
+
+@pytest.mark.parametrize('threshold, expected', [
+    (10, [0, 1, 2, 3, 4]),
+    (5, [0, 1, 2, 3, 4]),
+    (2, [0, 4]),
+    (1, [0]),
+    (0, []),
+])
+def test_lttb_small_thresholds(threshold, expected):
+    x = np.arange(5, dtype=np.float64)
+    assert lttb_indices(x, x, threshold).tolist() == expected
@@ -1,8 +1,13 @@
 import os
 from app.main import create_app
+from app.core.startup import preload
 
 app = create_app()
 
+# Do the I/O-free startup work now, so that with gunicorn's preload_app it
+# happens once in the master and is shared by every forked worker.
+preload(app)
+
 if __name__ == "__main__":
     # This block is for local development.
     # In production, a WSGI server like Gunicorn will run the 'app' object directly.
@@ -0,0 +1,8 @@
+# Entry point for gevent workers. Patching has to happen before anything
+# imports ssl, socket or threading, so it is the first thing this module does
+# (patching from gunicorn.conf.py is too late: gunicorn has already imported them).
+from gevent import monkey
+
+monkey.patch_all()
+
+from wsgi import app  # noqa: E402